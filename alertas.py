@@ -0,0 +1,328 @@
+import sqlite3
+import threading
+
+import gestor_conexiones
+from catalogo import catalogo
+from eventos import PRODUCTO_ELIMINADO, PRODUCTOS_ACTUALIZADOS, STOCK_BAJO, TRANSACCIONES_REGISTRADAS, publicar, suscribir
+
+# Umbral para los productos sin umbral propio ni de su tipo
+UMBRAL_POR_DEFECTO = 5
+
+# Umbral efectivo de cada producto: el propio, si no el de su tipo, si no el de por defecto
+SQL_UMBRAL_EFECTIVO = f"""
+    COALESCE(
+        (SELECT umbral FROM umbrales_producto WHERE producto_id = p.id),
+        (SELECT umbral FROM umbrales_tipo WHERE tipo = p.tipo),
+        {UMBRAL_POR_DEFECTO}
+    )
+"""
+
+# Ningún producto puede estar bajo su umbral con más stock que el mayor umbral definido: con esta
+# cota la consulta recorre solo el tramo bajo de `idx_productos_stock_activos`, no todos los productos
+SQL_UMBRAL_MAXIMO = f"""
+    MAX(
+        {UMBRAL_POR_DEFECTO},
+        COALESCE((SELECT MAX(umbral) FROM umbrales_producto), 0),
+        COALESCE((SELECT MAX(umbral) FROM umbrales_tipo), 0)
+    )
+"""
+
+# Consultas de `consultar_stock_bajo`; `crear_bd.CONSULTAS_FRECUENTES` revisa sus planes
+SQL_STOCK_BAJO_FIJO = "SELECT id, nombre, stock, ? FROM productos WHERE stock <= ? AND activo = 1 ORDER BY stock"
+SQL_STOCK_BAJO = f"""
+    SELECT id, nombre, stock, umbral FROM (
+        SELECT p.id, p.nombre, p.stock, {SQL_UMBRAL_EFECTIVO} AS umbral
+        FROM productos p WHERE p.activo = 1 AND p.stock <= {SQL_UMBRAL_MAXIMO}
+    )
+    WHERE stock <= umbral ORDER BY stock
+"""
+
+
+class MonitorStock:
+    """
+    Monitor de stock bajo guiado por eventos.
+
+    En lugar de recorrer todos los productos después de cada venta, se suscribe a los eventos
+    de la capa de datos y evalúa solo los productos que cambiaron, con su stock tomado del
+    catálogo en memoria y su umbral de diccionarios cargados una vez: O(1) por producto.
+
+    - Umbrales por producto (`umbrales_producto`) o por tipo (`umbrales_tipo`), guardados en la base.
+    - Cada producto tiene a lo sumo una alerta abierta (en `alertas`): no se repite mientras el
+      stock siga bajo y se cierra cuando vuelve a superar el umbral (o el producto se da de baja).
+    - La interfaz no muestra una alerta por venta: pide el resumen de las alertas aún no
+      notificadas con `tomar_pendientes()` y las muestra juntas.
+    """
+
+    def __init__(self):
+        self._candado = threading.RLock()
+        self._ruta = None
+        self._umbrales_producto = {}
+        self._umbrales_tipo = {}
+        self._abiertas = set()
+        self._suscrito = False
+        self.evaluaciones = 0
+        self.alertas_abiertas = 0
+
+    def suscribir(self):
+        """
+        Conecta el monitor a los eventos de la capa de datos (ver `eventos`). Lo llaman la
+        interfaz, el servidor y la línea de comandos al iniciar; llamarlo de nuevo no tiene efecto.
+        """
+        with self._candado:
+            if self._suscrito:
+                return
+            self._suscrito = True
+        suscribir(TRANSACCIONES_REGISTRADAS, lambda evento: self.evaluar(evento["productos"]))
+        suscribir(PRODUCTOS_ACTUALIZADOS, self._al_actualizar_productos)
+        suscribir(PRODUCTO_ELIMINADO, lambda evento: self.cerrar([evento["producto_id"]]))
+
+    # --- Umbrales ---
+
+    def umbral(self, producto):
+        """
+        Retorna:
+            int: Umbral efectivo del producto (un `catalogo.Producto`).
+        """
+        self._asegurar_cargado()
+        umbral = self._umbrales_producto.get(producto.id)
+        if umbral is None:
+            umbral = self._umbrales_tipo.get(producto.tipo, UMBRAL_POR_DEFECTO)
+        return umbral
+
+    def definir_umbral(self, umbral, producto_id=None, tipo=None):
+        """
+        Guarda el umbral de un producto o de un tipo (None lo elimina) y revisa de nuevo todos
+        los productos, ya que el cambio puede abrir o cerrar alertas.
+
+        Retorna:
+            list: Igual que `revisar_todos`.
+        """
+        if (producto_id is None) == (tipo is None):
+            raise ValueError("Indique un producto o un tipo (solo uno).")
+        if umbral is not None and umbral < 0:
+            raise ValueError("El umbral no puede ser negativo.")
+
+        tabla, columna, clave = (
+            ("umbrales_producto", "producto_id", producto_id) if producto_id is not None
+            else ("umbrales_tipo", "tipo", tipo)
+        )
+        conexion = gestor_conexiones.obtener_conexion()
+        try:
+            if umbral is None:
+                conexion.execute(f"DELETE FROM {tabla} WHERE {columna} = ?", (clave,))
+            else:
+                conexion.execute(
+                    f"INSERT INTO {tabla} ({columna}, umbral) VALUES (?, ?) "
+                    f"ON CONFLICT ({columna}) DO UPDATE SET umbral = excluded.umbral",
+                    (clave, umbral),
+                )
+            conexion.commit()
+        finally:
+            conexion.close()
+
+        self.invalidar()
+        return self.revisar_todos()
+
+    # --- Evaluación ---
+
+    def evaluar(self, ids):
+        """
+        Evalúa los productos indicados (tras una transacción o un alta) y abre o cierra sus alertas.
+
+        Retorna:
+            list: Alertas abiertas en esta evaluación, como tuplas (id, nombre, stock, umbral).
+        """
+        with self._candado:
+            self._asegurar_cargado()
+            nuevas = []
+            cerradas = []
+            for producto_id in ids:
+                self.evaluaciones += 1
+                producto = catalogo.obtener(producto_id)
+                if producto is None:
+                    continue
+                umbral = self.umbral(producto)
+                abierta = producto_id in self._abiertas
+                if producto.stock <= umbral and not abierta:
+                    nuevas.append((producto.id, producto.nombre, producto.stock, umbral))
+                elif producto.stock > umbral and abierta:
+                    cerradas.append(producto_id)
+            self._sincronizar(nuevas, cerradas)
+
+        if nuevas:
+            publicar(STOCK_BAJO, productos=nuevas)
+        return nuevas
+
+    def revisar_todos(self):
+        """
+        Revisión completa (al iniciar o tras cambiar umbrales): abre las alertas que falten y
+        cierra las que ya no corresponden.
+
+        Retorna:
+            list: Todos los productos activos con stock bajo, como tuplas (id, nombre, stock, umbral).
+        """
+        with self._candado:
+            self._asegurar_cargado()
+            bajos = consultar_stock_bajo()
+            ids_bajos = {fila[0] for fila in bajos}
+            cerradas = [producto_id for producto_id in self._abiertas if producto_id not in ids_bajos]
+            nuevas = [tuple(fila) for fila in bajos if fila[0] not in self._abiertas]
+            self._sincronizar(nuevas, cerradas)
+
+        if nuevas:
+            publicar(STOCK_BAJO, productos=nuevas)
+        return bajos
+
+    def cerrar(self, ids):
+        """
+        Cierra las alertas abiertas de los productos indicados (por ejemplo, al darlos de baja).
+        """
+        with self._candado:
+            self._asegurar_cargado()
+            self._sincronizar([], [producto_id for producto_id in ids if producto_id in self._abiertas])
+
+    def tomar_pendientes(self):
+        """
+        Resumen para la interfaz: las alertas abiertas que todavía no se notificaron, que quedan
+        marcadas como notificadas.
+
+        Retorna:
+            list: Diccionarios con `id`, `producto_id`, `nombre`, `stock`, `umbral` y `fecha`.
+        """
+        conexion = gestor_conexiones.obtener_conexion()
+        try:
+            conexion.execute("BEGIN IMMEDIATE")
+            filas = conexion.execute("""
+                SELECT a.id, a.producto_id, p.nombre, a.stock, a.umbral, a.fecha
+                FROM alertas a JOIN productos p ON p.id = a.producto_id
+                WHERE a.resuelta IS NULL AND a.notificada = 0
+                ORDER BY a.id
+            """).fetchall()
+            conexion.execute("UPDATE alertas SET notificada = 1 WHERE resuelta IS NULL AND notificada = 0")
+            conexion.commit()
+        finally:
+            conexion.close()
+        columnas = ("id", "producto_id", "nombre", "stock", "umbral", "fecha")
+        return [dict(zip(columnas, fila)) for fila in filas]
+
+    def estadisticas(self):
+        """
+        Retorna:
+            dict: `evaluaciones` hechas, `alertas_abiertas` desde el inicio y `abiertas_ahora`.
+        """
+        return {
+            "evaluaciones": self.evaluaciones,
+            "alertas_abiertas": self.alertas_abiertas,
+            "abiertas_ahora": len(self._abiertas),
+        }
+
+    def invalidar(self):
+        """
+        Descarta los umbrales y alertas en memoria (por ejemplo, tras renumerar los IDs).
+        """
+        with self._candado:
+            self._ruta = None
+
+    # --- Internos ---
+
+    def _al_actualizar_productos(self, evento):
+        if evento["ids"] is None:
+            # Cambio masivo (importación): los IDs no se conocen, se revisa todo
+            self.invalidar()
+            self.revisar_todos()
+        else:
+            self.evaluar(evento["ids"])
+
+    def _asegurar_cargado(self):
+        ruta = gestor_conexiones.gestor.ruta
+        if self._ruta == ruta:
+            return
+        with self._candado:
+            if self._ruta == ruta:
+                return
+            conexion = gestor_conexiones.obtener_conexion()
+            try:
+                self._umbrales_producto = dict(conexion.execute("SELECT producto_id, umbral FROM umbrales_producto"))
+                self._umbrales_tipo = dict(conexion.execute("SELECT tipo, umbral FROM umbrales_tipo"))
+                self._abiertas = {
+                    fila[0] for fila in conexion.execute("SELECT producto_id FROM alertas WHERE resuelta IS NULL")
+                }
+            finally:
+                conexion.close()
+            self._ruta = ruta
+
+    def _sincronizar(self, nuevas, cerradas):
+        """
+        Registra en la base las alertas abiertas y cerradas en una sola transacción y actualiza
+        el conjunto en memoria. Se llama con el candado tomado.
+        """
+        if not nuevas and not cerradas:
+            return
+        conexion = gestor_conexiones.obtener_conexion()
+        try:
+            conexion.execute("BEGIN IMMEDIATE")
+            conexion.executemany(
+                "UPDATE alertas SET resuelta = CURRENT_TIMESTAMP WHERE producto_id = ? AND resuelta IS NULL",
+                [(producto_id,) for producto_id in cerradas],
+            )
+            # El índice único parcial evita duplicados si otro proceso ya abrió la alerta
+            conexion.executemany(
+                "INSERT OR IGNORE INTO alertas (producto_id, stock, umbral) VALUES (?, ?, ?)",
+                [(producto_id, stock, umbral) for producto_id, _, stock, umbral in nuevas],
+            )
+            conexion.commit()
+        except sqlite3.Error:
+            conexion.rollback()
+            raise
+        finally:
+            conexion.close()
+        self._abiertas.difference_update(cerradas)
+        self._abiertas.update(fila[0] for fila in nuevas)
+        self.alertas_abiertas += len(nuevas)
+
+
+def consultar_stock_bajo(umbral=None):
+    """
+    Obtiene los productos activos con stock igual o por debajo de su umbral, sin mostrar diálogos.
+
+    Parámetros:
+    - umbral (int, opcional): Umbral fijo para todos los productos. Si es None, se usa el umbral
+      de cada producto (propio, de su tipo o `UMBRAL_POR_DEFECTO`).
+
+    Retorno:
+    - list: Filas (id, nombre, stock, umbral) ordenadas por stock.
+    """
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        if umbral is not None:
+            return conexion.execute(SQL_STOCK_BAJO_FIJO, (umbral, umbral)).fetchall()
+        return conexion.execute(SQL_STOCK_BAJO).fetchall()
+    finally:
+        conexion.close()
+
+
+def consultar_alertas(solo_abiertas=True):
+    """
+    Obtiene el historial de alertas de stock bajo, de la más reciente a la más antigua.
+
+    Parámetros:
+    - solo_abiertas (bool, opcional): Si es True (por defecto), solo las que siguen abiertas.
+
+    Retorno:
+    - list: Filas (id, producto_id, nombre, stock, umbral, fecha, resuelta).
+    """
+    condicion = "WHERE a.resuelta IS NULL" if solo_abiertas else ""
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        return conexion.execute(f"""
+            SELECT a.id, a.producto_id, p.nombre, a.stock, a.umbral, a.fecha, a.resuelta
+            FROM alertas a JOIN productos p ON p.id = a.producto_id
+            {condicion}
+            ORDER BY a.id DESC
+        """).fetchall()
+    finally:
+        conexion.close()
+
+
+# Monitor compartido por el proceso; se conecta a los eventos con `monitor.suscribir()`
+monitor = MonitorStock()
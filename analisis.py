@@ -0,0 +1,142 @@
+import datetime
+from gestor_conexiones import obtener_conexion
+from db_manager import adjuntar_archivo, separar_archivo
+from dinero import a_pesos
+
+# Métricas acumuladas por período y por producto
+METRICAS = ("ventas", "compras", "unidades_vendidas", "unidades_compradas", "costo", "margen")
+
+def _acumular(grupos, clave, ventas, compras, vendidas, compradas, costo):
+    fila = grupos.get(clave)
+    if fila is None:
+        fila = grupos[clave] = [0, 0, 0, 0, 0]
+    fila[0] += ventas
+    fila[1] += compras
+    fila[2] += vendidas
+    fila[3] += compradas
+    fila[4] += costo
+
+def _metricas(ventas, compras, vendidas, compradas, costo):
+    # Acumulado en centavos (exacto); se pasa a pesos solo en el resultado
+    return {
+        "ventas": a_pesos(ventas),
+        "compras": a_pesos(compras),
+        "unidades_vendidas": vendidas,
+        "unidades_compradas": compradas,
+        "costo": a_pesos(costo),
+        "margen": a_pesos(ventas - costo),
+    }
+
+def _filas(grupos, nombre_clave):
+    return [{nombre_clave: clave, **_metricas(*valores)} for clave, valores in sorted(grupos.items())]
+
+def calcular_analisis(desde=None, hasta=None, top=10, incluir_archivo=False):
+    """
+    Calcula en una sola pasada los indicadores de ventas por día, semana, mes y producto.
+
+    Lee `resumen_productos`, que un trigger mantiene al registrar cada transacción con los
+    totales por día, producto y tipo. Así el costo no depende de la cantidad de transacciones
+    sino de días × productos, y las vistas por semana, mes y producto se obtienen sumando
+    esos grupos en un único recorrido.
+
+    Definiciones:
+    - costo: unidades vendidas × precio de compra del producto al momento de cada venta.
+    - margen: ventas - costo.
+    - rotación: unidades vendidas / stock promedio del período. El stock final se reconstruye
+      como stock actual - compradas + vendidas después de `hasta` (también las archivadas), y
+      el inicial como stock final + vendidas - compradas en el período.
+
+    Parámetros:
+    - desde, hasta (str, opcional): Rango de fechas inclusivo ("AAAA-MM-DD").
+    - top (int, opcional): Cantidad de productos del ranking por margen. Por defecto 10.
+    - incluir_archivo (bool, opcional): Incluir los períodos cerrados (ver `db_manager.cerrar_periodo`).
+
+    Return:
+    - dict: Listas `por_dia`, `por_semana` (semana ISO "AAAA-Wss"), `por_mes` ("AAAA-MM"),
+      `por_producto` (con `nombre`, `tipo` y `rotacion`) y `top_productos`, más el
+      diccionario `totales`. Cada fila incluye las métricas de `METRICAS`, con los montos en
+      pesos (sumados en centavos, sin redondeos intermedios).
+    """
+    condiciones = []
+    parametros = []
+    if desde:
+        condiciones.append("dia >= ?")
+        parametros.append(desde)
+    if hasta:
+        condiciones.append("dia <= ?")
+        parametros.append(hasta)
+    where = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    esquemas = []
+    try:
+        fuente, esquemas = (
+            adjuntar_archivo(conexion, desde, hasta, tabla="resumen_productos",
+                             columnas="dia, producto_id, tipo, total, cantidad, costo")
+            if incluir_archivo else ("resumen_productos", [])
+        )
+        cursor.execute("SELECT id, nombre, tipo, stock FROM productos")
+        productos = {fila[0]: fila[1:] for fila in cursor.fetchall()}
+
+        cursor.execute(f"SELECT dia, producto_id, tipo, total, cantidad, costo FROM {fuente}{where}", parametros)
+        grupos = cursor.fetchall()
+        separar_archivo(conexion, esquemas)
+        esquemas = []
+
+        # Movimientos posteriores al rango, para llevar el stock actual al final del período
+        posteriores = {}
+        if hasta:
+            # Misma selección de fuentes que la consulta principal
+            fuente, esquemas = (
+                adjuntar_archivo(conexion, hasta, None, tabla="resumen_productos",
+                                 columnas="dia, producto_id, tipo, cantidad")
+                if incluir_archivo else ("resumen_productos", [])
+            )
+            cursor.execute(f"""
+                SELECT producto_id, SUM(CASE WHEN tipo = 'compra' THEN cantidad ELSE -cantidad END)
+                FROM {fuente} WHERE dia > ? GROUP BY producto_id
+            """, (hasta,))
+            posteriores = dict(cursor.fetchall())
+    finally:
+        cursor.close()
+        separar_archivo(conexion, esquemas)
+        conexion.close()
+
+    por_dia, por_semana, por_mes, por_producto = {}, {}, {}, {}
+    semanas = {}
+    for dia, producto_id, tipo, total, cantidad, costo in grupos:
+        semana = semanas.get(dia)
+        if semana is None:
+            anio, numero, _ = datetime.date.fromisoformat(dia).isocalendar()
+            semana = semanas[dia] = f"{anio}-W{numero:02d}"
+
+        if tipo == "venta":
+            valores = (total, 0, cantidad, 0, costo)
+        else:
+            valores = (0, total, 0, cantidad, 0)
+        _acumular(por_dia, dia, *valores)
+        _acumular(por_semana, semana, *valores)
+        _acumular(por_mes, dia[:7], *valores)
+        _acumular(por_producto, producto_id, *valores)
+
+    filas_producto = _filas(por_producto, "producto_id")
+    for fila in filas_producto:
+        nombre, tipo, stock = productos.get(fila["producto_id"], (None, None, 0))
+        stock -= posteriores.get(fila["producto_id"], 0)
+        inicial = stock + fila["unidades_vendidas"] - fila["unidades_compradas"]
+        promedio = (inicial + stock) / 2
+        fila["nombre"] = nombre
+        fila["tipo"] = tipo
+        fila["rotacion"] = round(fila["unidades_vendidas"] / promedio, 2) if promedio > 0 else None
+
+    totales = [sum(columna) for columna in zip(*por_producto.values())] or [0] * 5
+
+    return {
+        "por_dia": _filas(por_dia, "dia"),
+        "por_semana": _filas(por_semana, "semana"),
+        "por_mes": _filas(por_mes, "mes"),
+        "por_producto": filas_producto,
+        "top_productos": sorted(filas_producto, key=lambda fila: fila["margen"], reverse=True)[:top],
+        "totales": _metricas(*totales),
+    }
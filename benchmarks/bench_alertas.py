@@ -0,0 +1,134 @@
+"""
+Benchmark del monitor de stock bajo: costo de la revisión por venta y deduplicación de alertas.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_alertas.py [--productos 1000,10000,50000] [--ventas 2000]
+
+1. Para cada tamaño de catálogo compara el costo de revisar el stock tras una venta:
+   - antes: una consulta completa de los productos con stock bajo (`consultar_stock_bajo`),
+     como hacían la ventana de transacciones y la de tablas;
+   - ahora: la evaluación del monitor solo para el producto vendido (`monitor.evaluar`).
+2. Vende repetidamente un producto por debajo de su umbral, lo repone y lo vuelve a vender,
+   y verifica que se abra una sola alerta por cada vez que el stock cruza el umbral, que el
+   resumen para la interfaz la entregue una sola vez y que la reposición la cierre.
+Termina con código 1 si alguna verificación falla.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from alertas import consultar_alertas, consultar_stock_bajo, monitor
+from catalogo import catalogo
+from crear_bd import crear_base_datos
+from db_manager import registrar_transaccion_db
+from eventos import STOCK_BAJO, bus
+
+
+def preparar_bd(ruta, productos):
+    gestor_conexiones.gestor.cerrar_todas()
+    gestor_conexiones.configurar(ruta=ruta)
+    crear_base_datos(perfil="fast")
+    conexion = gestor_conexiones.obtener_conexion()
+    # Uno de cada 100 productos con stock bajo, para que la consulta completa encuentre filas
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, ?, 1, 2, ?)",
+        ((f"Producto {i}", f"tipo {i % 10}", 3 if i % 100 == 0 else 100000) for i in range(productos)),
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def medir_revision(productos, ventas):
+    aleatorio = random.Random(1)
+    ids = [aleatorio.randint(1, productos) for _ in range(ventas)]
+
+    inicio = time.perf_counter()
+    for _ in ids:
+        consultar_stock_bajo(umbral=5)
+    consulta = (time.perf_counter() - inicio) / ventas * 1e6
+
+    # Carga del catálogo, de los umbrales y de las alertas abiertas, fuera de la medición
+    catalogo.obtener(1)
+    monitor.revisar_todos()
+    inicio = time.perf_counter()
+    for producto_id in ids:
+        monitor.evaluar([producto_id])
+    evaluacion = (time.perf_counter() - inicio) / ventas * 1e6
+    return consulta, evaluacion
+
+
+def verificar_deduplicacion():
+    """
+    Retorna:
+        list: Descripción de cada verificación fallida (vacía si todo cuadra).
+    """
+    publicadas = []
+    cancelar = bus.suscribir(STOCK_BAJO, lambda evento: publicadas.extend(evento["productos"]))
+    problemas = []
+    try:
+        monitor.definir_umbral(10, producto_id=2)
+        monitor.tomar_pendientes()
+        publicadas.clear()
+
+        # Stock 100000 -> 0 en pasos; cruza el umbral (10) una sola vez
+        registrar_transaccion_db(2, "venta", 100000 - 12)
+        for _ in range(12):
+            registrar_transaccion_db(2, "venta", 1)
+        if len(publicadas) != 1:
+            problemas.append(f"{len(publicadas)} alertas publicadas al cruzar el umbral una vez (se esperaba 1)")
+        pendientes = monitor.tomar_pendientes()
+        if [alerta["producto_id"] for alerta in pendientes] != [2]:
+            problemas.append(f"resumen inesperado: {pendientes}")
+        if monitor.tomar_pendientes():
+            problemas.append("el resumen entregó dos veces la misma alerta")
+
+        # Reponer cierra la alerta; volver a bajar abre una nueva
+        registrar_transaccion_db(2, "compra", 50)
+        if any(fila[1] == 2 for fila in consultar_alertas()):
+            problemas.append("la alerta sigue abierta tras reponer stock")
+        registrar_transaccion_db(2, "venta", 45)
+        historial = [fila for fila in consultar_alertas(solo_abiertas=False) if fila[1] == 2]
+        if len(historial) != 2 or len(publicadas) != 2:
+            problemas.append(f"{len(historial)} alertas en el historial y {len(publicadas)} publicadas (se esperaban 2)")
+    finally:
+        cancelar()
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--productos", default="1000,10000,50000", help="Tamaños de catálogo, separados por comas")
+    parser.add_argument("--ventas", type=int, default=2000, help="Revisiones medidas por tamaño")
+    args = parser.parse_args()
+
+    # Las alertas del catálogo de prueba no interesan en la medición
+    bus.suscribir(STOCK_BAJO, lambda evento: None)
+    monitor.suscribir()
+
+    print(f"Costo de la revisión de stock bajo por venta (µs), {args.ventas} ventas por tamaño")
+    print(f"{'Productos':>9}  {'consulta':>9}  {'monitor':>8}  {'mejora':>7}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for productos in (int(valor) for valor in args.productos.split(",")):
+            preparar_bd(os.path.join(carpeta, f"alertas_{productos}.db"), productos)
+            consulta, evaluacion = medir_revision(productos, args.ventas)
+            print(f"{productos:>9}  {consulta:>9.1f}  {evaluacion:>8.2f}  {consulta / evaluacion:>6.0f}x")
+
+        problemas = verificar_deduplicacion()
+        print(f"Monitor: {monitor.estadisticas()}")
+        gestor_conexiones.gestor.cerrar_todas()
+
+    for problema in problemas:
+        print(f"Deduplicación: {problema}")
+    if problemas:
+        sys.exit(1)
+    print("Deduplicación: una alerta por cruce del umbral, notificada una sola vez")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark del motor de análisis: todas las vistas (día, semana, mes, producto, top) en una pasada.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_analisis.py [--filas 1000000] [--productos 200] [--objetivo 1.0]
+
+Crea una base temporal con `--filas` transacciones repartidas en un año y mide
+`calcular_analisis`, que lee el resumen por día y producto mantenido por trigger. Como
+referencia mide también la misma agregación hecha con GROUP BY sobre `transacciones`
+y verifica que ambas den los mismos totales. Termina con código 1 si la mejor de tres
+ejecuciones supera el objetivo en segundos.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from analisis import calcular_analisis
+from crear_bd import crear_base_datos
+from dinero import a_pesos
+
+
+def poblar(filas, productos):
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', ?, ?, 500)",
+        ((f"Producto {i}", 1 + i % 7, 2 + i % 7) for i in range(productos)),
+    )
+    conexion.execute(f"""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {filas})
+        INSERT INTO transacciones (tipo, producto_id, cantidad, fecha, total)
+        SELECT CASE WHEN i % 5 = 0 THEN 'compra' ELSE 'venta' END, i % {productos} + 1, i % 6 + 1,
+               datetime('2024-01-01', '+' || (i * 31536000 / {filas}) || ' seconds'),
+               (i % 6 + 1) * (2 + (i % {productos}) % 7)
+        FROM n
+    """)
+    conexion.commit()
+    conexion.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=1000000)
+    parser.add_argument("--productos", type=int, default=200)
+    parser.add_argument("--objetivo", type=float, default=1.0, help="Tiempo máximo en segundos")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        gestor_conexiones.configurar(ruta=os.path.join(carpeta, "analisis.db"))
+        crear_base_datos(perfil="fast")
+        poblar(args.filas, args.productos)
+
+        tiempos = []
+        for _ in range(3):
+            inicio = time.perf_counter()
+            resultado = calcular_analisis()
+            tiempos.append(time.perf_counter() - inicio)
+
+        conexion = gestor_conexiones.obtener_conexion()
+        inicio = time.perf_counter()
+        referencia = conexion.execute("""
+            SELECT date(t.fecha) AS dia, t.producto_id, t.tipo, SUM(t.total), SUM(t.cantidad),
+                   SUM(t.cantidad * p.precio_compra)
+            FROM transacciones t JOIN productos p ON p.id = t.producto_id
+            GROUP BY dia, t.producto_id, t.tipo
+        """).fetchall()
+        directo = time.perf_counter() - inicio
+        conexion.close()
+        gestor_conexiones.gestor.cerrar_todas()
+
+    # Montos en centavos: el margen debe coincidir exactamente
+    ventas = sum(fila[3] for fila in referencia if fila[2] == "venta")
+    costo = sum(fila[5] for fila in referencia if fila[2] == "venta")
+    if a_pesos(ventas - costo) != resultado["totales"]["margen"]:
+        print(f"Diferencia con la referencia: margen {resultado['totales']['margen']} != {a_pesos(ventas - costo)}")
+        sys.exit(1)
+
+    mejor = min(tiempos)
+    print(f"{args.filas:,} transacciones, {args.productos} productos: "
+          f"{len(resultado['por_dia'])} días, {len(resultado['por_semana'])} semanas, "
+          f"{len(resultado['por_mes'])} meses")
+    print(f"Mejor de 3: {mejor:.3f}s (objetivo {args.objetivo:.1f}s) - "
+          f"margen total ${resultado['totales']['margen']:,.2f}")
+    print(f"GROUP BY directo sobre transacciones (referencia): {directo:.3f}s")
+    if mejor > args.objetivo:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
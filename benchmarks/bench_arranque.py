@@ -0,0 +1,80 @@
+"""
+Benchmark de arranque: tiempo de importación en frío de la capa de datos (`python -X importtime`).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_arranque.py [--presupuesto 75] [--repeticiones 5]
+
+Importa los módulos de datos en un proceso nuevo (sin la interfaz gráfica), suma el tiempo
+acumulado que informa `-X importtime` para cada uno y toma la mediana de varias ejecuciones.
+Termina con código 1 si la mediana supera el presupuesto en milisegundos o si alguno de los
+módulos carga una dependencia pesada que solo deben usar los reportes o la interfaz.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no dependen de la interfaz gráfica
+MODULOS_DATOS = (
+    "gestor_conexiones", "dinero", "crear_bd", "errores", "eventos", "catalogo", "alertas", "usuarios", "db_manager",
+    "productos",
+    "transacciones", "importador", "analisis", "tareas", "control_de_ventas",
+)
+
+# Dependencias que solo deben cargarse en los reportes o en la interfaz
+PROHIBIDAS = ("pandas", "fpdf", "openpyxl", "ttkbootstrap", "tkinter", "PIL")
+
+
+def medir():
+    """
+    Retorna:
+        tuple: (milisegundos por módulo, conjunto de módulos importados)
+    """
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(MODULOS_DATOS)}"],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    tiempos = {}
+    importados = set()
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        if not acumulado.strip().isdigit():
+            continue  # Encabezado
+        importados.add(nombre.strip())
+        # Solo las entradas de primer nivel; las dependencias quedan incluidas en su acumulado
+        if nombre.strip() in MODULOS_DATOS and not nombre[1:].startswith("  "):
+            tiempos[nombre.strip()] = int(acumulado) / 1000
+    return tiempos, importados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--presupuesto", type=float, default=75.0, help="Máximo en milisegundos")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    ejecuciones = [medir() for _ in range(args.repeticiones)]
+    totales = [sum(tiempos.values()) for tiempos, _ in ejecuciones]
+    mediana = statistics.median(totales)
+    tiempos, importados = ejecuciones[totales.index(min(totales, key=lambda total: abs(total - mediana)))]
+
+    for modulo in MODULOS_DATOS:
+        print(f"{modulo:<20} {tiempos.get(modulo, 0.0):>8.1f} ms")
+    print(f"{'Total (mediana)':<20} {mediana:>8.1f} ms (presupuesto {args.presupuesto:.0f} ms)")
+
+    cargadas = sorted(
+        nombre for nombre in importados if nombre.split(".")[0] in PROHIBIDAS
+    )
+    if cargadas:
+        print(f"Dependencias pesadas importadas al arrancar: {', '.join(cargadas)}")
+    if cargadas or mediana > args.presupuesto:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
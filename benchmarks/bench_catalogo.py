@@ -0,0 +1,158 @@
+"""
+Benchmark del catálogo de productos en memoria: búsquedas por ID y consistencia bajo escrituras.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_catalogo.py [--productos 2000] [--busquedas 100000] [--hilos 4]
+
+1. Compara el costo de buscar un producto por ID en el catálogo contra la consulta que se
+   hacía antes (`SELECT ... WHERE id = ?` con una conexión del pool).
+2. Lanza `--hilos` hilos que venden, compran, cobran tickets, modifican precios, dan de alta
+   y de baja productos mientras otro hilo fuerza recargas completas del catálogo, y al final
+   compara el catálogo con la base (`verificar_consistencia`).
+Termina con código 1 si el catálogo quedó inconsistente.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from catalogo import catalogo
+from crear_bd import crear_base_datos
+from db_manager import agregar_producto_db, registrar_modificacion_db, registrar_ticket_db, registrar_transaccion_db
+from errores import ErrorVentas
+from eventos import STOCK_BAJO, bus
+from productos import eliminar_producto_por_id
+
+
+def poblar(productos):
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', ?, ?, 1000)",
+        ((f"Producto {i}", 1 + i % 7, 2 + i % 7) for i in range(productos)),
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def buscar_en_base(producto_id):
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        return conexion.execute(
+            "SELECT id, nombre, tipo, precio_compra, precio_venta, stock FROM productos WHERE id = ? AND activo = 1",
+            (producto_id,),
+        ).fetchone()
+    finally:
+        conexion.close()
+
+
+def medir_busquedas(productos, busquedas):
+    aleatorio = random.Random(1)
+    ids = [aleatorio.randint(1, productos) for _ in range(busquedas)]
+
+    inicio = time.perf_counter()
+    for producto_id in ids:
+        buscar_en_base(producto_id)
+    en_base = (time.perf_counter() - inicio) / busquedas * 1e6
+
+    catalogo.obtener(1)  # Carga inicial, fuera de la medición
+    inicio = time.perf_counter()
+    for producto_id in ids:
+        catalogo.obtener(producto_id)
+    en_catalogo = (time.perf_counter() - inicio) / busquedas * 1e6
+    return en_base, en_catalogo
+
+
+def escribir(semilla, operaciones, productos, errores):
+    aleatorio = random.Random(semilla)
+    for _ in range(operaciones):
+        producto_id = aleatorio.randint(1, productos)
+        sorteo = aleatorio.random()
+        try:
+            if sorteo < 0.4:
+                registrar_transaccion_db(producto_id, "venta", aleatorio.randint(1, 3))
+            elif sorteo < 0.55:
+                registrar_transaccion_db(producto_id, "compra", aleatorio.randint(1, 10))
+            elif sorteo < 0.75:
+                lineas = [(aleatorio.randint(1, productos), aleatorio.randint(1, 2)) for _ in range(5)]
+                registrar_ticket_db(lineas)
+            elif sorteo < 0.9:
+                registrar_modificacion_db(producto_id, aleatorio.randint(1, 9), aleatorio.randint(10, 19))
+            elif sorteo < 0.95:
+                agregar_producto_db(f"Nuevo {semilla}-{producto_id}", "bebida", 1, 2, 50)
+            else:
+                eliminar_producto_por_id(producto_id)
+        except ErrorVentas:
+            pass  # Sin stock o producto dado de baja: esperado con datos aleatorios
+        except Exception as e:
+            errores.append(e)
+
+
+def recargar(detener):
+    while not detener.is_set():
+        catalogo.invalidar()
+        catalogo.obtener(1)
+        time.sleep(0.005)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--productos", type=int, default=2000)
+    parser.add_argument("--busquedas", type=int, default=100000)
+    parser.add_argument("--hilos", type=int, default=4)
+    parser.add_argument("--operaciones", type=int, default=1500, help="Escrituras por hilo")
+    args = parser.parse_args()
+
+    # Las alertas de stock bajo no interesan aquí
+    bus.suscribir(STOCK_BAJO, lambda evento: None)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        gestor_conexiones.configurar(ruta=os.path.join(carpeta, "catalogo.db"))
+        crear_base_datos(perfil="fast")
+        poblar(args.productos)
+
+        en_base, en_catalogo = medir_busquedas(args.productos, args.busquedas)
+        print(f"Búsqueda por ID: consulta {en_base:.2f} µs, catálogo {en_catalogo:.3f} µs "
+              f"({en_base / en_catalogo:,.0f}x)")
+
+        errores = []
+        detener = threading.Event()
+        recargador = threading.Thread(target=recargar, args=(detener,))
+        hilos = [
+            threading.Thread(target=escribir, args=(numero, args.operaciones, args.productos, errores))
+            for numero in range(args.hilos)
+        ]
+        inicio = time.perf_counter()
+        recargador.start()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        detener.set()
+        recargador.join()
+        duracion = time.perf_counter() - inicio
+
+        diferencias = catalogo.verificar_consistencia()
+        estadisticas = catalogo.estadisticas()
+        gestor_conexiones.gestor.cerrar_todas()
+
+    print(f"{args.hilos} hilos x {args.operaciones} escrituras en {duracion:.2f}s, "
+          f"{estadisticas['recargas']} recargas completas en paralelo")
+    print(f"Estadísticas: {estadisticas}")
+    for error in errores[:5]:
+        print(f"Error inesperado: {error!r}")
+    if diferencias:
+        print(f"Catálogo inconsistente en {len(diferencias)} productos, por ejemplo: {diferencias[:3]}")
+    else:
+        print("Catálogo consistente con la base")
+    if diferencias or errores:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Prueba de estrés de ventas concurrentes: el stock nunca queda en negativo con varios hilos.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_concurrencia.py [--hilos 1,2,4,8] [--ventas 4000] [--perfil durable|fast]
+
+Para cada cantidad de hilos crea una base temporal con poco stock (la demanda total supera
+al stock disponible) y reparte `--ventas` llamadas a `registrar_transaccion_db` entre los
+hilos, todas sobre los mismos productos. Al terminar verifica que:
+- ningún producto tenga stock negativo;
+- lo descontado de cada producto coincida con las ventas registradas en `transacciones`;
+- la cantidad de ventas aceptadas coincida con las filas insertadas.
+Informa ventas por segundo para cada cantidad de hilos. Termina con código 1 si alguna
+verificación falla o si alguna llamada falló con un error de SQLite.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from crear_bd import crear_base_datos
+from db_manager import registrar_transaccion_db
+from errores import StockInsuficiente
+
+PRODUCTOS = 10
+
+
+def preparar_bd(ruta, perfil, stock):
+    gestor_conexiones.configurar(ruta=ruta)
+    crear_base_datos(perfil=perfil)
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', 1, 2, ?)",
+        ((f"Producto {i}", stock) for i in range(PRODUCTOS)),
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def vender(semilla, cantidad, contadores, candado):
+    aleatorio = random.Random(semilla)
+    aceptadas = rechazadas = fallidas = 0
+    for _ in range(cantidad):
+        try:
+            registrar_transaccion_db(aleatorio.randint(1, PRODUCTOS), "venta", aleatorio.randint(1, 3))
+            aceptadas += 1
+        except StockInsuficiente:
+            rechazadas += 1
+        except sqlite3.Error as e:
+            fallidas += 1
+            print(f"Error de SQLite: {e}")
+    with candado:
+        contadores["aceptadas"] += aceptadas
+        contadores["rechazadas"] += rechazadas
+        contadores["fallidas"] += fallidas
+
+
+def verificar(stock_inicial, aceptadas):
+    """
+    Retorna:
+        list: Descripción de cada inconsistencia encontrada (vacía si todo cuadra).
+    """
+    conexion = gestor_conexiones.obtener_conexion()
+    filas = conexion.execute("""
+        SELECT p.id, p.stock, COALESCE(SUM(t.cantidad), 0), COUNT(t.id)
+        FROM productos p LEFT JOIN transacciones t ON t.producto_id = p.id AND t.tipo = 'venta'
+        GROUP BY p.id
+    """).fetchall()
+    conexion.close()
+
+    problemas = []
+    for producto_id, stock, vendido, _ in filas:
+        if stock < 0:
+            problemas.append(f"producto {producto_id}: stock negativo ({stock})")
+        if stock_inicial - stock != vendido:
+            problemas.append(f"producto {producto_id}: descontado {stock_inicial - stock}, vendido {vendido}")
+    insertadas = sum(fila[3] for fila in filas)
+    if insertadas != aceptadas:
+        problemas.append(f"{aceptadas} ventas aceptadas pero {insertadas} filas en transacciones")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hilos", default="1,2,4,8", help="Cantidades de hilos, separadas por comas")
+    parser.add_argument("--ventas", type=int, default=4000, help="Llamadas totales por corrida")
+    parser.add_argument("--perfil", default="durable", choices=sorted(gestor_conexiones.PERFILES))
+    args = parser.parse_args()
+
+    # Stock para cubrir aproximadamente la mitad de la demanda (2 unidades por venta en promedio)
+    stock = args.ventas // PRODUCTOS
+    errores = 0
+    print(f"Perfil: {args.perfil} - {args.ventas} ventas sobre {PRODUCTOS} productos con stock {stock} c/u")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for cantidad_hilos in (int(valor) for valor in args.hilos.split(",")):
+            preparar_bd(os.path.join(carpeta, f"hilos_{cantidad_hilos}.db"), args.perfil, stock)
+            contadores = {"aceptadas": 0, "rechazadas": 0, "fallidas": 0}
+            candado = threading.Lock()
+            hilos = [
+                threading.Thread(target=vender, args=(numero, args.ventas // cantidad_hilos, contadores, candado))
+                for numero in range(cantidad_hilos)
+            ]
+
+            inicio = time.perf_counter()
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            duracion = time.perf_counter() - inicio
+
+            problemas = verificar(stock, contadores["aceptadas"])
+            llamadas = sum(contadores.values())
+            print(f"{cantidad_hilos:>2} hilos: {llamadas / duracion:>8,.0f} ventas/s  "
+                  f"({contadores['aceptadas']} aceptadas, {contadores['rechazadas']} sin stock, "
+                  f"{contadores['fallidas']} con error)  {'OK' if not problemas else 'INCONSISTENTE'}")
+            for problema in problemas:
+                print(f"    {problema}")
+            errores += len(problemas) + contadores["fallidas"]
+            gestor_conexiones.gestor.cerrar_todas()
+
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark de montos: exactitud y costo de los totales en centavos frente a REAL y Decimal.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_dinero.py [--filas 1000000] [--textos 200000]
+
+1. Genera `--filas` transacciones (precio de dos decimales × cantidad, repartidas en un año)
+   y calcula la referencia exacta con `Decimal`: total general y total por día.
+2. Las guarda en una base temporal como antes (`REAL`, en pesos, con el total calculado en
+   float) y como ahora (`INTEGER`, en centavos), y compara con la referencia:
+   - `SUM(total)` general y por día (`GROUP BY`, como `resumen_totales`);
+   - la diferencia máxima en pesos y los días cuyo total difiere de la referencia.
+   Mide también el costo de cada consulta y de sumar las filas en Python con float,
+   con enteros y con `Decimal`.
+3. Verifica `dinero.a_centavos` contra `Decimal.quantize(ROUND_HALF_UP)` con `--textos`
+   montos escritos al azar (0 a 4 decimales) y con los mismos montos como float.
+Termina con código 1 si los totales en centavos no son exactos o si alguna conversión difiere.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dinero import CENTAVOS, a_centavos, a_pesos
+
+DIAS = 365
+
+
+def generar(filas):
+    """
+    Retorna:
+        list: Tuplas (día, precio en centavos, cantidad).
+    """
+    aleatorio = random.Random(1)
+    return [
+        (f"2025-{1 + i * 12 // filas:02d}-{aleatorio.randint(1, 28):02d}", aleatorio.randint(1, 99999),
+         aleatorio.randint(1, 12))
+        for i in range(filas)
+    ]
+
+
+def referencia(datos):
+    """
+    Retorna:
+        tuple: (total general, dict día -> total), en pesos como `Decimal`.
+    """
+    centavo = Decimal(1) / CENTAVOS
+    por_dia = {}
+    for dia, precio, cantidad in datos:
+        por_dia[dia] = por_dia.get(dia, Decimal(0)) + Decimal(precio) * centavo * cantidad
+    return sum(por_dia.values(), Decimal(0)), por_dia
+
+
+def crear_tablas(ruta, datos):
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("CREATE TABLE pesos (dia TEXT NOT NULL, total REAL NOT NULL)")
+    conexion.execute("CREATE TABLE centavos (dia TEXT NOT NULL, total INTEGER NOT NULL)")
+    # Antes: precio REAL en pesos × cantidad, calculado en float
+    conexion.executemany("INSERT INTO pesos VALUES (?, ?)",
+                         ((dia, precio / CENTAVOS * cantidad) for dia, precio, cantidad in datos))
+    conexion.executemany("INSERT INTO centavos VALUES (?, ?)",
+                         ((dia, precio * cantidad) for dia, precio, cantidad in datos))
+    conexion.commit()
+    return conexion
+
+
+def medir(funcion, repeticiones=3):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return resultado, mejor * 1000
+
+
+def comparar(conexion, tabla, en_pesos, total_ref, por_dia_ref):
+    """
+    Retorna:
+        dict: Tiempos (ms) de las consultas y diferencias con la referencia.
+    """
+    (total,), ms_total = medir(lambda: conexion.execute(f"SELECT SUM(total) FROM {tabla}").fetchone())
+    grupos, ms_dias = medir(lambda: conexion.execute(f"SELECT dia, SUM(total) FROM {tabla} GROUP BY dia").fetchall())
+
+    def exacto(valor):
+        return Decimal(valor) if en_pesos else Decimal(valor) / CENTAVOS
+
+    diferencias = [abs(exacto(suma) - por_dia_ref[dia]) for dia, suma in grupos]
+    return {
+        "ms_total": ms_total,
+        "ms_dias": ms_dias,
+        "error_total": abs(exacto(total) - total_ref),
+        "error_maximo_dia": max(diferencias),
+        "dias_distintos": sum(1 for diferencia in diferencias if diferencia),
+        "dias_distintos_al_centavo": sum(
+            1 for dia, suma in grupos
+            if (round(suma, 2) if en_pesos else a_pesos(suma)) != float(por_dia_ref[dia])
+        ),
+    }
+
+
+def verificar_conversion(textos):
+    """
+    Retorna:
+        tuple: (diferencias encontradas, µs por conversión con a_centavos, µs con Decimal)
+    """
+    aleatorio = random.Random(2)
+    montos = []
+    for _ in range(textos):
+        decimales = aleatorio.randint(0, 4)
+        valor = aleatorio.randint(0, 10 ** (6 + decimales))
+        texto = str(valor).rjust(decimales + 1, "0")
+        if decimales:
+            texto = f"{texto[:-decimales]}.{texto[-decimales:]}"
+        montos.append(texto)
+
+    esperados, ms_decimal = medir(lambda: [
+        int(Decimal(texto).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * CENTAVOS) for texto in montos
+    ], repeticiones=1)
+    obtenidos, ms_centavos = medir(lambda: [a_centavos(texto) for texto in montos], repeticiones=1)
+
+    diferencias = [(texto, esperado, obtenido) for texto, esperado, obtenido in zip(montos, esperados, obtenidos)
+                   if esperado != obtenido]
+    # Un float se lee por su representación más corta, que es el texto original
+    diferencias += [(texto, esperado, a_centavos(float(texto))) for texto, esperado in zip(montos, esperados)
+                    if a_centavos(float(texto)) != esperado]
+    return diferencias, ms_centavos * 1000 / textos, ms_decimal * 1000 / textos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=1000000)
+    parser.add_argument("--textos", type=int, default=200000, help="Montos escritos para verificar a_centavos")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    datos = generar(args.filas)
+    total_ref, por_dia_ref = referencia(datos)
+    print(f"{args.filas:,} transacciones en {len(por_dia_ref)} días, total ${total_ref:,} "
+          f"(referencia Decimal en {time.perf_counter() - inicio:.1f}s)")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        conexion = crear_tablas(os.path.join(carpeta, "dinero.db"), datos)
+        try:
+            resultados = {
+                "REAL (pesos)": comparar(conexion, "pesos", True, total_ref, por_dia_ref),
+                "INTEGER (centavos)": comparar(conexion, "centavos", False, total_ref, por_dia_ref),
+            }
+            pesos = [fila[0] for fila in conexion.execute("SELECT total FROM pesos")]
+            centavos = [fila[0] for fila in conexion.execute("SELECT total FROM centavos")]
+        finally:
+            conexion.close()
+
+    print(f"\n{'Columna':<20} {'SUM ms':>8} {'GROUP BY ms':>12} {'error total':>14} {'error máx/día':>14} "
+          f"{'días ≠':>7} {'≠ al centavo':>13}")
+    for nombre, resultado in resultados.items():
+        print(f"{nombre:<20} {resultado['ms_total']:>8.1f} {resultado['ms_dias']:>12.1f} "
+              f"{float(resultado['error_total']):>14.3g} {float(resultado['error_maximo_dia']):>14.3g} "
+              f"{resultado['dias_distintos']:>7} {resultado['dias_distintos_al_centavo']:>13}")
+
+    _, ms_float = medir(lambda: sum(pesos))
+    _, ms_int = medir(lambda: sum(centavos))
+    decimales = [Decimal(valor) / CENTAVOS for valor in centavos]
+    _, ms_decimal = medir(lambda: sum(decimales, Decimal(0)))
+    print(f"\nSuma en Python de {args.filas:,} montos: float {ms_float:.1f} ms, enteros {ms_int:.1f} ms, "
+          f"Decimal {ms_decimal:.1f} ms")
+
+    diferencias, us_centavos, us_decimal = verificar_conversion(args.textos)
+    print(f"Conversión de texto a centavos: a_centavos {us_centavos:.2f} µs, Decimal {us_decimal:.2f} µs por monto")
+
+    correcto = True
+    enteros = resultados["INTEGER (centavos)"]
+    if enteros["error_total"] or enteros["dias_distintos"]:
+        print("Los totales en centavos no coinciden con la referencia")
+        correcto = False
+    for texto, esperado, obtenido in diferencias[:10]:
+        print(f"a_centavos({texto!r}) = {obtenido}, se esperaba {esperado}")
+    if diferencias:
+        correcto = False
+    if not correcto:
+        sys.exit(1)
+    print("Los totales en centavos son exactos; a_centavos coincide con Decimal (ROUND_HALF_UP)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark de eliminación de productos: baja lógica vs. reconstrucción de la tabla.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_eliminacion.py [--tamanos 10000 100000] [--eliminaciones 20]
+
+Para cada tamaño de catálogo crea una base temporal (con una transacción por producto) y mide:
+- "anterior": DELETE + reconstrucción completa de `productos` para renumerar los IDs,
+  como hacía `eliminar_producto_por_id` antes de la baja lógica.
+- "baja lógica": `eliminar_producto_por_id` actual (UPDATE de una fila, IDs estables).
+- "compactación": una ejecución de `reorganizar_ids` tras todas las bajas, que borra los
+  productos sin transacciones y renumera IDs y referencias en una sola transacción.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+import productos
+from crear_bd import crear_base_datos, crear_indices
+from db_manager import reorganizar_ids
+
+
+def preparar_bd(ruta, cantidad):
+    gestor_conexiones.configurar(ruta=ruta)
+    crear_base_datos()
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', 150, 250, 100)",
+        ((f"Producto {i}",) for i in range(cantidad)),
+    )
+    # La mitad de los productos tiene historial de ventas
+    conexion.execute(
+        "INSERT INTO transacciones (tipo, producto_id, cantidad, total) "
+        "SELECT 'venta', id, 1, 250 FROM productos WHERE id % 2 = 0"
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def eliminar_con_reconstruccion(producto_id):
+    conexion = gestor_conexiones.obtener_conexion()
+    cursor = conexion.cursor()
+    cursor.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
+    conexion.commit()
+    cursor.execute("CREATE TEMPORARY TABLE productos_temp AS SELECT * FROM productos")
+    cursor.execute("DROP TABLE productos")
+    cursor.execute("""
+        CREATE TABLE productos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            precio_compra INTEGER NOT NULL,
+            precio_venta INTEGER NOT NULL,
+            stock INTEGER NOT NULL,
+            activo INTEGER NOT NULL DEFAULT 1
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock, activo)
+        SELECT nombre, tipo, precio_compra, precio_venta, stock, activo FROM productos_temp
+    """)
+    cursor.execute("DROP TABLE productos_temp")
+    crear_indices(cursor)
+    conexion.commit()
+    conexion.close()
+
+
+def medir(eliminar, ids):
+    tiempos = []
+    for producto_id in ids:
+        inicio = time.perf_counter()
+        eliminar(producto_id)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--eliminaciones", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'Productos':>10} {'anterior':>12} {'baja lógica':>12} {'compactación':>14}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for cantidad in args.tamanos:
+            ids = range(cantidad // 2, cantidad // 2 + args.eliminaciones)
+
+            preparar_bd(os.path.join(carpeta, f"anterior_{cantidad}.db"), cantidad)
+            anterior = medir(eliminar_con_reconstruccion, ids)
+
+            preparar_bd(os.path.join(carpeta, f"baja_{cantidad}.db"), cantidad)
+            with contextlib.redirect_stdout(io.StringIO()):
+                baja = medir(productos.eliminar_producto_por_id, ids)
+
+            inicio = time.perf_counter()
+            reorganizar_ids()
+            compactacion = (time.perf_counter() - inicio) * 1000
+
+            print(f"{cantidad:>10} {anterior:>10.2f}ms {baja:>10.2f}ms {compactacion:>12.1f}ms")
+            gestor_conexiones.gestor.cerrar_todas()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark de exportación a Excel en streaming: tiempo y memoria máxima según el tamaño de la tabla.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_exportacion.py [--filas 100000 1000000]
+
+Cada tamaño se mide en un proceso separado para que la memoria máxima (RSS) de uno
+no afecte al siguiente. Con la exportación en streaming el pico de memoria debe
+mantenerse prácticamente constante al crecer la tabla.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def poblar(cantidad):
+    import gestor_conexiones
+
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.execute(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES ('Agua', 'bebida', 100, 250, 0)"
+    )
+    conexion.execute(f"""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {cantidad})
+        INSERT INTO transacciones (tipo, producto_id, cantidad, fecha, total)
+        SELECT CASE WHEN i % 4 = 0 THEN 'compra' ELSE 'venta' END, 1, i % 10 + 1,
+               datetime('2024-01-01', '+' || (i % 366) || ' days'), (i % 10 + 1) * 250
+        FROM n
+    """)
+    conexion.commit()
+    conexion.close()
+
+
+def medir(cantidad):
+    import gestor_conexiones
+    from crear_bd import crear_base_datos
+    from db_manager import generar_reporte_excel
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        gestor_conexiones.configurar(ruta=os.path.join(carpeta, "export.db"))
+        crear_base_datos(perfil="fast")
+        poblar(cantidad)
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        inicio = time.perf_counter()
+        generar_reporte_excel(os.path.join(carpeta, "reporte.xlsx"))
+        duracion = time.perf_counter() - inicio
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        gestor_conexiones.gestor.cerrar_todas()
+
+    print(f"{cantidad:>10,} filas {duracion:>8.2f}s {cantidad / duracion:>10,.0f} filas/s "
+          f"pico RSS {pico / 1024:>7.1f} MB (+{(pico - base) / 1024:.1f} MB durante la exportación)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--solo", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.solo:
+        medir(args.filas[0])
+        return
+
+    for cantidad in args.filas:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--solo", "--filas", str(cantidad)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark del inicio de sesión: latencia con contraseñas hasheadas y con el caché de sesiones.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_login.py [--ingresos 20] [--costos 13,14,15]
+
+1. Mide la latencia de `usuarios.verificar_credenciales` (mediana y p99) para:
+   - la consulta con la contraseña en texto plano que se hacía antes (referencia);
+   - un ingreso verificado con scrypt para cada `n = 2**costo` de `--costos`, y con PBKDF2;
+   - un ingreso repetido dentro de `VALIDEZ_SESION` (acierto en el caché).
+2. Verifica la migración: un usuario guardado en texto plano ingresa, su contraseña queda
+   reemplazada por un hash y sigue pudiendo ingresar; una contraseña incorrecta se rechaza,
+   también con el caché vigente, y cambiar la contraseña invalida el ingreso en caché.
+Termina con código 1 si alguna verificación falla.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+import usuarios
+from crear_bd import crear_base_datos
+
+
+def insertar_en_texto_plano(nombre, contrasena):
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.execute("DELETE FROM usuarios WHERE nombre = ?", (nombre,))
+    conexion.execute("INSERT INTO usuarios (nombre, contrasena, rol) VALUES (?, ?, 'usuario')", (nombre, contrasena))
+    conexion.commit()
+    conexion.close()
+
+
+def ingresar_en_texto_plano(nombre, contrasena):
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        return conexion.execute(
+            "SELECT rol FROM usuarios WHERE nombre=? AND contrasena=?", (nombre, contrasena)
+        ).fetchone()
+    finally:
+        conexion.close()
+
+
+def medir(funcion, ingresos):
+    latencias = []
+    for _ in range(ingresos):
+        inicio = time.perf_counter()
+        funcion()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(latencias), statistics.quantiles(latencias, n=100)[98]
+
+
+def medir_verificado(ingresos):
+    """
+    Latencia de un ingreso que recalcula el hash (sin caché) con el costo actual.
+    """
+    usuarios.configurar(validez_sesion=0)
+    usuarios.eliminar_usuario("cajero")
+    usuarios.crear_usuario("cajero", "clave-cajero", "usuario")
+    return medir(lambda: usuarios.verificar_credenciales("cajero", "clave-cajero"), ingresos)
+
+
+def verificar_migracion():
+    """
+    Retorna:
+        list: Descripción de cada verificación fallida (vacía si todo cuadra).
+    """
+    problemas = []
+    usuarios.configurar(validez_sesion=300)
+    insertar_en_texto_plano("antiguo", "clave-plana")
+
+    if usuarios.verificar_credenciales("antiguo", "otra") is not None:
+        problemas.append("se aceptó una contraseña incorrecta en texto plano")
+    if usuarios.verificar_credenciales("antiguo", "clave-plana") != "usuario":
+        problemas.append("no se aceptó la contraseña en texto plano")
+    if ingresar_en_texto_plano("antiguo", "clave-plana") is not None:
+        problemas.append("la contraseña sigue guardada en texto plano tras el primer ingreso")
+    if usuarios.verificar_credenciales("antiguo", "clave-plana") != "usuario":
+        problemas.append("no se aceptó la contraseña migrada")
+    if usuarios.verificar_credenciales("antiguo", "clave-plana2") is not None:
+        problemas.append("se aceptó una contraseña incorrecta con el caché vigente")
+
+    usuarios.cambiar_contrasena("antiguo", "clave-nueva")
+    if usuarios.verificar_credenciales("antiguo", "clave-plana") is not None:
+        problemas.append("se aceptó la contraseña anterior tras cambiarla")
+    if usuarios.verificar_credenciales("antiguo", "clave-nueva") != "usuario":
+        problemas.append("no se aceptó la contraseña nueva")
+    if usuarios.verificar_credenciales("inexistente", "clave") is not None:
+        problemas.append("se aceptó un usuario inexistente")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ingresos", type=int, default=20, help="Ingresos medidos por configuración")
+    parser.add_argument("--costos", default="13,14,15", help="Exponentes de n para scrypt, separados por comas")
+    args = parser.parse_args()
+
+    costo_inicial = dict(usuarios.COSTO)
+    with tempfile.TemporaryDirectory() as carpeta:
+        gestor_conexiones.configurar(ruta=os.path.join(carpeta, "login.db"))
+        crear_base_datos(perfil="fast")
+
+        print(f"Latencia de inicio de sesión (ms), {args.ingresos} ingresos por configuración")
+        print(f"{'Configuración':<28} {'p50':>8} {'p99':>8}")
+        insertar_en_texto_plano("cajero", "clave-cajero")
+        resultado = medir(lambda: ingresar_en_texto_plano("cajero", "clave-cajero"), args.ingresos)
+        print(f"{'texto plano (antes)':<28} {resultado[0]:>8.3f} {resultado[1]:>8.3f}")
+
+        if hasattr(usuarios.hashlib, "scrypt"):
+            for costo in (int(valor) for valor in args.costos.split(",")):
+                usuarios.configurar(algoritmo="scrypt", n=2 ** costo)
+                resultado = medir_verificado(args.ingresos)
+                print(f"{f'scrypt n=2**{costo}':<28} {resultado[0]:>8.2f} {resultado[1]:>8.2f}")
+        usuarios.configurar(algoritmo="pbkdf2_sha256")
+        resultado = medir_verificado(args.ingresos)
+        print(f"{'pbkdf2 ' + format(usuarios.COSTO['iteraciones'], ',') + ' it.':<28} "
+              f"{resultado[0]:>8.2f} {resultado[1]:>8.2f}")
+
+        usuarios.COSTO.update(costo_inicial)
+        usuarios.configurar(validez_sesion=300)
+        usuarios.eliminar_usuario("cajero")
+        usuarios.crear_usuario("cajero", "clave-cajero", "usuario")
+        usuarios.verificar_credenciales("cajero", "clave-cajero")
+        resultado = medir(lambda: usuarios.verificar_credenciales("cajero", "clave-cajero"), args.ingresos * 50)
+        print(f"{'ingreso en caché':<28} {resultado[0]:>8.3f} {resultado[1]:>8.3f}")
+
+        problemas = verificar_migracion()
+        gestor_conexiones.gestor.cerrar_todas()
+
+    print(f"Sesiones: {usuarios.estadisticas_sesiones}")
+    for problema in problemas:
+        print(f"Migración: {problema}")
+    if problemas:
+        sys.exit(1)
+    print("Migración: las contraseñas en texto plano se reemplazan por un hash en el primer ingreso")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark de ingesta de transacciones: registro fila por fila vs. en lotes.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_lote.py [--filas 2000] [--perfil durable]
+
+Compara filas por segundo de `registrar_transaccion_db` (un commit por fila)
+con `registrar_transacciones_lote` (un commit por lote) sobre bases temporales.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from crear_bd import crear_base_datos
+from db_manager import registrar_transaccion_db, registrar_transacciones_lote
+from errores import StockInsuficiente
+
+PRODUCTOS = 200
+
+
+def preparar_bd(ruta, perfil):
+    gestor_conexiones.configurar(ruta=ruta)
+    crear_base_datos(perfil=perfil)
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', 150, 250, 1000000)",
+        ((f"Producto {i}",) for i in range(PRODUCTOS)),
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def generar_filas(cantidad):
+    aleatorio = random.Random(42)
+    return [
+        (aleatorio.randint(1, PRODUCTOS), "venta" if aleatorio.random() < 0.8 else "compra", aleatorio.randint(1, 5))
+        for _ in range(cantidad)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=2000)
+    parser.add_argument("--perfil", default="durable", choices=sorted(gestor_conexiones.PERFILES))
+    args = parser.parse_args()
+    filas = generar_filas(args.filas)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        preparar_bd(os.path.join(carpeta, "por_fila.db"), args.perfil)
+        inicio = time.perf_counter()
+        for producto_id, tipo, cantidad in filas:
+            try:
+                registrar_transaccion_db(producto_id, tipo, cantidad)
+            except StockInsuficiente:
+                pass  # Rechazada igual que en el lote
+        por_fila = len(filas) / (time.perf_counter() - inicio)
+
+        preparar_bd(os.path.join(carpeta, "lote.db"), args.perfil)
+        inicio = time.perf_counter()
+        resultados = registrar_transacciones_lote(filas)
+        en_lote = len(filas) / (time.perf_counter() - inicio)
+        gestor_conexiones.gestor.cerrar_todas()
+
+    fallidas = sum(not resultado["exito"] for resultado in resultados)
+    print(f"Perfil: {args.perfil} - {len(filas)} filas ({fallidas} rechazadas en lote)")
+    print(f"Fila por fila: {por_fila:>12,.0f} filas/s")
+    print(f"En lote:       {en_lote:>12,.0f} filas/s  ({en_lote / por_fila:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark de migraciones: duración de la migración de una base antigua grande, por tamaño de lote.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_migraciones.py [--transacciones 500000] [--lotes 1000,5000,50000]
+
+Crea una base como las de antes de las migraciones numeradas (versión 0, sin las tablas de
+resumen, que hay que rellenar desde el historial) con `--transacciones` filas y, para cada
+tamaño de lote, mide sobre una copia:
+- la duración de cada migración (la simulación de `migrar --simular`);
+- la espera más larga de un lector concurrente mientras corre la migración (en modo WAL los
+  lectores no se bloquean).
+Al final verifica que los resúmenes rellenados coincidan con un recálculo completo.
+Termina con código 1 si no coinciden.
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crear_bd import MIGRACIONES, SQL_RECALCULAR_RESUMEN, SQL_RECALCULAR_RESUMEN_PRODUCTOS
+from migraciones import aplicar_migraciones
+
+PRODUCTOS = 500
+
+
+def crear_base_antigua(ruta, transacciones):
+    """
+    Base en versión 0 con el esquema anterior a los resúmenes materializados.
+    """
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("PRAGMA journal_mode = WAL")
+    aplicar_migraciones(conexion, [MIGRACIONES[0]], informar=None)
+    conexion.execute("DROP TABLE migraciones")
+    conexion.execute("PRAGMA user_version = 0")
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', ?, ?, 1000)",
+        ((f"Producto {i}", 1 + i % 7, 2 + i % 7) for i in range(PRODUCTOS)),
+    )
+    aleatorio = random.Random(1)
+    conexion.executemany(
+        "INSERT INTO transacciones (tipo, producto_id, cantidad, fecha, total) VALUES (?, ?, ?, ?, ?)",
+        (
+            (aleatorio.choice(("compra", "venta")), aleatorio.randint(1, PRODUCTOS), aleatorio.randint(1, 5),
+             f"2025-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d} 12:00:00",
+             aleatorio.randint(1, 5000) / 100)
+            for _ in range(transacciones)
+        ),
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def leer_mientras(ruta, detener, esperas):
+    conexion = sqlite3.connect(ruta)
+    while not detener.is_set():
+        inicio = time.perf_counter()
+        conexion.execute("SELECT COUNT(*) FROM productos WHERE stock > 0").fetchone()
+        esperas.append((time.perf_counter() - inicio) * 1000)
+        time.sleep(0.001)
+    conexion.close()
+
+
+def redondear(filas):
+    # Los montos se suman en otro orden (por lotes): se comparan redondeados
+    return [[round(valor, 6) if isinstance(valor, float) else valor for valor in fila] for fila in filas]
+
+
+def resumen_correcto(ruta):
+    conexion = sqlite3.connect(ruta)
+    try:
+        for tabla, recalcular in (("resumen_totales", SQL_RECALCULAR_RESUMEN),
+                                  ("resumen_productos", SQL_RECALCULAR_RESUMEN_PRODUCTOS)):
+            conexion.execute(f"CREATE TEMPORARY TABLE esperado AS SELECT * FROM {tabla} WHERE 0")
+            conexion.execute(recalcular.replace(f"INSERT INTO {tabla}", "INSERT INTO temp.esperado"))
+            esperado = redondear(conexion.execute("SELECT * FROM temp.esperado ORDER BY 1, 2, 3"))
+            obtenido = redondear(conexion.execute(f"SELECT * FROM main.{tabla} ORDER BY 1, 2, 3"))
+            conexion.execute("DROP TABLE temp.esperado")
+            if esperado != obtenido:
+                return False
+        return True
+    finally:
+        conexion.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transacciones", type=int, default=500000)
+    parser.add_argument("--lotes", default="1000,5000,50000", help="Tamaños de lote, separados por comas")
+    args = parser.parse_args()
+
+    correcto = True
+    with tempfile.TemporaryDirectory() as carpeta:
+        original = os.path.join(carpeta, "antigua.db")
+        inicio = time.perf_counter()
+        crear_base_antigua(original, args.transacciones)
+        print(f"Base en versión 0 con {args.transacciones:,} transacciones creada en "
+              f"{time.perf_counter() - inicio:.1f}s")
+
+        for tamano_lote in (int(valor) for valor in args.lotes.split(",")):
+            copia = os.path.join(carpeta, f"lote_{tamano_lote}.db")
+            shutil.copy(original, copia)
+            detener = threading.Event()
+            esperas = []
+            lector = threading.Thread(target=leer_mientras, args=(copia, detener, esperas))
+            lector.start()
+
+            conexion = sqlite3.connect(copia)
+            aplicadas = aplicar_migraciones(conexion, MIGRACIONES, tamano_lote=tamano_lote, informar=None)
+            conexion.close()
+            detener.set()
+            lector.join()
+
+            total = sum(migracion["segundos"] for migracion in aplicadas)
+            print(f"\nLote de {tamano_lote:,} filas: {total:.2f}s en total, "
+                  f"espera máxima de un lector {max(esperas, default=0):.1f} ms")
+            for migracion in aplicadas:
+                print(f"  {migracion['numero']:>2}. {migracion['descripcion']:<34} "
+                      f"{migracion['segundos']:>7.3f}s {migracion['filas']:>9,} filas")
+            if not resumen_correcto(copia):
+                print("  Los resúmenes rellenados no coinciden con el recálculo completo")
+                correcto = False
+
+    if not correcto:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
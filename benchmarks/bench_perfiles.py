@@ -0,0 +1,122 @@
+"""
+Benchmark de perfiles de PRAGMAs: latencia de commit y solapamiento lector/escritor.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_perfiles.py [--commits 300]
+
+Para cada perfil ("sin WAL", "durable", "fast") crea una base de datos temporal y mide:
+- La latencia de cada commit de una venta (UPDATE de stock + INSERT de transacción).
+- Cuántas ventas logra confirmar un escritor mientras un lector recorre toda la tabla
+  `transacciones` (como hace un reporte). Sin WAL el escritor queda bloqueado.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from crear_bd import crear_base_datos
+
+PERFILES = {
+    "sin WAL": dict(gestor_conexiones.PERFILES["durable"], journal_mode="DELETE"),
+    "durable": gestor_conexiones.PERFILES["durable"],
+    "fast": gestor_conexiones.PERFILES["fast"],
+}
+
+
+def preparar_bd(ruta, pragmas, filas=20000):
+    gestor_conexiones.configurar(ruta=ruta, pragmas=pragmas)
+    crear_base_datos(perfil="durable")
+    # crear_base_datos aplica un perfil con nombre; volver al perfil que se mide
+    gestor_conexiones.configurar(pragmas=pragmas)
+
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.execute(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES ('Agua', 'bebida', 1, 2, 100000000)"
+    )
+    conexion.executemany(
+        "INSERT INTO transacciones (tipo, producto_id, cantidad, total) VALUES ('venta', 1, 1, 2)",
+        ((),) * filas,
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def vender(conexion):
+    conexion.execute("UPDATE productos SET stock = stock - 1 WHERE id = 1")
+    conexion.execute("INSERT INTO transacciones (tipo, producto_id, cantidad, total) VALUES ('venta', 1, 1, 2)")
+    conexion.commit()
+
+
+def medir_commits(commits):
+    conexion = gestor_conexiones.obtener_conexion()
+    latencias = []
+    for _ in range(commits):
+        inicio = time.perf_counter()
+        vender(conexion)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    conexion.close()
+    latencias.sort()
+    return statistics.median(latencias), latencias[int(len(latencias) * 0.99) - 1]
+
+
+def medir_solapamiento(duracion=1.0):
+    leyendo = threading.Event()
+    terminado = threading.Event()
+
+    def lector():
+        conexion = gestor_conexiones.obtener_conexion()
+        cursor = conexion.execute("SELECT * FROM transacciones")
+        cursor.fetchone()
+        leyendo.set()
+        # Mantener la lectura abierta, como un reporte que procesa fila por fila
+        while not terminado.wait(0.001):
+            if cursor.fetchone() is None:
+                cursor = conexion.execute("SELECT * FROM transacciones")
+        cursor.close()
+        conexion.close()
+
+    hilo = threading.Thread(target=lector)
+    hilo.start()
+    leyendo.wait()
+
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.execute("PRAGMA busy_timeout = 50")
+    ventas = bloqueos = 0
+    limite = time.perf_counter() + duracion
+    while time.perf_counter() < limite:
+        try:
+            vender(conexion)
+            ventas += 1
+        except sqlite3.OperationalError:
+            conexion.rollback()
+            bloqueos += 1
+    terminado.set()
+    hilo.join()
+    conexion.close()
+    return ventas, bloqueos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commits", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'Perfil':<10} {'p50 commit':>12} {'p99 commit':>12} {'ventas durante lectura':>24} {'bloqueos':>10}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for nombre, pragmas in PERFILES.items():
+            preparar_bd(os.path.join(carpeta, f"{nombre}.db"), pragmas)
+            p50, p99 = medir_commits(args.commits)
+            ventas, bloqueos = medir_solapamiento()
+            print(f"{nombre:<10} {p50:>10.3f}ms {p99:>10.3f}ms {ventas:>24} {bloqueos:>10}")
+            gestor_conexiones.gestor.cerrar_todas()
+
+
+if __name__ == "__main__":
+    main()
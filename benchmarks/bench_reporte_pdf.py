@@ -0,0 +1,49 @@
+"""
+Benchmark del reporte PDF: páginas por segundo y memoria máxima.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_reporte_pdf.py [--filas 100000]
+"""
+import argparse
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from bench_exportacion import poblar
+from crear_bd import crear_base_datos
+from db_manager import generar_reporte_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        gestor_conexiones.configurar(ruta=os.path.join(carpeta, "reporte.db"))
+        crear_base_datos(perfil="fast")
+        poblar(args.filas)
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        archivo = os.path.join(carpeta, "reporte.pdf")
+        inicio = time.perf_counter()
+        generar_reporte_pdf(archivo)
+        duracion = time.perf_counter() - inicio
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        with open(archivo, "rb") as pdf:
+            contenido = pdf.read()
+        gestor_conexiones.gestor.cerrar_todas()
+
+    paginas = len(re.findall(rb"/Type /Page\b(?!s)", contenido))
+    print(f"{args.filas:,} filas, {paginas:,} páginas en {duracion:.2f}s ({paginas / duracion:,.0f} páginas/s), "
+          f"archivo {len(contenido) / 1e6:.1f} MB, pico RSS {pico / 1024:.1f} MB (+{(pico - base) / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Prueba de carga de la API de puntos de venta: latencia p50/p99 con muchos clientes concurrentes.
+
+Uso (desde la raíz del proyecto; solo local):
+    python benchmarks/bench_servidor.py [--clientes 50] [--peticiones 200] [--perfil durable|fast]
+
+Crea una base temporal, levanta `python -m control_de_ventas servir` en otro proceso y lanza
+`--clientes` clientes asyncio, cada uno con su conexión keep-alive y `--peticiones` peticiones
+(50% ventas, 40% consultas de producto, 10% totales). Informa p50/p99 por tipo de petición y
+el promedio de ventas por commit del escritor. Termina con código 1 si alguna petición
+respondió 500 (por ejemplo, "database is locked") o si los ingresos que informa el servidor
+no coinciden con la suma de las ventas aceptadas.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import gestor_conexiones
+from crear_bd import crear_base_datos
+
+PRODUCTOS = 100
+
+
+def preparar_bd(ruta, perfil):
+    gestor_conexiones.configurar(ruta=ruta)
+    crear_base_datos(perfil=perfil)
+    conexion = gestor_conexiones.obtener_conexion()
+    # Los últimos productos tienen poco stock, para ejercitar también los rechazos (409)
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', ?, ?, ?)",
+        ((f"Producto {i}", 1 + i % 5, 2 + i % 5, 10 if i > PRODUCTOS - 5 else 1000000) for i in range(1, PRODUCTOS + 1)),
+    )
+    conexion.commit()
+    conexion.close()
+    gestor_conexiones.gestor.cerrar_todas()
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def esperar_servidor(puerto, limite=10.0):
+    fin = time.perf_counter() + limite
+    while True:
+        try:
+            _, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+            escritor.close()
+            return
+        except OSError:
+            if time.perf_counter() > fin:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def peticion(lector, escritor, metodo, ruta, datos=None):
+    cuerpo = json.dumps(datos).encode() if datos is not None else b""
+    escritor.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo
+    )
+    await escritor.drain()
+    codigo = int((await lector.readline()).split()[1])
+    longitud = 0
+    while (linea := await lector.readline()) not in (b"\r\n", b""):
+        nombre, _, valor = linea.decode().partition(":")
+        if nombre.lower() == "content-length":
+            longitud = int(valor)
+    return codigo, json.loads(await lector.readexactly(longitud))
+
+
+async def cliente(numero, puerto, peticiones, latencias, codigos, vendido):
+    aleatorio = random.Random(numero)
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    try:
+        for _ in range(peticiones):
+            sorteo = aleatorio.random()
+            producto_id = aleatorio.randint(1, PRODUCTOS)
+            if sorteo < 0.5:
+                tipo, argumentos = "venta", ("POST", "/ventas", {"producto_id": producto_id, "cantidad": aleatorio.randint(1, 3)})
+            elif sorteo < 0.9:
+                tipo, argumentos = "producto", ("GET", f"/productos/{producto_id}")
+            else:
+                tipo, argumentos = "totales", ("GET", "/totales")
+
+            inicio = time.perf_counter()
+            codigo, datos = await peticion(lector, escritor, *argumentos)
+            latencias[tipo].append((time.perf_counter() - inicio) * 1000)
+            codigos[codigo] += 1
+            if tipo == "venta" and codigo == 201:
+                vendido.append(datos["total"])
+    finally:
+        escritor.close()
+
+
+async def cargar(puerto, clientes, peticiones):
+    await esperar_servidor(puerto)
+    latencias, codigos, vendido = defaultdict(list), Counter(), []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        cliente(numero, puerto, peticiones, latencias, codigos, vendido) for numero in range(clientes)
+    ))
+    duracion = time.perf_counter() - inicio
+
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    _, totales = await peticion(lector, escritor, "GET", "/totales")
+    _, estado = await peticion(lector, escritor, "GET", "/estado")
+    escritor.close()
+    return latencias, codigos, sum(vendido), totales, estado, duracion
+
+
+def percentiles(valores):
+    cortes = statistics.quantiles(valores, n=100)
+    return statistics.median(valores), cortes[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, default=50)
+    parser.add_argument("--peticiones", type=int, default=200, help="Peticiones por cliente")
+    parser.add_argument("--perfil", default="durable", choices=sorted(gestor_conexiones.PERFILES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "pos.db")
+        preparar_bd(ruta, args.perfil)
+        puerto = puerto_libre()
+        servidor = subprocess.Popen(
+            [sys.executable, "-m", "control_de_ventas", "--bd", ruta, "--perfil", args.perfil,
+             "servir", "--puerto", str(puerto)],
+            cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            latencias, codigos, vendido, totales, estado, duracion = asyncio.run(
+                cargar(puerto, args.clientes, args.peticiones)
+            )
+        finally:
+            servidor.send_signal(signal.SIGINT)
+            servidor.wait(timeout=30)
+
+    total = sum(len(valores) for valores in latencias.values())
+    print(f"Perfil: {args.perfil} - {args.clientes} clientes, {total} peticiones en {duracion:.2f}s "
+          f"({total / duracion:,.0f} peticiones/s)")
+    for tipo in ("venta", "producto", "totales"):
+        p50, p99 = percentiles(latencias[tipo])
+        print(f"{tipo:<9} {len(latencias[tipo]):>7}  p50 {p50:>7.2f} ms  p99 {p99:>7.2f} ms")
+    p50, p99 = percentiles([valor for valores in latencias.values() for valor in valores])
+    print(f"{'todas':<9} {total:>7}  p50 {p50:>7.2f} ms  p99 {p99:>7.2f} ms")
+    print(f"Códigos: {dict(sorted(codigos.items()))} - ventas por commit: {estado['ventas_por_lote']} "
+          f"(máximo {estado['lote_mayor']})")
+
+    errores = codigos.get(500, 0)
+    if errores:
+        print(f"{errores} peticiones fallaron con error 500")
+    if abs(totales["ingresos"] - round(vendido, 2)) > 0.01:
+        print(f"Ingresos del servidor {totales['ingresos']} != ventas aceptadas {vendido:.2f}")
+        errores += 1
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
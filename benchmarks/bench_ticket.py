@@ -0,0 +1,111 @@
+"""
+Benchmark de cobro de tickets: un ticket de N productos contra N ventas sueltas.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_ticket.py [--tamanos 1,5,10] [--tickets 200] [--perfil durable|fast]
+
+Para cada tamaño de ticket mide la latencia de cobro (mediana y p99) de:
+- N llamadas a `registrar_transaccion_db`, cada una seguida de una consulta completa de stock
+  bajo, como hacía la ventana de transacciones (una conexión, un commit y una revisión por producto);
+- una llamada a `registrar_ticket_db` (una consulta de stock, un commit y una revisión por ticket).
+Al final verifica que ambas bases tengan el mismo stock y los mismos ingresos.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from alertas import consultar_stock_bajo, monitor
+from crear_bd import crear_base_datos
+from db_manager import registrar_ticket_db, registrar_transaccion_db
+
+PRODUCTOS = 500
+
+
+def preparar_bd(ruta, perfil):
+    gestor_conexiones.gestor.cerrar_todas()
+    gestor_conexiones.configurar(ruta=ruta)
+    crear_base_datos(perfil=perfil)
+    conexion = gestor_conexiones.obtener_conexion()
+    # Algunos productos quedan con poco stock, para que la revisión de stock bajo encuentre filas
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', ?, ?, ?)",
+        ((f"Producto {i}", 1 + i % 5, 2 + i % 5, 3 if i % 50 == 0 else 100000) for i in range(PRODUCTOS)),
+    )
+    conexion.commit()
+    conexion.close()
+
+
+def generar_tickets(cantidad, tamano, semilla=1):
+    aleatorio = random.Random(semilla)
+    # Solo productos con stock suficiente, para comparar tickets que se aceptan
+    disponibles = [i + 1 for i in range(PRODUCTOS) if i % 50 != 0]
+    return [
+        [(producto_id, aleatorio.randint(1, 3)) for producto_id in aleatorio.sample(disponibles, tamano)]
+        for _ in range(cantidad)
+    ]
+
+
+def estado():
+    conexion = gestor_conexiones.obtener_conexion()
+    stock = conexion.execute("SELECT group_concat(stock) FROM (SELECT stock FROM productos ORDER BY id)").fetchone()[0]
+    ingresos = conexion.execute("SELECT SUM(total) FROM transacciones").fetchone()[0]
+    conexion.close()
+    return stock, round(ingresos, 2)
+
+
+def cobrar_por_producto(ticket):
+    for producto_id, cantidad in ticket:
+        registrar_transaccion_db(producto_id, "venta", cantidad)
+        consultar_stock_bajo(umbral=5)
+
+
+def medir(funcion, tickets):
+    latencias = []
+    for ticket in tickets:
+        inicio = time.perf_counter()
+        funcion(ticket)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(latencias), statistics.quantiles(latencias, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", default="1,5,10", help="Productos por ticket, separados por comas")
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--perfil", default="durable", choices=sorted(gestor_conexiones.PERFILES))
+    args = parser.parse_args()
+
+    # La revisión por ticket es la del monitor, conectado como en la aplicación
+    monitor.suscribir()
+
+    print(f"Perfil: {args.perfil} - {args.tickets} tickets por tamaño (latencia de cobro en ms)")
+    print(f"{'Productos':>9}  {'sueltas p50':>11} {'p99':>7}  {'ticket p50':>10} {'p99':>7}  {'mejora':>6}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for tamano in (int(valor) for valor in args.tamanos.split(",")):
+            tickets = generar_tickets(args.tickets, tamano)
+
+            preparar_bd(os.path.join(carpeta, f"sueltas_{tamano}.db"), args.perfil)
+            sueltas = medir(cobrar_por_producto, tickets)
+            esperado = estado()
+
+            preparar_bd(os.path.join(carpeta, f"ticket_{tamano}.db"), args.perfil)
+            ticket = medir(registrar_ticket_db, tickets)
+            obtenido = estado()
+
+            print(f"{tamano:>9}  {sueltas[0]:>11.2f} {sueltas[1]:>7.2f}  {ticket[0]:>10.2f} {ticket[1]:>7.2f}  "
+                  f"{sueltas[0] / ticket[0]:>5.1f}x")
+            if obtenido != esperado:
+                print(f"Diferencia entre ambos métodos (stock o ingresos) con {tamano} productos por ticket")
+                sys.exit(1)
+        gestor_conexiones.gestor.cerrar_todas()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Verifica que las consultas frecuentes usen índices (sin recorridos completos de tablas).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/verificar_planes.py
+
+Crea una base de datos temporal con datos de ejemplo, ejecuta `EXPLAIN QUERY PLAN`
+sobre `crear_bd.CONSULTAS_FRECUENTES` y termina con código 1 si alguna hace `SCAN`.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from crear_bd import CONSULTAS_FRECUENTES, crear_base_datos, verificar_planes_consulta
+
+
+def main():
+    with tempfile.TemporaryDirectory() as carpeta:
+        gestor_conexiones.configurar(ruta=os.path.join(carpeta, "planes.db"))
+        crear_base_datos()
+
+        conexion = gestor_conexiones.obtener_conexion()
+        conexion.executemany(
+            "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, 'bebida', 1, 2, ?)",
+            ((f"Producto {i}", i % 50) for i in range(2000)),
+        )
+        conexion.executemany(
+            "INSERT INTO transacciones (tipo, producto_id, cantidad, total) VALUES (?, ?, 1, 2)",
+            (("venta" if i % 3 else "compra", i % 2000 + 1) for i in range(20000)),
+        )
+        conexion.commit()
+        conexion.execute("ANALYZE")
+        conexion.close()
+
+        recorridos = verificar_planes_consulta()
+        gestor_conexiones.gestor.cerrar_todas()
+
+    for consulta, detalle in recorridos:
+        print(f"RECORRIDO COMPLETO: {consulta}\n    {detalle}")
+    print(f"{len(CONSULTAS_FRECUENTES) - len(recorridos)}/{len(CONSULTAS_FRECUENTES)} consultas usan índices.")
+    return 1 if recorridos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
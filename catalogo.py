@@ -0,0 +1,264 @@
+import contextlib
+import threading
+import time
+
+import gestor_conexiones
+
+# Columnas de un producto del catálogo, en el orden de `Producto` (precios en centavos, ver `dinero`)
+COLUMNAS = ("id", "nombre", "tipo", "precio_compra", "precio_venta", "stock")
+
+# Segundos tras los que el catálogo se recarga completo en el próximo acceso, para ver los
+# cambios hechos por otros procesos sobre la misma base (por ejemplo, el servidor POS)
+VALIDEZ = 30.0
+
+
+class Producto:
+    """
+    Registro compacto de un producto activo del catálogo (sin `__dict__`).
+
+    Las instancias son compartidas por todo el proceso: quien las recibe no debe modificarlas.
+    """
+
+    __slots__ = COLUMNAS
+
+    def __init__(self, id, nombre, tipo, precio_compra, precio_venta, stock):
+        self.id = id
+        self.nombre = nombre
+        self.tipo = tipo
+        self.precio_compra = precio_compra
+        self.precio_venta = precio_venta
+        self.stock = stock
+
+    def como_tupla(self):
+        return tuple(getattr(self, columna) for columna in COLUMNAS)
+
+    def como_dict(self):
+        return dict(zip(COLUMNAS, self.como_tupla()))
+
+    def __repr__(self):
+        return f"Producto{self.como_tupla()!r}"
+
+
+class CatalogoProductos:
+    """
+    Caché en memoria de los productos activos, por ID y por nombre, compartido por el proceso.
+
+    - Se carga completo con una sola consulta en el primer acceso y se vuelve a cargar si
+      cambia la ruta de la base de datos o pasaron `validez` segundos desde la última carga.
+    - Las funciones de escritura (altas, modificaciones, ventas, bajas) lo actualizan
+      *write-through*: confirman su transacción y aplican el cambio dentro de `escritura()`,
+      de modo que una recarga nunca queda en medio (vería el cambio dos veces o ninguna).
+      Si el commit falla, el cambio no se aplica.
+    - Es solo para lecturas (consultas, API, listados): las escrituras siguen validando stock
+      y estado contra la base, así que un valor desactualizado nunca permite vender de más.
+
+    Parámetros:
+        validez (float): Segundos de vigencia de una carga completa (None = sin vencimiento).
+    """
+
+    def __init__(self, validez=VALIDEZ):
+        self.validez = validez
+        self._por_id = {}
+        self._por_nombre = {}
+        self._candado = threading.RLock()
+        self._ruta = None
+        self._cargado_en = None
+        self.aciertos = 0
+        self.fallos = 0
+        self.recargas = 0
+
+    # --- Lecturas ---
+
+    def obtener(self, producto_id):
+        """
+        Retorna:
+            Producto: El producto activo con ese ID, o None si no existe o fue dado de baja.
+        """
+        self._asegurar_vigente()
+        producto = self._por_id.get(producto_id)
+        if producto is not None:
+            self.aciertos += 1
+            return producto
+
+        # Puede haberlo creado otro proceso después de la última carga
+        self.fallos += 1
+        with self._candado:
+            fila = self._consultar("WHERE id = ? AND activo = 1", (producto_id,))
+            if not fila:
+                return None
+            producto = Producto(*fila[0])
+            self._agregar(producto)
+        return producto
+
+    def buscar_por_nombre(self, nombre):
+        """
+        Retorna:
+            list: Productos activos con ese nombre exacto, en orden de ID.
+        """
+        self._asegurar_vigente()
+        with self._candado:
+            productos = [self._por_id[producto_id] for producto_id in self._por_nombre.get(nombre, ())]
+        if productos:
+            self.aciertos += 1
+            return productos
+        self.fallos += 1
+        return [Producto(*fila) for fila in self._consultar("WHERE nombre = ? AND activo = 1 ORDER BY id", (nombre,))]
+
+    def listar(self):
+        """
+        Retorna:
+            list: Todos los productos activos, en orden de ID.
+        """
+        self._asegurar_vigente()
+        self.aciertos += 1
+        with self._candado:
+            productos = list(self._por_id.values())
+        return sorted(productos, key=lambda producto: producto.id)
+
+    # --- Escritura (write-through) ---
+
+    @contextlib.contextmanager
+    def escritura(self):
+        """
+        Bloque en el que se confirma una transacción y se aplican sus cambios al catálogo:
+
+            with catalogo.escritura():
+                conexion.commit()
+                catalogo.registrar_stock(producto_id, -cantidad)
+
+        Las recargas esperan a que termine, así que ven el estado anterior o el posterior
+        a la escritura completa. Las lecturas que aciertan en el caché no esperan.
+        """
+        with self._candado:
+            yield
+
+    def registrar_alta(self, producto_id, nombre, tipo, precio_compra, precio_venta, stock):
+        with self._candado:
+            if self._cargado_en is not None:
+                self._quitar(producto_id)
+                self._agregar(Producto(producto_id, nombre, tipo, precio_compra, precio_venta, stock))
+
+    def registrar_stock(self, producto_id, diferencia):
+        with self._candado:
+            producto = self._por_id.get(producto_id)
+            if producto is not None:
+                producto.stock += diferencia
+
+    def registrar_precios(self, producto_id, precio_compra, precio_venta):
+        with self._candado:
+            producto = self._por_id.get(producto_id)
+            if producto is not None:
+                producto.precio_compra = precio_compra
+                producto.precio_venta = precio_venta
+
+    def registrar_baja(self, producto_id):
+        with self._candado:
+            self._quitar(producto_id)
+
+    def invalidar(self, producto_id=None):
+        """
+        Descarta un producto (o todo el catálogo si no se indica) para leerlo de nuevo de la base.
+        Se usa tras cambios masivos (importaciones, renumeración de IDs) o hechos por otro proceso.
+        """
+        with self._candado:
+            if producto_id is None:
+                self._por_id = {}
+                self._por_nombre = {}
+                self._cargado_en = None
+            else:
+                self._quitar(producto_id)
+
+    # --- Diagnóstico ---
+
+    def estadisticas(self):
+        """
+        Retorna:
+            dict: `aciertos`, `fallos`, `tasa_aciertos` (0 a 1), `recargas` y `productos` en caché.
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+            "recargas": self.recargas,
+            "productos": len(self._por_id),
+        }
+
+    def verificar_consistencia(self, reparar=False):
+        """
+        Compara el catálogo en memoria con los productos activos de la base.
+
+        Parámetros:
+            reparar (bool, opcional): Si es True, recarga el catálogo después de comparar.
+
+        Retorna:
+            list: Un diccionario por producto con diferencias, con las claves `id`, `esperado`
+            y `en_cache` (tuplas con `COLUMNAS`; None si falta). Vacía si es consistente.
+        """
+        self._asegurar_vigente()
+        with self._candado:
+            en_cache = {producto_id: producto.como_tupla() for producto_id, producto in self._por_id.items()}
+            esperado = {fila[0]: tuple(fila) for fila in self._consultar("WHERE activo = 1")}
+
+        diferencias = [
+            {"id": producto_id, "esperado": esperado.get(producto_id), "en_cache": en_cache.get(producto_id)}
+            for producto_id in sorted(esperado.keys() | en_cache.keys())
+            if esperado.get(producto_id) != en_cache.get(producto_id)
+        ]
+        # Los que faltan en el caché no son un error: se leen de la base al pedirlos
+        diferencias = [diferencia for diferencia in diferencias if diferencia["en_cache"] is not None]
+
+        if reparar:
+            self.invalidar()
+        return diferencias
+
+    # --- Internos ---
+
+    def _consultar(self, condicion, parametros=()):
+        conexion = gestor_conexiones.obtener_conexion()
+        try:
+            return conexion.execute(f"SELECT {', '.join(COLUMNAS)} FROM productos {condicion}", parametros).fetchall()
+        finally:
+            conexion.close()
+
+    def _vencido(self, ruta):
+        return (
+            self._cargado_en is None or ruta != self._ruta
+            or (self.validez is not None and time.monotonic() - self._cargado_en > self.validez)
+        )
+
+    def _asegurar_vigente(self):
+        ruta = gestor_conexiones.gestor.ruta
+        if not self._vencido(ruta):
+            return
+        with self._candado:
+            # Otro hilo pudo haberlo recargado mientras se esperaba el candado
+            if not self._vencido(ruta):
+                return
+            filas = self._consultar("WHERE activo = 1 ORDER BY id")
+            self._por_id = {}
+            self._por_nombre = {}
+            for fila in filas:
+                self._agregar(Producto(*fila))
+            self._ruta = ruta
+            self._cargado_en = time.monotonic()
+            self.recargas += 1
+
+    def _agregar(self, producto):
+        self._por_id[producto.id] = producto
+        ids = self._por_nombre.setdefault(producto.nombre, [])
+        ids.append(producto.id)
+        ids.sort()
+
+    def _quitar(self, producto_id):
+        producto = self._por_id.pop(producto_id, None)
+        if producto is not None:
+            ids = self._por_nombre.get(producto.nombre, [])
+            if producto_id in ids:
+                ids.remove(producto_id)
+            if not ids:
+                self._por_nombre.pop(producto.nombre, None)
+
+
+# Catálogo compartido por todos los módulos del proceso
+catalogo = CatalogoProductos()
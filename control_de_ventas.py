@@ -0,0 +1,344 @@
+"""
+Línea de comandos de Control de Ventas, para tareas programadas sin interfaz gráfica.
+
+Uso (desde la raíz del proyecto):
+    python -m control_de_ventas [--bd RUTA] [--perfil durable|fast] [--formato json|csv] COMANDO ...
+
+Comandos:
+    inicializar        Crea o migra la base de datos y el usuario administrador.
+    migrar             Aplica (o simula, para medir su duración) las migraciones pendientes.
+    productos          Lista los productos activos.
+    transacciones      Lista transacciones (más recientes primero), con filtros.
+    registrar          Registra una compra o venta.
+    vender             Registra un ticket de varios productos (todo o nada).
+    totales            Ingresos, egresos, ganancia neta y porcentaje de ganancia.
+    stock-bajo         Productos con stock igual o menor al umbral (el de cada producto, por defecto).
+    alertas            Alertas de stock bajo abiertas (o todo el historial).
+    umbral             Define o quita el umbral de stock bajo de un producto o de un tipo.
+    analisis           Indicadores por día, semana, mes, producto o ranking de productos.
+    exportar           Genera un reporte Excel (.xlsx) o PDF (.pdf) según la extensión.
+    importar           Importa un catálogo de productos desde CSV o XLSX.
+    cerrar-periodo     Mueve las transacciones cerradas a los archivos históricos.
+    verificar-resumen  Compara los resúmenes acumulados con las transacciones.
+    compactar          Renumera los IDs de productos (mantenimiento).
+    servir             API HTTP local para puntos de venta (ver `servidor_pos`).
+
+Los resultados se escriben en la salida estándar (JSON o CSV) y los mensajes informativos
+en la salida de errores. Ningún comando usa Tk, y las dependencias pesadas (openpyxl, fpdf)
+solo se cargan en los comandos que las necesitan.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+
+import gestor_conexiones
+from dinero import CENTAVOS, a_pesos
+
+# Vistas disponibles en el comando `analisis`
+VISTAS_ANALISIS = {
+    "dia": "por_dia",
+    "semana": "por_semana",
+    "mes": "por_mes",
+    "producto": "por_producto",
+    "top": "top_productos",
+}
+
+
+def comando_inicializar(args):
+    from db_manager import insertar_usuario_admin
+
+    insertar_usuario_admin()
+    return {"base_de_datos": gestor_conexiones.gestor.ruta}
+
+
+def comando_migrar(args):
+    from crear_bd import migrar_base_datos
+
+    return migrar_base_datos(tamano_lote=args.lote, simular=args.simular)
+
+
+def comando_productos(args):
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        cursor = conexion.execute(
+            f"SELECT id, nombre, tipo, precio_compra * 1.0 / {CENTAVOS} AS precio_compra, "
+            f"precio_venta * 1.0 / {CENTAVOS} AS precio_venta, stock FROM productos WHERE activo = 1 ORDER BY id"
+        )
+        columnas = [columna[0] for columna in cursor.description]
+        return [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+    finally:
+        conexion.close()
+
+
+def comando_transacciones(args):
+    from db_manager import consultar_pagina_transacciones
+
+    filas = consultar_pagina_transacciones(
+        limite=args.limite, desde=args.desde, hasta=args.hasta, tipo=args.tipo, producto_id=args.producto
+    )
+    columnas = ("id", "tipo", "producto_id", "cantidad", "fecha", "total")
+    return [dict(zip(columnas, (*fila[:5], a_pesos(fila[5])))) for fila in filas]
+
+
+def comando_registrar(args):
+    from db_manager import registrar_transaccion_db
+
+    total = registrar_transaccion_db(args.producto, args.tipo, args.cantidad)
+    return {"exito": True, "total": a_pesos(total), "error": None}
+
+
+def comando_vender(args):
+    from db_manager import registrar_ticket_db
+
+    lineas = []
+    for linea in args.lineas:
+        producto, _, cantidad = linea.partition(":")
+        try:
+            lineas.append((int(producto), int(cantidad or 1)))
+        except ValueError:
+            raise ValueError(f"Línea inválida: '{linea}'. Use ID o ID:CANTIDAD")
+    ticket = registrar_ticket_db(lineas)
+    ticket["total"] = a_pesos(ticket["total"])
+    for detalle in ticket["lineas"]:
+        detalle["total"] = a_pesos(detalle["total"])
+    return ticket
+
+
+def comando_totales(args):
+    from transacciones import obtener_totales
+
+    ingresos, egresos, ganancia_neta, porcentaje = obtener_totales()
+    return {
+        "ingresos": a_pesos(ingresos),
+        "egresos": a_pesos(egresos),
+        "ganancia_neta": a_pesos(ganancia_neta),
+        "porcentaje_ganancia": round(porcentaje, 2),
+    }
+
+
+def comando_stock_bajo(args):
+    from alertas import consultar_stock_bajo
+
+    return [
+        {"id": id_producto, "nombre": nombre, "stock": stock, "umbral": umbral}
+        for id_producto, nombre, stock, umbral in consultar_stock_bajo(args.umbral)
+    ]
+
+
+def comando_alertas(args):
+    from alertas import consultar_alertas
+
+    columnas = ("id", "producto_id", "nombre", "stock", "umbral", "fecha", "resuelta")
+    return [dict(zip(columnas, fila)) for fila in consultar_alertas(solo_abiertas=not args.todas)]
+
+
+def comando_umbral(args):
+    from alertas import monitor
+
+    if (args.valor is None) != args.quitar:
+        raise ValueError("Indique un valor o --quitar (solo uno).")
+    bajos = monitor.definir_umbral(args.valor, producto_id=args.producto, tipo=args.tipo)
+    return [
+        {"id": id_producto, "nombre": nombre, "stock": stock, "umbral": umbral}
+        for id_producto, nombre, stock, umbral in bajos
+    ]
+
+
+def comando_analisis(args):
+    from analisis import calcular_analisis
+
+    resultado = calcular_analisis(args.desde, args.hasta, top=args.top, incluir_archivo=args.historico)
+    if args.vista == "totales":
+        return resultado["totales"]
+    return resultado[VISTAS_ANALISIS[args.vista]]
+
+
+def comando_exportar(args):
+    from db_manager import generar_reporte_excel, generar_reporte_pdf
+
+    if args.archivo.lower().endswith(".xlsx"):
+        generar = generar_reporte_excel
+    elif args.archivo.lower().endswith(".pdf"):
+        generar = generar_reporte_pdf
+    else:
+        raise ValueError("El archivo debe tener extensión .xlsx o .pdf")
+
+    filas = [0]
+    generar(args.archivo, desde=args.desde, hasta=args.hasta, tipo=args.tipo,
+            progreso=lambda escritas: filas.__setitem__(0, escritas), incluir_archivo=args.historico)
+    return {"archivo": args.archivo, "filas": filas[0]}
+
+
+def comando_importar(args):
+    from importador import importar_productos
+
+    resumen = importar_productos(args.archivo, tamano_lote=args.lote)
+    resumen["errores"] = [{"linea": linea, "error": error} for linea, error in resumen["errores"]]
+    return resumen
+
+
+def comando_cerrar_periodo(args):
+    from db_manager import cerrar_periodo
+
+    return [{"anio": anio, "transacciones": cantidad} for anio, cantidad in cerrar_periodo(args.hasta).items()]
+
+
+def comando_verificar_resumen(args):
+    from db_manager import verificar_resumen_totales
+
+    return verificar_resumen_totales(reparar=args.reparar)
+
+
+def comando_compactar(args):
+    from db_manager import reorganizar_ids
+
+    return reorganizar_ids()
+
+
+def comando_servir(args):
+    from servidor_pos import servir
+
+    return servir(args.host, args.puerto, lectores=args.lectores)
+
+
+def escribir(datos, formato, salida):
+    """
+    Escribe el resultado de un comando (dict o lista de dicts) en JSON o CSV.
+    """
+    if formato == "json":
+        json.dump(datos, salida, ensure_ascii=False, indent=2, default=str)
+        salida.write("\n")
+        return
+
+    filas = [datos] if isinstance(datos, dict) else datos
+    if not filas:
+        return
+    columnas = list(filas[0])
+    escritor = csv.DictWriter(salida, fieldnames=columnas, extrasaction="ignore", lineterminator="\n")
+    escritor.writeheader()
+    for fila in filas:
+        escritor.writerow({
+            columna: json.dumps(valor, ensure_ascii=False) if isinstance(valor, (list, tuple, dict)) else valor
+            for columna, valor in fila.items()
+        })
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m control_de_ventas", description=__doc__.splitlines()[1],
+    )
+    parser.add_argument("--bd", default=gestor_conexiones.RUTA_BD, help="Ruta de la base de datos")
+    parser.add_argument("--perfil", default=gestor_conexiones.PERFIL_POR_DEFECTO,
+                        choices=sorted(gestor_conexiones.PERFILES))
+    parser.add_argument("--formato", default="json", choices=("json", "csv"))
+    comandos = parser.add_subparsers(dest="comando", required=True, metavar="COMANDO")
+
+    def agregar(nombre, funcion, ayuda):
+        subparser = comandos.add_parser(nombre, help=ayuda, description=ayuda)
+        subparser.set_defaults(funcion=funcion)
+        return subparser
+
+    def agregar_filtros(subparser):
+        subparser.add_argument("--desde", help="Fecha inicial inclusiva (AAAA-MM-DD)")
+        subparser.add_argument("--hasta", help="Fecha final inclusiva (AAAA-MM-DD)")
+
+    agregar("inicializar", comando_inicializar, "Crea o migra la base de datos y el usuario administrador")
+    subparser = agregar("migrar", comando_migrar, "Aplica las migraciones pendientes del esquema")
+    subparser.add_argument("--simular", action="store_true",
+                           help="Aplicarlas sobre una copia temporal, para medir cuánto tardan")
+    subparser.add_argument("--lote", type=int, default=5000, help="Filas por lote en los rellenos de datos")
+
+    agregar("productos", comando_productos, "Lista los productos activos")
+
+    subparser = agregar("transacciones", comando_transacciones, "Lista transacciones, las más recientes primero")
+    agregar_filtros(subparser)
+    subparser.add_argument("--tipo", choices=("compra", "venta"))
+    subparser.add_argument("--producto", type=int, help="ID del producto")
+    subparser.add_argument("--limite", type=int, default=100)
+
+    subparser = agregar("registrar", comando_registrar, "Registra una compra o venta")
+    subparser.add_argument("tipo", choices=("compra", "venta"))
+    subparser.add_argument("producto", type=int, help="ID del producto")
+    subparser.add_argument("cantidad", type=int)
+
+    subparser = agregar("vender", comando_vender, "Registra un ticket de varios productos")
+    subparser.add_argument("lineas", nargs="+", metavar="ID[:CANTIDAD]")
+
+    agregar("totales", comando_totales, "Ingresos, egresos y ganancia")
+
+    subparser = agregar("stock-bajo", comando_stock_bajo, "Productos con stock igual o menor al umbral")
+    subparser.add_argument("--umbral", type=int, help="Umbral fijo para todos; por defecto, el de cada producto")
+
+    subparser = agregar("alertas", comando_alertas, "Alertas de stock bajo abiertas")
+    subparser.add_argument("--todas", action="store_true", help="Incluir las alertas ya resueltas")
+
+    subparser = agregar("umbral", comando_umbral, "Define o quita un umbral de stock bajo")
+    destino = subparser.add_mutually_exclusive_group(required=True)
+    destino.add_argument("--producto", type=int, help="ID del producto")
+    destino.add_argument("--tipo", help="Tipo de producto")
+    subparser.add_argument("valor", type=int, nargs="?", help="Stock a partir del cual se avisa")
+    subparser.add_argument("--quitar", action="store_true", help="Quitar el umbral (vuelve al del tipo o al general)")
+
+    subparser = agregar("analisis", comando_analisis, "Indicadores de ventas por período o producto")
+    subparser.add_argument("--vista", default="mes", choices=(*VISTAS_ANALISIS, "totales"))
+    subparser.add_argument("--top", type=int, default=10)
+    subparser.add_argument("--historico", action="store_true", help="Incluir los períodos archivados")
+    agregar_filtros(subparser)
+
+    subparser = agregar("exportar", comando_exportar, "Genera un reporte Excel (.xlsx) o PDF (.pdf)")
+    subparser.add_argument("archivo")
+    subparser.add_argument("--tipo", choices=("compra", "venta"))
+    subparser.add_argument("--historico", action="store_true", help="Incluir los períodos archivados")
+    agregar_filtros(subparser)
+
+    subparser = agregar("importar", comando_importar, "Importa un catálogo de productos (CSV o XLSX)")
+    subparser.add_argument("archivo")
+    subparser.add_argument("--lote", type=int, default=1000)
+
+    subparser = agregar("cerrar-periodo", comando_cerrar_periodo, "Archiva las transacciones anteriores a una fecha")
+    subparser.add_argument("--hasta", help="Primer día que queda abierto (AAAA-MM-DD); por defecto, todas")
+
+    subparser = agregar("verificar-resumen", comando_verificar_resumen, "Verifica los resúmenes por día y por producto")
+    subparser.add_argument("--reparar", action="store_true")
+
+    agregar("compactar", comando_compactar, "Renumera los IDs de productos")
+
+    subparser = agregar("servir", comando_servir, "API HTTP local para puntos de venta (Ctrl+C para detener)")
+    subparser.add_argument("--host", default="127.0.0.1", help="Usar 0.0.0.0 para aceptar tablets de la red local")
+    subparser.add_argument("--puerto", type=int, default=8765)
+    subparser.add_argument("--lectores", type=int, default=4, help="Hilos para las consultas de lectura")
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    salida = sys.stdout
+
+    # Los mensajes que imprimen los módulos de datos van a stderr para no mezclarse con el resultado
+    with contextlib.redirect_stdout(sys.stderr):
+        from alertas import monitor
+        from crear_bd import crear_base_datos
+
+        gestor_conexiones.configurar(ruta=args.bd)
+        if args.funcion is comando_migrar:
+            # Sin migrar antes: el comando decide si aplicarlas o solo simularlas
+            gestor_conexiones.aplicar_perfil(args.perfil)
+        else:
+            crear_base_datos(perfil=args.perfil)
+        monitor.suscribir()
+        try:
+            datos = args.funcion(args)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        finally:
+            gestor_conexiones.gestor.cerrar_todas()
+
+    escribir(datos, args.formato, salida)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,526 @@
 import sqlite3
+import gestor_conexiones
+from alertas import SQL_STOCK_BAJO, SQL_STOCK_BAJO_FIJO
+from gestor_conexiones import PERFIL_POR_DEFECTO, aplicar_perfil, obtener_conexion
+from dinero import CENTAVOS
+from migraciones import TAMANO_LOTE, Migracion, PasoMigracion, aplicar_migraciones, simular_migraciones
 
-def crear_base_datos():
+# Índices secundarios pensados para las consultas frecuentes de la aplicación
+INDICES = {
+    # Totales por tipo (y por rango de fechas): cubre tipo, fecha y total sin leer la tabla
+    "idx_transacciones_tipo_fecha": "transacciones (tipo, fecha, total)",
+    # Búsqueda de las transacciones de un producto
+    "idx_transacciones_producto": "transacciones (producto_id)",
+    # Líneas de un ticket (solo las transacciones registradas como parte de una venta)
+    "idx_transacciones_venta": "transacciones (venta_id) WHERE venta_id IS NOT NULL",
+    # Búsqueda y eliminación de productos por nombre
+    "idx_productos_nombre": "productos (nombre)",
+    # Alertas de stock bajo (`stock <= umbral` entre los productos activos): cubre id, nombre y stock
+    "idx_productos_stock_activos": "productos (stock, nombre) WHERE activo = 1",
+    # Totales por tipo desde el resumen (`obtener_totales`): la clave primaria empieza por el día
+    "idx_resumen_totales_tipo": "resumen_totales (tipo, total)",
+    # Umbral más alto (cota del stock bajo con umbrales por producto y por tipo)
+    "idx_umbrales_producto_umbral": "umbrales_producto (umbral)",
+    "idx_umbrales_tipo_umbral": "umbrales_tipo (umbral)",
+}
+
+# Índices reemplazados por otros, que se eliminan al migrar bases existentes
+INDICES_OBSOLETOS = ("idx_productos_stock",)
+
+# Consultas frecuentes (con parámetros de ejemplo) que no deben recorrer tablas completas
+CONSULTAS_FRECUENTES = [
+    ("SELECT SUM(total) FROM transacciones WHERE tipo = ?", ("venta",)),
+    ("SELECT SUM(total) FROM transacciones WHERE tipo = ? AND fecha BETWEEN ? AND ?",
+     ("venta", "2025-01-01", "2025-01-31 23:59:59")),
+    ("SELECT * FROM transacciones WHERE producto_id = ?", (1,)),
+    ("SELECT id FROM productos WHERE nombre = ? AND activo = 1", ("Agua",)),
+    (SQL_STOCK_BAJO_FIJO, (5, 5)),
+    # Totales de la pantalla principal, la API y la línea de comandos
+    ("SELECT SUM(total) FROM resumen_totales WHERE tipo = ?", ("venta",)),
+    # `alertas.consultar_stock_bajo` con el umbral de cada producto (propio, de su tipo o el de por defecto)
+    (SQL_STOCK_BAJO, ()),
+    ("SELECT stock, precio_compra, precio_venta FROM productos WHERE id = ?", (1,)),
+]
+
+# Recalcula el resumen por día y tipo directamente desde `transacciones`
+SQL_RECALCULAR_RESUMEN = """
+    INSERT INTO resumen_totales (dia, tipo, total, cantidad, operaciones)
+    SELECT date(fecha), tipo, SUM(total), SUM(cantidad), COUNT(*)
+    FROM transacciones
+    GROUP BY date(fecha), tipo
+"""
+
+# Recalcula el resumen por día, producto y tipo; el costo de las ventas usa el precio de compra actual
+SQL_RECALCULAR_RESUMEN_PRODUCTOS = """
+    INSERT INTO resumen_productos (dia, producto_id, tipo, total, cantidad, costo, operaciones)
+    SELECT date(t.fecha), t.producto_id, t.tipo, SUM(t.total), SUM(t.cantidad),
+           CASE WHEN t.tipo = 'venta' THEN SUM(t.cantidad) * COALESCE(p.precio_compra, 0) ELSE 0 END,
+           COUNT(*)
+    FROM transacciones t LEFT JOIN productos p ON p.id = t.producto_id
+    GROUP BY date(t.fecha), t.producto_id, t.tipo
+"""
+
+# Definición de las tablas de resumen, compartida por la base principal y los archivos históricos
+SQL_TABLA_RESUMEN_PRODUCTOS = """
+    CREATE TABLE IF NOT EXISTS {esquema}resumen_productos (
+        dia TEXT NOT NULL,
+        producto_id INTEGER NOT NULL,
+        tipo TEXT CHECK(tipo IN ('compra', 'venta')) NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        cantidad INTEGER NOT NULL DEFAULT 0,
+        costo REAL NOT NULL DEFAULT 0,
+        operaciones INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dia, producto_id, tipo)
+    )
+"""
+
+# Vista de productos activos con un número de orden para mostrar (sin huecos)
+SQL_VISTA_PRODUCTOS_ACTIVOS = """
+    CREATE VIEW IF NOT EXISTS productos_activos AS
+    SELECT ROW_NUMBER() OVER (ORDER BY id) AS numero,
+           id, nombre, tipo, precio_compra, precio_venta, stock
+    FROM productos
+    WHERE activo = 1
+"""
+
+# Mantener el resumen en la misma transacción que cada INSERT en `transacciones`
+SQL_TRIGGER_RESUMEN = """
+    CREATE TRIGGER IF NOT EXISTS trg_transacciones_resumen
+    AFTER INSERT ON transacciones
+    BEGIN
+        INSERT INTO resumen_totales (dia, tipo, total, cantidad, operaciones)
+        VALUES (date(NEW.fecha), NEW.tipo, NEW.total, NEW.cantidad, 1)
+        ON CONFLICT (dia, tipo) DO UPDATE SET
+            total = total + excluded.total,
+            cantidad = cantidad + excluded.cantidad,
+            operaciones = operaciones + 1;
+    END
+"""
+
+# El costo se toma del precio de compra vigente al registrar la venta
+SQL_TRIGGER_RESUMEN_PRODUCTOS = """
+    CREATE TRIGGER IF NOT EXISTS trg_transacciones_resumen_productos
+    AFTER INSERT ON transacciones
+    BEGIN
+        INSERT INTO resumen_productos (dia, producto_id, tipo, total, cantidad, costo, operaciones)
+        VALUES (
+            date(NEW.fecha), NEW.producto_id, NEW.tipo, NEW.total, NEW.cantidad,
+            CASE WHEN NEW.tipo = 'venta'
+                 THEN NEW.cantidad * COALESCE((SELECT precio_compra FROM productos WHERE id = NEW.producto_id), 0)
+                 ELSE 0 END,
+            1
+        )
+        ON CONFLICT (dia, producto_id, tipo) DO UPDATE SET
+            total = total + excluded.total,
+            cantidad = cantidad + excluded.cantidad,
+            costo = costo + excluded.costo,
+            operaciones = operaciones + 1;
+    END
+"""
+
+# Columnas de precios y montos, guardadas en centavos desde la migración 9 (ver `dinero`)
+COLUMNAS_MONTOS = {
+    "productos": ("precio_compra", "precio_venta"),
+    "transacciones": ("total",),
+    "ventas": ("total",),
+    "resumen_totales": ("total",),
+    "resumen_productos": ("total", "costo"),
+}
+
+# Versión del esquema de los archivos históricos, en su `PRAGMA user_version`
+# (0: montos en REAL, 1: montos en centavos)
+VERSION_ARCHIVO = 1
+
+def crear_indices(cursor):
+    """
+    Crea los índices secundarios definidos en `INDICES` si todavía no existen.
+
+    Se usa al crear la base de datos y también para migrar bases existentes
+    (o tras reconstruir la tabla `productos`), ya que `CREATE INDEX IF NOT EXISTS`
+    no hace nada si el índice ya está creado.
+
+    Parámetros:
+    - cursor (sqlite3.Cursor): Cursor de una conexión abierta.
+    """
+    for nombre in INDICES_OBSOLETOS:
+        cursor.execute(f"DROP INDEX IF EXISTS {nombre}")
+    for nombre, definicion in INDICES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {definicion}")
+
+def convertir_a_centavos(paso, tabla, columnas, esquema="main"):
+    """
+    Reconstruye `tabla` con las `columnas` de montos en centavos (`INTEGER` en lugar de `REAL`).
+
+    SQLite no permite cambiar el tipo de una columna: se crea una tabla nueva con la definición
+    guardada en `sqlite_master` (mismo orden de columnas y restricciones), se copian las filas por
+    lotes multiplicando los montos por 100 y redondeando al centavo, y reemplaza a la original
+    conservando su contador `AUTOINCREMENT`. Los índices de la tabla se pierden, y las vistas y
+    triggers que la usan deben eliminarse antes (el `RENAME` valida el esquema completo).
+
+    Parámetros:
+    - paso (PasoMigracion): Paso en curso (su cursor y el tamaño de lote).
+    - tabla (str): Tabla a convertir.
+    - columnas (tuple): Columnas de montos.
+    - esquema (str, opcional): Base adjuntada donde está la tabla.
+
+    Retorno:
+    - int: Filas copiadas (0 si la tabla no existe o ya estaba en centavos).
+    """
+    cursor = paso.cursor
+    cursor.execute(f"PRAGMA {esquema}.table_info({tabla})")
+    tipos = {fila[1]: fila[2].upper() for fila in cursor.fetchall()}
+    if all(tipos.get(columna, "INTEGER") == "INTEGER" for columna in columnas):
+        return 0
+
+    cursor.execute(f"SELECT sql FROM {esquema}.sqlite_master WHERE type = 'table' AND name = ?", (tabla,))
+    _, _, definicion = cursor.fetchone()[0].partition("(")
+    for columna in columnas:
+        definicion = definicion.replace(f"{columna} REAL", f"{columna} INTEGER")
+    nueva = f"{tabla}_centavos"
+    cursor.execute(f"DROP TABLE IF EXISTS {esquema}.{nueva}")
+    cursor.execute(f"CREATE TABLE {esquema}.{nueva} ({definicion}")
+
+    nombres = ", ".join(tipos)
+    valores = ", ".join(
+        f"CAST(ROUND({columna} * {CENTAVOS}) AS INTEGER)" if columna in columnas else columna for columna in tipos
+    )
+    filas = paso.procesar_por_lotes(f"{esquema}.{tabla}", f"""
+        INSERT INTO {esquema}.{nueva} ({nombres})
+        SELECT {valores} FROM {esquema}.{tabla} WHERE rowid BETWEEN :desde AND :hasta
+    """)
+
+    # Contador de AUTOINCREMENT de la original (puede ser mayor que el último ID que quedó)
+    cursor.execute(f"SELECT 1 FROM {esquema}.sqlite_master WHERE name = 'sqlite_sequence'")
+    secuencia = None
+    if cursor.fetchone():
+        cursor.execute(f"SELECT seq FROM {esquema}.sqlite_sequence WHERE name = ?", (tabla,))
+        secuencia = (cursor.fetchone() or (None,))[0]
+
+    cursor.execute(f"DROP TABLE {esquema}.{tabla}")
+    cursor.execute(f"ALTER TABLE {esquema}.{nueva} RENAME TO {tabla}")
+    if secuencia is not None:
+        cursor.execute(f"DELETE FROM {esquema}.sqlite_sequence WHERE name = ?", (tabla,))
+        cursor.execute(f"INSERT INTO {esquema}.sqlite_sequence (name, seq) VALUES (?, ?)", (tabla, secuencia))
+    return filas
+
+def crear_archivo(cursor, esquema):
+    """
+    Crea, si no existen, las tablas de un archivo histórico adjuntado con `ATTACH ... AS esquema`.
+
+    El archivo guarda las transacciones de períodos cerrados (con sus IDs originales) y sus
+    resúmenes por día, tipo y producto, con los mismos índices de `transacciones` que la base principal.
+
+    Los archivos anteriores a los montos en centavos (`PRAGMA user_version` menor que
+    `VERSION_ARCHIVO`) se convierten como la base principal en la migración 9, en su propia
+    transacción; en los que ya están al día solo se consulta la versión.
+
+    Parámetros:
+    - cursor (sqlite3.Cursor): Cursor de la conexión donde está adjuntado el archivo.
+    - esquema (str): Nombre con el que se adjuntó el archivo.
+    """
+    cursor.execute(f"PRAGMA {esquema}.user_version")
+    if cursor.fetchone()[0] >= VERSION_ARCHIVO:
+        return
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        _crear_tablas_archivo(cursor, esquema)
+        paso = PasoMigracion(cursor, None, TAMANO_LOTE, None)
+        for tabla in ("transacciones", "resumen_totales", "resumen_productos"):
+            convertir_a_centavos(paso, tabla, COLUMNAS_MONTOS[tabla], esquema)
+        for nombre, definicion in INDICES.items():
+            if definicion.startswith("transacciones "):
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {esquema}.{nombre} ON {definicion}")
+        cursor.execute(f"PRAGMA {esquema}.user_version = {VERSION_ARCHIVO}")
+        cursor.connection.commit()
+    except sqlite3.Error:
+        cursor.connection.rollback()
+        raise
+
+def _crear_tablas_archivo(cursor, esquema):
+    """
+    Tablas de un archivo histórico con su definición original (montos en `REAL`); `crear_archivo`
+    las convierte a centavos enseguida, igual que las de los archivos anteriores.
+    """
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {esquema}.transacciones (
+        id INTEGER PRIMARY KEY,
+        tipo TEXT CHECK(tipo IN ('compra', 'venta')) NOT NULL,
+        producto_id INTEGER NOT NULL,
+        cantidad INTEGER NOT NULL,
+        fecha TEXT,
+        total REAL NOT NULL,
+        venta_id INTEGER
+    )
+    """)
+    # Migración: archivos creados antes de los tickets
+    cursor.execute(f"PRAGMA {esquema}.table_info(transacciones)")
+    if "venta_id" not in [columna[1] for columna in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {esquema}.transacciones ADD COLUMN venta_id INTEGER")
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {esquema}.resumen_totales (
+        dia TEXT NOT NULL,
+        tipo TEXT CHECK(tipo IN ('compra', 'venta')) NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        cantidad INTEGER NOT NULL DEFAULT 0,
+        operaciones INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dia, tipo)
+    )
+    """)
+    cursor.execute(SQL_TABLA_RESUMEN_PRODUCTOS.format(esquema=f"{esquema}."))
+
+def verificar_planes_consulta():
+    """
+    Revisa con `EXPLAIN QUERY PLAN` que ninguna de las `CONSULTAS_FRECUENTES` haga
+    un recorrido completo (`SCAN`) de una tabla.
+
+    Retorno:
+    - list: Pares (consulta, detalle del plan) de las consultas que recorren una tabla completa.
+      Una lista vacía indica que todas usan índices.
+    """
+    conexion = obtener_conexion()
+    try:
+        recorridos = []
+        for consulta, parametros in CONSULTAS_FRECUENTES:
+            plan = conexion.execute(f"EXPLAIN QUERY PLAN {consulta}", parametros).fetchall()
+            for fila in plan:
+                detalle = fila[-1]
+                if detalle.startswith("SCAN"):
+                    recorridos.append((consulta, detalle))
+        return recorridos
+    finally:
+        conexion.close()
+
+def migracion_esquema_inicial(paso):
+    """
+    1. Tablas originales: `productos`, `transacciones` y `usuarios`.
+    """
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS productos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL,
+        tipo TEXT NOT NULL,
+        precio_compra REAL NOT NULL,
+        precio_venta REAL NOT NULL,
+        stock INTEGER NOT NULL
+    )
+    """)
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS transacciones (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tipo TEXT CHECK(tipo IN ('compra', 'venta')) NOT NULL,
+        producto_id INTEGER NOT NULL,
+        cantidad INTEGER NOT NULL,
+        fecha TEXT DEFAULT CURRENT_TIMESTAMP,
+        total REAL NOT NULL,
+        FOREIGN KEY (producto_id) REFERENCES productos (id)
+    )
+    """)
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL,
+        contrasena TEXT NOT NULL,
+        rol TEXT NOT NULL CHECK (rol IN ('admin', 'usuario'))
+    )
+    """)
+
+def migracion_baja_logica(paso):
+    """
+    2. Baja lógica de productos: columna `activo` y vista `productos_activos`.
+    """
+    if not paso.existe_columna("productos", "activo"):
+        paso.cursor.execute("ALTER TABLE productos ADD COLUMN activo INTEGER NOT NULL DEFAULT 1")
+
+    paso.cursor.execute(SQL_VISTA_PRODUCTOS_ACTIVOS)
+
+def migracion_resumen_totales(paso):
+    """
+    3. Totales acumulados por día y tipo (`resumen_totales`), mantenidos por un trigger.
+    Se rellenan por lotes a partir del historial existente.
+    """
+    existente = paso.existe_tabla("resumen_totales")
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS resumen_totales (
+        dia TEXT NOT NULL,
+        tipo TEXT CHECK(tipo IN ('compra', 'venta')) NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        cantidad INTEGER NOT NULL DEFAULT 0,
+        operaciones INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dia, tipo)
+    )
+    """)
+
+    paso.cursor.execute(SQL_TRIGGER_RESUMEN)
+
+    if existente:
+        return 0
+    return paso.procesar_por_lotes("transacciones", """
+        INSERT INTO resumen_totales (dia, tipo, total, cantidad, operaciones)
+        SELECT date(fecha), tipo, SUM(total), SUM(cantidad), COUNT(*)
+        FROM transacciones
+        WHERE id BETWEEN :desde AND :hasta
+        GROUP BY date(fecha), tipo
+        ON CONFLICT (dia, tipo) DO UPDATE SET
+            total = total + excluded.total,
+            cantidad = cantidad + excluded.cantidad,
+            operaciones = operaciones + excluded.operaciones
+    """)
+
+def migracion_resumen_productos(paso):
+    """
+    4. Totales por día, producto y tipo (`resumen_productos`, para los análisis), mantenidos
+    por un trigger. Se rellenan por lotes a partir del historial existente.
+    """
+    existente = paso.existe_tabla("resumen_productos")
+    paso.cursor.execute(SQL_TABLA_RESUMEN_PRODUCTOS.format(esquema=""))
+
+    paso.cursor.execute(SQL_TRIGGER_RESUMEN_PRODUCTOS)
+
+    if existente:
+        return 0
+    return paso.procesar_por_lotes("transacciones", """
+        INSERT INTO resumen_productos (dia, producto_id, tipo, total, cantidad, costo, operaciones)
+        SELECT date(t.fecha), t.producto_id, t.tipo, SUM(t.total), SUM(t.cantidad),
+               CASE WHEN t.tipo = 'venta' THEN SUM(t.cantidad) * COALESCE(p.precio_compra, 0) ELSE 0 END,
+               COUNT(*)
+        FROM transacciones t LEFT JOIN productos p ON p.id = t.producto_id
+        WHERE t.id BETWEEN :desde AND :hasta
+        GROUP BY date(t.fecha), t.producto_id, t.tipo
+        ON CONFLICT (dia, producto_id, tipo) DO UPDATE SET
+            total = total + excluded.total,
+            cantidad = cantidad + excluded.cantidad,
+            costo = costo + excluded.costo,
+            operaciones = operaciones + excluded.operaciones
+    """)
+
+def migracion_tickets(paso):
+    """
+    5. Tickets: tabla `ventas` y columna `transacciones.venta_id`.
+    """
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS ventas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT DEFAULT CURRENT_TIMESTAMP,
+        total REAL NOT NULL,
+        lineas INTEGER NOT NULL
+    )
+    """)
+    if not paso.existe_columna("transacciones", "venta_id"):
+        paso.cursor.execute("ALTER TABLE transacciones ADD COLUMN venta_id INTEGER REFERENCES ventas (id)")
+
+def migracion_configuracion(paso):
+    """
+    6. Tabla `configuracion` (pares clave-valor, por ejemplo `admin_creado`).
+    """
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS configuracion (
+        clave TEXT PRIMARY KEY,
+        valor TEXT
+    )
+    """)
+
+def migracion_alertas(paso):
+    """
+    7. Umbrales de stock bajo por producto y por tipo, e historial de alertas.
+    """
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS umbrales_producto (
+        producto_id INTEGER PRIMARY KEY REFERENCES productos (id),
+        umbral INTEGER NOT NULL CHECK (umbral >= 0)
+    )
+    """)
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS umbrales_tipo (
+        tipo TEXT PRIMARY KEY,
+        umbral INTEGER NOT NULL CHECK (umbral >= 0)
+    )
+    """)
+    paso.cursor.execute("""
+    CREATE TABLE IF NOT EXISTS alertas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        producto_id INTEGER NOT NULL REFERENCES productos (id),
+        stock INTEGER NOT NULL,
+        umbral INTEGER NOT NULL,
+        fecha TEXT DEFAULT CURRENT_TIMESTAMP,
+        resuelta TEXT,
+        notificada INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    # A lo sumo una alerta abierta por producto: las repetidas se descartan con INSERT OR IGNORE
+    paso.cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_alertas_abiertas ON alertas (producto_id) WHERE resuelta IS NULL"
+    )
+
+def migracion_indices(paso):
+    """
+    8. Índices secundarios de `INDICES` (y eliminación de `INDICES_OBSOLETOS`).
+    """
+    crear_indices(paso.cursor)
+
+def migracion_montos_en_centavos(paso):
+    """
+    9. Precios y montos en centavos (`INTEGER`, ver `dinero`) en lugar de `REAL`, para que las
+    sumas sean exactas. Reconstruye por lotes cada tabla de `COLUMNAS_MONTOS` y vuelve a crear
+    la vista, los triggers de los resúmenes y los índices.
+    """
+    paso.cursor.execute("DROP VIEW IF EXISTS productos_activos")
+    paso.cursor.execute("DROP TRIGGER IF EXISTS trg_transacciones_resumen")
+    paso.cursor.execute("DROP TRIGGER IF EXISTS trg_transacciones_resumen_productos")
+    filas = sum(convertir_a_centavos(paso, tabla, columnas) for tabla, columnas in COLUMNAS_MONTOS.items())
+    paso.cursor.execute(SQL_VISTA_PRODUCTOS_ACTIVOS)
+    paso.cursor.execute(SQL_TRIGGER_RESUMEN)
+    paso.cursor.execute(SQL_TRIGGER_RESUMEN_PRODUCTOS)
+    crear_indices(paso.cursor)
+    return filas
+
+def migracion_indices_resumen_umbrales(paso):
+    """
+    10. Índices de `INDICES` para los totales por tipo de `resumen_totales` y para el umbral
+    máximo de stock bajo.
+    """
+    crear_indices(paso.cursor)
+
+# Historial del esquema, en orden. Para cambiarlo se agrega una migración al final (nunca se
+# modifica una ya publicada): `crear_base_datos` aplica las pendientes de cada base.
+MIGRACIONES = [
+    Migracion(1, "Esquema inicial", migracion_esquema_inicial),
+    Migracion(2, "Baja lógica de productos", migracion_baja_logica),
+    Migracion(3, "Resumen por día y tipo", migracion_resumen_totales),
+    Migracion(4, "Resumen por día y producto", migracion_resumen_productos),
+    Migracion(5, "Tickets de varios productos", migracion_tickets),
+    Migracion(6, "Tabla de configuración", migracion_configuracion),
+    Migracion(7, "Umbrales y alertas de stock bajo", migracion_alertas),
+    Migracion(8, "Índices secundarios", migracion_indices),
+    Migracion(9, "Montos en centavos", migracion_montos_en_centavos),
+    Migracion(10, "Índices de resúmenes y umbrales", migracion_indices_resumen_umbrales),
+]
+
+def migrar_base_datos(tamano_lote=TAMANO_LOTE, simular=False, progreso=None):
+    """
+    Aplica las migraciones pendientes de `MIGRACIONES` a la base configurada en el pool.
+
+    Parámetros:
+    - tamano_lote (int, opcional): Filas por lote de los rellenos de datos.
+    - simular (bool, opcional): Si es True, las aplica sobre una copia temporal y la descarta,
+      para medir cuánto tardarán en una base grande sin modificarla.
+    - progreso (callable, opcional): Recibe (migracion, filas procesadas, filas totales) por lote.
+
+    Retorno:
+    - list: Un dict por migración aplicada con `numero`, `descripcion`, `segundos` y `filas`.
+
+    Excepciones:
+    - ErrorMigracion: Si una migración falla (la base queda en la versión anterior).
+    """
+    if simular:
+        return simular_migraciones(gestor_conexiones.gestor.ruta, MIGRACIONES, tamano_lote, progreso)
+    conexion = obtener_conexion()
+    try:
+        return aplicar_migraciones(conexion, MIGRACIONES, tamano_lote, progreso)
+    finally:
+        conexion.close()
+
+def crear_base_datos(perfil=PERFIL_POR_DEFECTO):
     """
     Crea y asegura la existencia de las tablas principales en la base de datos SQLite.
 
@@ -9,16 +529,30 @@ def crear_base_datos():
     - Crea las siguientes tablas, si no existen:
         1. `productos`: Almacena información sobre los productos.
         2. `transacciones`: Registra las compras y ventas realizadas.
-        3. `usuarios`: Almacena la información de los usuarios y sus roles.
+        3. `ventas`: Encabezado de cada ticket; sus líneas son transacciones con `venta_id`.
+        4. `usuarios`: Almacena la información de los usuarios y sus roles.
+        5. `resumen_totales`: Totales acumulados por día y tipo, mantenidos por un trigger.
+        6. `resumen_productos`: Totales acumulados por día, producto y tipo, mantenidos por un trigger.
+        7. `umbrales_producto` y `umbrales_tipo`: Umbrales de stock bajo por producto y por tipo.
+        8. `alertas`: Historial de alertas de stock bajo (a lo sumo una abierta por producto).
+        9. `configuracion`: Pares clave-valor de la aplicación (por ejemplo, `admin_creado`).
+        10. `migraciones`: Migraciones aplicadas, con su fecha y duración.
+    - Crea la vista `productos_activos`, con el número de orden de cada producto activo.
+    - Crea los índices secundarios de `INDICES`.
+    - Todo se hace con las migraciones numeradas de `MIGRACIONES` (ver `migraciones`): la
+      versión del esquema se guarda en `PRAGMA user_version` y solo se aplican las pendientes,
+      cada una en su propia transacción. Una base nueva las recibe todas; una existente, las
+      que le falten.
 
     Tablas:
     - `productos`:
         - id: Identificador único del producto.
         - nombre: Nombre del producto (texto, requerido).
         - tipo: Tipo del producto (texto, requerido).
-        - precio_compra: Precio de compra del producto (real, requerido).
-        - precio_venta: Precio de venta del producto (real, requerido).
+        - precio_compra: Precio de compra del producto, en centavos (entero, requerido).
+        - precio_venta: Precio de venta del producto, en centavos (entero, requerido).
         - stock: Cantidad de producto disponible en inventario (entero, requerido).
+        - activo: 1 si el producto está vigente, 0 si fue eliminado (los IDs nunca se reutilizan).
 
     - `transacciones`:
         - id: Identificador único de la transacción.
@@ -26,60 +560,71 @@ def crear_base_datos():
         - producto_id: Referencia al ID del producto (clave foránea).
         - cantidad: Cantidad involucrada en la transacción.
         - fecha: Fecha de la transacción (por defecto, la fecha actual).
-        - total: Monto total de la transacción.
+        - total: Monto total de la transacción, en centavos.
+        - venta_id: Ticket al que pertenece la línea (NULL si se registró suelta).
+
+    - `ventas`:
+        - id: Identificador único del ticket.
+        - fecha: Fecha del ticket (la misma que la de sus líneas).
+        - total: Suma de los totales de sus líneas, en centavos.
+        - lineas: Cantidad de líneas del ticket.
+
+    - `resumen_totales`:
+        - dia: Fecha (AAAA-MM-DD) de las transacciones acumuladas.
+        - tipo: Tipo de transacción ('compra' o 'venta').
+        - total: Suma de los montos del día para ese tipo, en centavos.
+        - cantidad: Suma de las unidades del día para ese tipo.
+        - operaciones: Número de transacciones del día para ese tipo.
+
+    - `resumen_productos`:
+        - dia, tipo, total, cantidad, operaciones: Igual que en `resumen_totales`, por producto.
+        - producto_id: Referencia al ID del producto.
+        - costo: Unidades vendidas × precio de compra del producto al momento de la venta, en centavos.
 
     - `usuarios`:
         - id: Identificador único del usuario.
         - nombre: Nombre del usuario (texto, requerido).
-        - contrasena: Contraseña del usuario (texto, requerido).
+        - contrasena: Hash de la contraseña del usuario (texto, requerido; ver `usuarios`).
+          Las bases anteriores la guardaban en texto plano: se reemplaza en el primer ingreso.
         - rol: Rol del usuario ('admin' o 'usuario').
 
+    - `umbrales_producto` / `umbrales_tipo`:
+        - producto_id / tipo: Producto o tipo de producto al que se aplica.
+        - umbral: Stock a partir del cual (inclusive) se avisa. El del producto tiene prioridad.
+
+    - `alertas`:
+        - id: Identificador único de la alerta.
+        - producto_id: Referencia al ID del producto.
+        - stock, umbral: Stock y umbral del producto al abrirse la alerta.
+        - fecha: Fecha en que se abrió.
+        - resuelta: Fecha en que el stock volvió a superar el umbral (NULL mientras está abierta).
+        - notificada: 1 si ya se mostró en la interfaz.
+
+    Parámetros:
+    - perfil (str, opcional): Perfil de rendimiento a aplicar ("durable" o "fast", ver
+      `gestor_conexiones.PERFILES`). Ambos activan el modo WAL, de modo que las lecturas
+      largas (por ejemplo, los reportes) no bloquean el registro de transacciones.
+
     Retorno:
     - Imprime un mensaje indicando que las tablas han sido creadas con éxito.
-    - Cierra la conexión a la base de datos después de la creación.
+    - Devuelve la conexión al pool después de la creación.
 
     Consideraciones:
-    - Utiliza `CREATE TABLE IF NOT EXISTS` para evitar errores si las tablas ya existen.
+    - Las bases creadas antes de las migraciones numeradas (versión 0) las reciben todas: cada
+      migración comprueba el esquema y no repite lo que ya estaba aplicado.
     - Asegúrate de manejar cualquier error de conexión o SQL en un bloque `try-except` para evitar interrupciones.
     """
-    conexion = sqlite3.connect("gestion_bebidas.db")
-    cursor = conexion.cursor()
+    aplicar_perfil(perfil)
+    conexion = obtener_conexion()
 
     try:
-        # Crear tabla de productos
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS productos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre TEXT NOT NULL,
-            tipo TEXT NOT NULL,
-            precio_compra REAL NOT NULL,
-            precio_venta REAL NOT NULL,
-            stock INTEGER NOT NULL
-        )
-        """)
-
-        # Crear tabla de transacciones
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS transacciones (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tipo TEXT CHECK(tipo IN ('compra', 'venta')) NOT NULL,
-            producto_id INTEGER NOT NULL,
-            cantidad INTEGER NOT NULL,
-            fecha TEXT DEFAULT CURRENT_TIMESTAMP,
-            total REAL NOT NULL,
-            FOREIGN KEY (producto_id) REFERENCES productos (id)
-        )
-        """)
-
-        # Crear tabla de usuarios
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS usuarios (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre TEXT NOT NULL,
-            contrasena TEXT NOT NULL,
-            rol TEXT NOT NULL CHECK (rol IN ('admin', 'usuario'))
-        )
-        """)
+        # Aplicar las migraciones pendientes (ninguna si la base ya está en la última versión),
+        # informando la duración de cada una salvo al crear una base vacía
+        nueva = conexion.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+        aplicar_migraciones(conexion, MIGRACIONES, informar=None if nueva else print)
+
+        # Actualizar las estadísticas del planificador
+        conexion.execute("PRAGMA optimize")
 
         print("Base de datos y tablas creadas exitosamente.")
     except sqlite3.Error as e:
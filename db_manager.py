@@ -1,22 +1,33 @@
+import glob
+import os
 import sqlite3
-import pandas as pd
-from fpdf import FPDF
-from tkinter import messagebox
+import gestor_conexiones
+from alertas import monitor
+from usuarios import hashear_contrasena
+from catalogo import catalogo
+from crear_bd import SQL_RECALCULAR_RESUMEN, SQL_RECALCULAR_RESUMEN_PRODUCTOS, crear_archivo
+from dinero import CENTAVOS, formatear
+from errores import DatosInvalidos, ErrorVentas, ProductoNoEncontrado, StockInsuficiente
+from eventos import PRODUCTOS_ACTUALIZADOS, TRANSACCIONES_REGISTRADAS, publicar
+
+# Bases que SQLite permite adjuntar a la vez (su valor por defecto), cuando la conexión no lo
+# informa: `Connection.getlimit` existe recién desde Python 3.11
+MAX_ADJUNTOS = 10
 
 # Funcion para conectar a la base de datos
 def obtener_conexion():
     """
-    Establece y devuelve una conexión a la base de datos SQLite.
+    Devuelve una conexión a la base de datos SQLite tomada del pool compartido.
 
-    - La función utiliza el archivo `gestion_bebidas.db` como base de datos.
-    - El parámetro `check_same_thread=False` permite compartir la conexión entre múltiples hilos,
-      lo cual es útil si se utiliza la base de datos en aplicaciones multihilo.
+    - La función utiliza el archivo `gestion_bebidas.db` como base de datos (ver `gestor_conexiones`).
+    - Las conexiones se reutilizan entre llamadas: `close()` no cierra la conexión,
+      sino que la devuelve al pool del hilo actual con los PRAGMAs ya aplicados.
 
     Retorna:
-        sqlite3.Connection: Objeto de conexión a la base de datos.
+        gestor_conexiones.ConexionPrestada: Conexión a la base de datos.
     """
 
-    return sqlite3.connect("gestion_bebidas.db", check_same_thread=False)
+    return gestor_conexiones.obtener_conexion()
 
 # Opcional
 def insertar_usuario_admin():
@@ -24,7 +35,8 @@ def insertar_usuario_admin():
     Inserta un usuario con privilegios de administrador en la base de datos al iniciar el programa por primera vez.
     
     - Verifica si el usuario administrador ya existe mediante una bandera en la base de datos.
-    - Si no existe, lo crea con valores predeterminados (nombre: 'admin', contraseña: 'admin123').
+    - Si no existe, lo crea con valores predeterminados (nombre: 'admin', contraseña: 'admin123'),
+      guardando solo el hash de la contraseña (ver `usuarios`).
     - Solo se ejecuta una vez al iniciar el programa por primera vez.
     
     Parámetros:
@@ -35,15 +47,7 @@ def insertar_usuario_admin():
     cursor = conexion.cursor()
 
     try:
-        # Crear la tabla de configuración si no existe
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS configuracion (
-                clave TEXT PRIMARY KEY,
-                valor TEXT
-            )
-        """)
-
-        # Verificar si ya se creó el usuario administrador
+        # Verificar si ya se creó el usuario administrador (la tabla la crea `crear_base_datos`)
         cursor.execute("SELECT valor FROM configuracion WHERE clave = 'admin_creado'")
         admin_creado = cursor.fetchone()
 
@@ -53,7 +57,7 @@ def insertar_usuario_admin():
 
         # Insertar el usuario administrador
         cursor.execute("INSERT INTO usuarios (nombre, contrasena, rol) VALUES (?, ?, ?)",
-                       ("admin", "admin123", "admin"))
+                       ("admin", hashear_contrasena("admin123"), "admin"))
 
         # Registrar que el administrador ha sido creado
         cursor.execute("INSERT OR REPLACE INTO configuracion (clave, valor) VALUES (?, ?)",
@@ -73,8 +77,8 @@ def agregar_producto_db(nombre, tipo, precio_compra, precio_venta, stock):
     Parámetros:
         nombre (str): Nombre del producto.
         tipo (str): Tipo o categoría del producto (por ejemplo, "bebida alcohólica", "refresco").
-        precio_compra (float): Precio de compra del producto.
-        precio_venta (float): Precio de venta del producto.
+        precio_compra (int): Precio de compra del producto, en centavos (ver `dinero.a_centavos`).
+        precio_venta (int): Precio de venta del producto, en centavos.
         stock (int): Cantidad inicial de unidades disponibles en inventario.
 
     Manejo de errores:
@@ -85,8 +89,11 @@ def agregar_producto_db(nombre, tipo, precio_compra, precio_venta, stock):
     cursor = conexion.cursor()
     cursor.execute("INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, ?, ?, ?, ?)",
                    (nombre, tipo, precio_compra, precio_venta, stock))
-    conexion.commit()
+    with catalogo.escritura():
+        conexion.commit()
+        catalogo.registrar_alta(cursor.lastrowid, nombre, tipo, precio_compra, precio_venta, stock)
     conexion.close()
+    publicar(PRODUCTOS_ACTUALIZADOS, ids=[cursor.lastrowid])
 
 def registrar_transaccion_db(producto_id, tipo, cantidad):
     """
@@ -97,116 +104,661 @@ def registrar_transaccion_db(producto_id, tipo, cantidad):
         tipo (str): Tipo de transacción ("compra" o "venta").
         cantidad (int): Cantidad de producto que se compra o vende.
 
-    Manejo de errores:
-    - Si el producto no se encuentra, muestra un mensaje de error y no realiza ninguna operación.
-    - Si el stock es insuficiente para una venta, detiene la operación y muestra un mensaje de advertencia.
-    
+    El stock se descuenta con un único UPDATE condicional (`stock >= cantidad`) dentro de
+    `BEGIN IMMEDIATE`, junto con el INSERT: dos ventas concurrentes del mismo producto nunca
+    pueden dejar el stock en negativo, porque la condición se evalúa sobre el valor vigente
+    con el bloqueo de escritura tomado. El trigger `trg_transacciones_resumen` actualiza
+    `resumen_totales` dentro de la misma transacción.
+
+    Al confirmar, publica el evento `TRANSACCIONES_REGISTRADAS`.
+
     Retorna:
-        True si la transacción se registra correctamente, False en caso contrario.
+        int: Total de la transacción registrada, en centavos.
+
+    Excepciones:
+        DatosInvalidos: Si el tipo no es "compra" ni "venta" o la cantidad no es un entero positivo.
+        ProductoNoEncontrado: Si no existe un producto activo con ese ID.
+        StockInsuficiente: Si la venta dejaría el stock en negativo.
+        sqlite3.Error: Si falla la escritura (la transacción se revierte).
     """
+    if tipo not in ("compra", "venta"):
+        raise DatosInvalidos("Tipo de transacción inválido.")
+    # Una cantidad negativa pasaría la condición `stock >= ?` y sumaría stock en una venta
+    if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+        raise DatosInvalidos("La cantidad debe ser mayor a 0.")
+
     conexion = obtener_conexion()
     cursor = conexion.cursor()
 
     try:
-        # Obtener información del producto
-        cursor.execute("SELECT stock, precio_compra, precio_venta FROM productos WHERE id = ?", (producto_id,))
-        producto = cursor.fetchone()
+        # Tomar el bloqueo de escritura antes de tocar el stock
+        cursor.execute("BEGIN IMMEDIATE")
 
-        if not producto:
-            messagebox.showerror("Error", "Producto no encontrado.")
-            return False
+        # Actualizar el stock solo si el producto está activo y (en ventas) alcanza
+        if tipo == "compra":
+            cursor.execute(
+                "UPDATE productos SET stock = stock + ? WHERE id = ? AND activo = 1", (cantidad, producto_id)
+            )
+        else:
+            cursor.execute(
+                "UPDATE productos SET stock = stock - ? WHERE id = ? AND activo = 1 AND stock >= ?",
+                (cantidad, producto_id, cantidad),
+            )
 
-        stock_actual, precio_compra, precio_venta = producto
+        if cursor.rowcount == 0:
+            # Solo en el caso de error: averiguar si falta el producto o el stock
+            cursor.execute("SELECT stock FROM productos WHERE id = ? AND activo = 1", (producto_id,))
+            producto = cursor.fetchone()
+            if not producto:
+                raise ProductoNoEncontrado(producto_id)
+            raise StockInsuficiente(producto_id, producto[0], cantidad)
 
-        # Determinar el nuevo stock
-        nuevo_stock = stock_actual + cantidad if tipo == "compra" else stock_actual - cantidad
-        if nuevo_stock < 0:
-            messagebox.showwarning("Error", "Stock insuficiente para realizar la venta.")
-            return False
+        # Registrar la transacción con el precio vigente del producto (en centavos: el total es exacto)
+        cursor.execute(f"""
+            INSERT INTO transacciones (tipo, producto_id, cantidad, total)
+            SELECT ?, id, ?, {"precio_compra" if tipo == "compra" else "precio_venta"} * ?
+            FROM productos WHERE id = ?
+        """, (tipo, cantidad, cantidad, producto_id))
+        cursor.execute("SELECT total FROM transacciones WHERE id = ?", (cursor.lastrowid,))
+        total = cursor.fetchone()[0]
 
-        # Determinar el total de la transacción
-        precio = precio_compra if tipo == "compra" else precio_venta
-        total = precio * cantidad
+        # Confirmar los cambios y reflejarlos en el catálogo en memoria
+        with catalogo.escritura():
+            conexion.commit()
+            catalogo.registrar_stock(producto_id, cantidad if tipo == "compra" else -cantidad)
 
-        # Actualizar el stock del producto
-        cursor.execute("UPDATE productos SET stock = ? WHERE id = ?", (nuevo_stock, producto_id))
+    except sqlite3.Error:
+        conexion.rollback()
+        raise
 
-        # Registrar la transacción
-        cursor.execute("""
+    finally:
+        conexion.close()
+
+    publicar(TRANSACCIONES_REGISTRADAS, productos=[producto_id], cantidad=1)
+    return total
+
+def registrar_transacciones_lote(transacciones, tamano_lote=500):
+    """
+    Registra muchas transacciones en lotes, con un solo commit por lote y sin mostrar diálogos.
+
+    Por cada lote:
+    - Toma el bloqueo de escritura (`BEGIN IMMEDIATE`) antes de leer, para que otro escritor
+      no pueda cambiar el stock entre la consulta y la actualización.
+    - Consulta el stock y los precios de todos los productos involucrados en una sola consulta.
+    - Valida cada fila en orden, acumulando el stock resultante en memoria.
+    - Aplica los cambios de stock y los INSERT con `executemany` y confirma una sola vez.
+
+    Parámetros:
+        transacciones (iterable): Tuplas (producto_id, tipo, cantidad), con tipo "compra" o "venta".
+        tamano_lote (int, opcional): Cantidad máxima de filas por commit. Por defecto 500.
+
+    Si se registró alguna fila, publica el evento `TRANSACCIONES_REGISTRADAS` por cada lote.
+
+    Retorna:
+        list: Un diccionario por fila, en el mismo orden de entrada, con las claves
+        `exito` (bool), `total` (int en centavos, o None) y `error` (`errores.ErrorVentas` o None;
+        `str(error)` da el mensaje para el usuario).
+    """
+    resultados = []
+    lote = []
+    for fila in transacciones:
+        lote.append(fila)
+        if len(lote) >= tamano_lote:
+            resultados.extend(_registrar_lote(lote))
+            lote = []
+    if lote:
+        resultados.extend(_registrar_lote(lote))
+    return resultados
+
+def _registrar_lote(lote):
+    """
+    Registra un lote de transacciones en una sola transacción (ver `registrar_transacciones_lote`).
+    """
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        # Tomar el bloqueo de escritura antes de leer el stock que se va a validar
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Obtener stock y precios de todos los productos del lote en una sola consulta
+        ids = list({fila[0] for fila in lote})
+        marcadores = ", ".join("?" * len(ids))
+        cursor.execute(
+            f"SELECT id, stock, precio_compra, precio_venta FROM productos WHERE activo = 1 AND id IN ({marcadores})", ids
+        )
+        productos = {id_producto: datos for id_producto, *datos in cursor.fetchall()}
+        stock = {id_producto: datos[0] for id_producto, datos in productos.items()}
+
+        resultados = []
+        inserciones = []
+        for producto_id, tipo, cantidad in lote:
+            if tipo not in ("compra", "venta"):
+                resultados.append({"exito": False, "total": None, "error": DatosInvalidos("Tipo de transacción inválido.")})
+                continue
+            if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+                resultados.append({"exito": False, "total": None, "error": DatosInvalidos("La cantidad debe ser mayor a 0.")})
+                continue
+            if producto_id not in productos:
+                resultados.append({"exito": False, "total": None, "error": ProductoNoEncontrado(producto_id)})
+                continue
+
+            _, precio_compra, precio_venta = productos[producto_id]
+            nuevo_stock = stock[producto_id] + cantidad if tipo == "compra" else stock[producto_id] - cantidad
+            if nuevo_stock < 0:
+                error = StockInsuficiente(producto_id, stock[producto_id], cantidad)
+                resultados.append({"exito": False, "total": None, "error": error})
+                continue
+
+            stock[producto_id] = nuevo_stock
+            total = (precio_compra if tipo == "compra" else precio_venta) * cantidad
+            inserciones.append((tipo, producto_id, cantidad, total))
+            resultados.append({"exito": True, "total": total, "error": None})
+
+        # Actualizar solo los productos cuyo stock cambió (como diferencia, igual que las filas sueltas)
+        cambios = [
+            (nuevo - productos[id_producto][0], id_producto)
+            for id_producto, nuevo in stock.items() if nuevo != productos[id_producto][0]
+        ]
+        cursor.executemany("UPDATE productos SET stock = stock + ? WHERE id = ?", cambios)
+        cursor.executemany("""
             INSERT INTO transacciones (tipo, producto_id, cantidad, total)
             VALUES (?, ?, ?, ?)
-        """, (tipo, producto_id, cantidad, total))
+        """, inserciones)
 
-        # Confirmar los cambios
-        conexion.commit()
-        return True  # Transacción exitosa
+        with catalogo.escritura():
+            conexion.commit()
+            for diferencia, id_producto in cambios:
+                catalogo.registrar_stock(id_producto, diferencia)
 
     except sqlite3.Error as e:
-        messagebox.showerror("Error", f"No se pudo registrar la transacción: {e}")
-        return False
+        conexion.rollback()
+        error = ErrorVentas(f"No se pudo registrar el lote: {e}")
+        return [{"exito": False, "total": None, "error": error} for _ in lote]
+
+    finally:
+        conexion.close()
+
+    if inserciones:
+        publicar(TRANSACCIONES_REGISTRADAS, productos=[id_producto for _, id_producto in cambios],
+                 cantidad=len(inserciones))
+    return resultados
+
+def registrar_ticket_db(lineas):
+    """
+    Registra una venta de varios productos (ticket) en una sola transacción.
+
+    - Toma el bloqueo de escritura (`BEGIN IMMEDIATE`) y consulta stock y precios de todos
+      los productos del ticket en una sola consulta.
+    - Valida todas las líneas antes de escribir (un producto repetido en varias líneas se
+      valida por la suma de sus cantidades): si alguna falla, no se registra nada.
+    - Inserta el encabezado en `ventas` y una transacción de venta por línea con su `venta_id`,
+      descuenta el stock y confirma una sola vez.
+    - El stock bajo lo revisa el monitor de `alertas` (si está suscrito) al recibir el evento,
+      solo para los productos del ticket.
+
+    Parámetros:
+        lineas (iterable): Pares (producto_id, cantidad).
+
+    Al confirmar, publica el evento `TRANSACCIONES_REGISTRADAS`.
+
+    Retorna:
+        dict: `venta_id`, `fecha`, `total` y `lineas` (lista de dicts con `producto_id`,
+        `cantidad` y `total`). Los totales, en centavos.
+
+    Excepciones:
+        DatosInvalidos: Si el ticket está vacío o alguna cantidad no es un entero positivo.
+        ProductoNoEncontrado: Si alguna línea no corresponde a un producto activo.
+        StockInsuficiente: Si el stock no alcanza para la cantidad total de un producto.
+        sqlite3.Error: Si falla la escritura (la transacción se revierte).
+    """
+    lineas = list(lineas)
+    if not lineas:
+        raise DatosInvalidos("El ticket no tiene líneas.")
+    pedido = {}
+    for producto_id, cantidad in lineas:
+        if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+            raise DatosInvalidos("La cantidad debe ser mayor a 0.")
+        pedido[producto_id] = pedido.get(producto_id, 0) + cantidad
+
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Stock y precio de todos los productos del ticket en una sola consulta
+        marcadores = ", ".join("?" * len(pedido))
+        cursor.execute(
+            f"SELECT id, stock, precio_venta FROM productos WHERE activo = 1 AND id IN ({marcadores})",
+            list(pedido),
+        )
+        productos = {id_producto: datos for id_producto, *datos in cursor.fetchall()}
+
+        for producto_id, cantidad in pedido.items():
+            if producto_id not in productos:
+                raise ProductoNoEncontrado(producto_id)
+            if productos[producto_id][0] < cantidad:
+                raise StockInsuficiente(producto_id, productos[producto_id][0], cantidad)
+
+        detalle = [
+            {"producto_id": producto_id, "cantidad": cantidad, "total": productos[producto_id][1] * cantidad}
+            for producto_id, cantidad in lineas
+        ]
+        total = sum(linea["total"] for linea in detalle)
+
+        # Encabezado del ticket; sus líneas llevan la misma fecha
+        cursor.execute("INSERT INTO ventas (total, lineas) VALUES (?, ?)", (total, len(detalle)))
+        venta_id = cursor.lastrowid
+        cursor.execute("SELECT fecha FROM ventas WHERE id = ?", (venta_id,))
+        fecha = cursor.fetchone()[0]
+
+        cursor.executemany(
+            "UPDATE productos SET stock = stock - ? WHERE id = ?",
+            [(cantidad, producto_id) for producto_id, cantidad in pedido.items()],
+        )
+        cursor.executemany("""
+            INSERT INTO transacciones (tipo, producto_id, cantidad, fecha, total, venta_id)
+            VALUES ('venta', ?, ?, ?, ?, ?)
+        """, [(linea["producto_id"], linea["cantidad"], fecha, linea["total"], venta_id) for linea in detalle])
+
+        with catalogo.escritura():
+            conexion.commit()
+            for producto_id, cantidad in pedido.items():
+                catalogo.registrar_stock(producto_id, -cantidad)
+
+    except sqlite3.Error:
+        conexion.rollback()
+        raise
 
     finally:
         conexion.close()
 
+    publicar(TRANSACCIONES_REGISTRADAS, productos=list(pedido), cantidad=len(detalle))
+    return {"venta_id": venta_id, "fecha": fecha, "total": total, "lineas": detalle}
+
 def reorganizar_ids():
     """
-    Reorganiza los IDs de la tabla `productos` de manera secuencial eliminando 
-    los posibles saltos en el contador autoincremental.
+    Compacta los IDs de la tabla `productos` (operación de mantenimiento, fuera de horario).
+
+    La eliminación de productos es lógica (`activo = 0`) y mantiene los IDs estables, por lo que
+    esta función ya no se ejecuta en cada eliminación. Cuando se quiere compactar:
+    - Borra físicamente los productos inactivos que no tienen transacciones (vivas ni archivadas).
+    - Renumera los productos restantes de forma secuencial, en orden de ID.
+    - Actualiza `transacciones.producto_id` con el nuevo ID en una sola pasada, también en
+      los archivos históricos (ver `cerrar_periodo`), y los umbrales y alertas de stock bajo.
+    Todo ocurre en una única transacción, sin reconstruir la tabla. Con la base principal en
+    modo WAL, SQLite confirma cada archivo adjuntado por separado, por lo que conviene
+    ejecutarla sin otros procesos usando la base de datos.
+
+    Retorno:
+    - dict: Cantidad de productos `eliminados`, `renumerados` y `transacciones` actualizadas.
     """
     conexion = obtener_conexion()
     cursor = conexion.cursor()
+    esquemas = []
 
-    # Crear tabla temporal con los datos existentes
-    cursor.execute("""
-        CREATE TEMPORARY TABLE productos_temp AS
-        SELECT * FROM productos;
-    """)
-
-    # Borrar la tabla original
-    cursor.execute("DROP TABLE productos;")
-
-    # Crear la tabla original nuevamente
-    cursor.execute("""
-        CREATE TABLE productos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre TEXT NOT NULL,
-            tipo TEXT NOT NULL,
-            precio_compra REAL NOT NULL,
-            precio_venta REAL NOT NULL,
-            stock INTEGER NOT NULL
-        );
-    """)
-
-    # Insertar los datos de la tabla temporal
-    cursor.execute("""
-        INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock)
-        SELECT nombre, tipo, precio_compra, precio_venta, stock FROM productos_temp;
-    """)
-
-    # Borrar la tabla temporal
-    cursor.execute("DROP TABLE productos_temp;")
-
-    # Confirmar los cambios y cerrar la conexión
-    conexion.commit()
-    conexion.close()
+    try:
+        fuente, esquemas = adjuntar_archivo(conexion)
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Borrar los productos dados de baja que ninguna transacción referencia
+        cursor.execute(f"""
+            DELETE FROM productos
+            WHERE activo = 0 AND NOT EXISTS (SELECT 1 FROM {fuente} WHERE producto_id = productos.id)
+        """)
+        eliminados = cursor.rowcount
+        for tabla in ("umbrales_producto", "alertas"):
+            cursor.execute(f"DELETE FROM {tabla} WHERE producto_id NOT IN (SELECT id FROM productos)")
+
+        # Tabla de correspondencia entre el ID actual y el nuevo ID secuencial
+        cursor.execute("DROP TABLE IF EXISTS temp.mapa_ids")
+        cursor.execute("CREATE TEMPORARY TABLE mapa_ids (viejo INTEGER PRIMARY KEY, nuevo INTEGER NOT NULL)")
+        cursor.execute("""
+            INSERT INTO mapa_ids (viejo, nuevo)
+            SELECT id, ROW_NUMBER() OVER (ORDER BY id) FROM productos
+        """)
+        cursor.execute("DELETE FROM mapa_ids WHERE viejo = nuevo")
+
+        # Renumerar en dos pasos (pasando por IDs negativos) para no chocar con IDs existentes
+        cursor.execute("""
+            UPDATE productos SET id = -(SELECT nuevo FROM mapa_ids WHERE viejo = productos.id)
+            WHERE id IN (SELECT viejo FROM mapa_ids)
+        """)
+        renumerados = cursor.rowcount
+        cursor.execute("UPDATE productos SET id = -id WHERE id < 0")
+
+        # Actualizar las referencias de las transacciones (vivas y archivadas)
+        transacciones = 0
+        for esquema in ["main", *esquemas]:
+            cursor.execute(f"""
+                UPDATE {esquema}.transacciones SET producto_id = (SELECT nuevo FROM mapa_ids WHERE viejo = producto_id)
+                WHERE producto_id IN (SELECT viejo FROM mapa_ids)
+            """)
+            transacciones += cursor.rowcount
+
+            # En el resumen por producto, pasar por IDs negativos para no chocar con la clave primaria
+            cursor.execute(f"""
+                UPDATE {esquema}.resumen_productos SET producto_id = -(SELECT nuevo FROM mapa_ids WHERE viejo = producto_id)
+                WHERE producto_id IN (SELECT viejo FROM mapa_ids)
+            """)
+            cursor.execute(f"UPDATE {esquema}.resumen_productos SET producto_id = -producto_id WHERE producto_id < 0")
+
+        # Umbrales (clave primaria) y alertas (una abierta por producto): también en dos pasos
+        for tabla in ("umbrales_producto", "alertas"):
+            cursor.execute(f"""
+                UPDATE {tabla} SET producto_id = -(SELECT nuevo FROM mapa_ids WHERE viejo = producto_id)
+                WHERE producto_id IN (SELECT viejo FROM mapa_ids)
+            """)
+            cursor.execute(f"UPDATE {tabla} SET producto_id = -producto_id WHERE producto_id < 0")
+
+        # Continuar el contador autoincremental desde el último ID
+        cursor.execute("""
+            UPDATE sqlite_sequence SET seq = (SELECT COALESCE(MAX(id), 0) FROM productos)
+            WHERE name = 'productos'
+        """)
+        cursor.execute("DROP TABLE temp.mapa_ids")
+
+        # Confirmar los cambios; los IDs del catálogo y del monitor en memoria ya no sirven
+        with catalogo.escritura():
+            conexion.commit()
+            catalogo.invalidar()
+        monitor.invalidar()
+        return {"eliminados": eliminados, "renumerados": renumerados, "transacciones": transacciones}
+
+    except sqlite3.Error:
+        conexion.rollback()
+        raise
+
+    finally:
+        separar_archivo(conexion, esquemas)
+        conexion.close()
+
+def ruta_archivo(anio):
+    """
+    Devuelve la ruta del archivo histórico de un año, junto a la base de datos principal
+    (por ejemplo, `gestion_bebidas_archivo_2025.db`).
+    """
+    base = os.path.splitext(gestor_conexiones.gestor.ruta)[0]
+    return f"{base}_archivo_{anio}.db"
+
+def anios_archivados():
+    """
+    Retorno:
+    - list: Años (int) que tienen un archivo histórico, en orden ascendente.
+    """
+    prefijo = os.path.splitext(gestor_conexiones.gestor.ruta)[0] + "_archivo_"
+    anios = []
+    for ruta in glob.glob(glob.escape(prefijo) + "*.db"):
+        anio = ruta[len(prefijo):-len(".db")]
+        if anio.isdigit():
+            anios.append(int(anio))
+    return sorted(anios)
+
+def cerrar_periodo(hasta=None):
+    """
+    Cierra un período: mueve las transacciones anteriores a `hasta` a los archivos históricos
+    (uno por año, ver `ruta_archivo`) y las quita de la tabla viva.
+
+    - Cada año se copia en bloque (`INSERT ... SELECT` sobre el archivo adjuntado) junto con
+      sus resúmenes por día, y se borra de `transacciones` y `resumen_totales` en la misma transacción.
+    - Las transacciones conservan su ID, por lo que el contador no se reinicia y los IDs
+      siguen siendo únicos entre el archivo y la tabla viva.
+    - La tabla viva queda con las transacciones del período abierto; las páginas liberadas
+      se reutilizan para las nuevas, sin que el archivo crezca.
+    - Volver a ejecutar un cierre interrumpido no duplica nada. En WAL, el commit que abarca
+      el archivo y la base principal no es atómico: el archivo puede quedar confirmado y la
+      tabla viva no. Las transacciones se copian con `INSERT OR IGNORE`. A los resúmenes del
+      archivo se les suma solo la parte de las que todavía no estaban archivadas (el resumen
+      vivo menos lo que ya está en el archivo). El costo de esa parte se prorratea por cantidad.
+    - Las transacciones sin fecha (`fecha` NULL, de bases antiguas) no pertenecen a ningún
+      año: quedan en la tabla viva y no se cuentan en el resultado.
+
+    Parámetros:
+    - hasta (str, opcional): Primer día ("AAAA-MM-DD") que queda abierto. Por ejemplo,
+      "2025-02-01" cierra enero y todo lo anterior. Si es None, se archivan todas.
+
+    Retorno:
+    - dict: Transacciones archivadas por año.
+    """
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    archivadas = {}
+
+    try:
+        condicion, parametros = (" WHERE fecha < ?", [hasta]) if hasta else ("", [])
+        cursor.execute(f"SELECT DISTINCT substr(fecha, 1, 4) FROM transacciones{condicion}", parametros)
+        anios = sorted(int(fila[0]) for fila in cursor.fetchall() if fila[0])
+
+        for anio in anios:
+            inicio = f"{anio}-01-01"
+            fin = f"{anio + 1}-01-01"
+            if hasta:
+                fin = min(fin, hasta)
+
+            cursor.execute("ATTACH DATABASE ? AS archivo", (ruta_archivo(anio),))
+            try:
+                crear_archivo(cursor, "archivo")
+                cursor.execute("BEGIN IMMEDIATE")
+
+                # Lo que un cierre interrumpido ya dejó en el archivo (normalmente, nada)
+                cursor.execute("DROP TABLE IF EXISTS temp.ya_archivadas")
+                cursor.execute("""
+                    CREATE TEMPORARY TABLE ya_archivadas AS
+                    SELECT date(fecha) AS dia, producto_id, tipo, SUM(total) AS total,
+                           SUM(cantidad) AS cantidad, COUNT(*) AS operaciones
+                    FROM main.transacciones
+                    WHERE fecha >= ? AND fecha < ? AND id IN (SELECT id FROM archivo.transacciones)
+                    GROUP BY date(fecha), producto_id, tipo
+                """, (inicio, fin))
+
+                # Copiar en bloque las transacciones y el resumen del año
+                cursor.execute("""
+                    INSERT OR IGNORE INTO archivo.transacciones (id, tipo, producto_id, cantidad, fecha, total, venta_id)
+                    SELECT id, tipo, producto_id, cantidad, fecha, total, venta_id FROM main.transacciones
+                    WHERE fecha >= ? AND fecha < ?
+                """, (inicio, fin))
+                archivadas[anio] = cursor.rowcount
+                cursor.execute("""
+                    INSERT INTO archivo.resumen_totales (dia, tipo, total, cantidad, operaciones)
+                    SELECT r.dia, r.tipo, r.total - COALESCE(SUM(y.total), 0), r.cantidad - COALESCE(SUM(y.cantidad), 0),
+                           r.operaciones - COALESCE(SUM(y.operaciones), 0)
+                    FROM main.resumen_totales r
+                    LEFT JOIN temp.ya_archivadas y ON y.dia = r.dia AND y.tipo = r.tipo
+                    WHERE r.dia >= ? AND r.dia < ?
+                    GROUP BY r.dia, r.tipo
+                    HAVING r.operaciones > COALESCE(SUM(y.operaciones), 0)
+                    ON CONFLICT (dia, tipo) DO UPDATE SET
+                        total = total + excluded.total,
+                        cantidad = cantidad + excluded.cantidad,
+                        operaciones = operaciones + excluded.operaciones
+                """, (inicio, fin))
+                cursor.execute("""
+                    INSERT INTO archivo.resumen_productos (dia, producto_id, tipo, total, cantidad, costo, operaciones)
+                    SELECT r.dia, r.producto_id, r.tipo, r.total - COALESCE(y.total, 0), r.cantidad - COALESCE(y.cantidad, 0),
+                           r.costo - COALESCE(r.costo * y.cantidad / NULLIF(r.cantidad, 0), 0),
+                           r.operaciones - COALESCE(y.operaciones, 0)
+                    FROM main.resumen_productos r
+                    LEFT JOIN temp.ya_archivadas y ON y.dia = r.dia AND y.producto_id = r.producto_id AND y.tipo = r.tipo
+                    WHERE r.dia >= ? AND r.dia < ? AND r.operaciones > COALESCE(y.operaciones, 0)
+                    ON CONFLICT (dia, producto_id, tipo) DO UPDATE SET
+                        total = total + excluded.total,
+                        cantidad = cantidad + excluded.cantidad,
+                        costo = costo + excluded.costo,
+                        operaciones = operaciones + excluded.operaciones
+                """, (inicio, fin))
+
+                # Quitar el período de la tabla viva
+                cursor.execute("DELETE FROM main.resumen_totales WHERE dia >= ? AND dia < ?", (inicio, fin))
+                cursor.execute("DELETE FROM main.resumen_productos WHERE dia >= ? AND dia < ?", (inicio, fin))
+                cursor.execute("DELETE FROM main.transacciones WHERE fecha >= ? AND fecha < ?", (inicio, fin))
+                cursor.execute("DROP TABLE temp.ya_archivadas")
+                conexion.commit()
+            except sqlite3.Error:
+                conexion.rollback()
+                raise
+            finally:
+                cursor.execute("DETACH DATABASE archivo")
+
+        return archivadas
+
+    finally:
+        conexion.close()
 
 def reiniciar_transacciones():
     """
-    Reinicia la tabla de transacciones eliminando todos los registros y 
-    restableciendo el contador de IDs autoincrementales.
+    Reinicia la tabla de transacciones al cierre del período.
+
+    En lugar de borrar el historial, mueve todas las transacciones (y sus totales acumulados)
+    a los archivos históricos con `cerrar_periodo`, donde siguen disponibles para los reportes.
+
+    Retorno:
+    - dict: Transacciones archivadas por año.
+    """
+    return cerrar_periodo()
+
+def adjuntar_archivo(conexion, desde=None, hasta=None, tabla="transacciones",
+                     columnas="id, tipo, producto_id, cantidad, fecha, total"):
+    """
+    Adjunta a la conexión los archivos históricos de los años comprendidos en el rango
+    y devuelve la fuente SQL que une sus filas con las de la tabla viva.
+
+    La fuente se usa en lugar de `tabla` en el `FROM` de una consulta. Cuando no hay
+    archivos en el rango, es simplemente el nombre de la tabla. Los archivos anteriores a los
+    montos en centavos se convierten al adjuntarlos por primera vez (ver `crear_archivo`).
+
+    Parámetros:
+    - conexion: Conexión del pool sobre la que se hará la consulta.
+    - desde, hasta (str, opcional): Rango de fechas ("AAAA-MM-DD") para elegir los años a adjuntar.
+    - tabla (str, opcional): Tabla a unir: `transacciones` o uno de los resúmenes.
+    - columnas (str, opcional): Columnas de la tabla que se seleccionan de cada parte.
+
+    Retorno:
+    - tuple: (fuente SQL, lista de esquemas adjuntados para pasar a `separar_archivo`).
+
+    Excepciones:
+    - ValueError: Si el rango abarca más años de los que SQLite permite adjuntar a la vez.
+    """
+    anios = [
+        anio for anio in anios_archivados()
+        if (not desde or anio >= int(desde[:4])) and (not hasta or anio <= int(hasta[:4]))
+    ]
+    if not anios:
+        return tabla, []
+    obtener_limite = getattr(conexion, "getlimit", None)
+    limite = obtener_limite(sqlite3.SQLITE_LIMIT_ATTACHED) if obtener_limite else MAX_ADJUNTOS
+    if len(anios) > limite:
+        raise ValueError("El rango de fechas abarca demasiados años archivados. Acote el período consultado.")
+
+    partes = []
+    esquemas = []
+    try:
+        for anio in anios:
+            esquema = f"archivo_{anio}"
+            conexion.execute(f"ATTACH DATABASE ? AS {esquema}", (ruta_archivo(anio),))
+            esquemas.append(esquema)
+            crear_archivo(conexion.cursor(), esquema)
+            partes.append(f"SELECT {columnas} FROM {esquema}.{tabla}")
+    except sqlite3.Error:
+        separar_archivo(conexion, esquemas)
+        raise
+    partes.append(f"SELECT {columnas} FROM main.{tabla}")
+    return f"({' UNION ALL '.join(partes)}) AS {tabla}", esquemas
+
+def separar_archivo(conexion, esquemas):
+    """
+    Separa de la conexión los archivos adjuntados por `adjuntar_archivo`.
+    """
+    for esquema in esquemas:
+        conexion.execute(f"DETACH DATABASE {esquema}")
+
+def verificar_resumen_totales(reparar=False):
+    """
+    Recalcula los resúmenes que mantienen los triggers desde `transacciones` y los compara con
+    lo registrado: `resumen_totales` (por día y tipo) y `resumen_productos` (por día, producto y tipo).
+
+    Parámetros:
+    - reparar (bool, opcional): Si es True, reconstruye ambos resúmenes desde cero
+      (en una sola transacción) después de la comparación.
+
+    Los montos están en centavos, así que las sumas son exactas y se comparan sin tolerancia.
+    El costo de `resumen_productos` no se compara: el trigger lo toma del precio de compra
+    vigente en cada venta, que el historial no guarda. Al reparar, se conserva el costo
+    registrado de los grupos cuya cantidad coincide; los demás se recalculan con el precio actual.
+
+    Retorno:
+    - list: Un diccionario por cada grupo con diferencias, con las claves `tabla`, `dia`, `tipo`
+      (y `producto_id` en `resumen_productos`), `esperado` y `registrado` (tuplas total en
+      centavos, cantidad, operaciones; None si falta la fila).
+      Una lista vacía indica que los resúmenes son consistentes.
     """
     conexion = obtener_conexion()
     cursor = conexion.cursor()
 
-    # Eliminar todos los registros de la tabla transacciones
-    cursor.execute("DELETE FROM transacciones;")
+    try:
+        diferencias = _comparar_resumen(cursor, "resumen_totales", ("dia", "tipo"), """
+            SELECT date(fecha), tipo, SUM(total), SUM(cantidad), COUNT(*)
+            FROM transacciones
+            GROUP BY date(fecha), tipo
+        """)
+        diferencias += _comparar_resumen(cursor, "resumen_productos", ("dia", "producto_id", "tipo"), """
+            SELECT date(fecha), producto_id, tipo, SUM(total), SUM(cantidad), COUNT(*)
+            FROM transacciones
+            GROUP BY date(fecha), producto_id, tipo
+        """)
 
-    # Restablecer el contador autoincremental de la tabla transacciones
-    cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'transacciones';")
+        if reparar:
+            cursor.execute("DELETE FROM resumen_totales")
+            cursor.execute(SQL_RECALCULAR_RESUMEN)
 
-    # Confirmar los cambios y cerrar la conexión
-    conexion.commit()
-    conexion.close()
+            # Recalcular aparte para conservar el costo histórico de los grupos que cuadran
+            cursor.execute("DROP TABLE IF EXISTS temp.resumen_esperado")
+            cursor.execute("CREATE TEMPORARY TABLE resumen_esperado AS SELECT * FROM main.resumen_productos WHERE 0")
+            cursor.execute(SQL_RECALCULAR_RESUMEN_PRODUCTOS.replace(
+                "INSERT INTO resumen_productos", "INSERT INTO temp.resumen_esperado"
+            ))
+            cursor.execute("""
+                UPDATE temp.resumen_esperado SET costo = COALESCE((
+                    SELECT r.costo FROM main.resumen_productos r
+                    WHERE r.dia = resumen_esperado.dia AND r.producto_id = resumen_esperado.producto_id
+                      AND r.tipo = resumen_esperado.tipo AND r.cantidad = resumen_esperado.cantidad
+                ), costo)
+            """)
+            cursor.execute("DELETE FROM main.resumen_productos")
+            cursor.execute("""
+                INSERT INTO main.resumen_productos (dia, producto_id, tipo, total, cantidad, costo, operaciones)
+                SELECT dia, producto_id, tipo, total, cantidad, costo, operaciones FROM temp.resumen_esperado
+            """)
+            cursor.execute("DROP TABLE temp.resumen_esperado")
+            conexion.commit()
+
+        return diferencias
+    finally:
+        conexion.close()
+
+def _comparar_resumen(cursor, tabla, claves, sql_esperado):
+    """
+    Compara `tabla` con el recálculo de `sql_esperado` (columnas `claves`, total, cantidad, operaciones).
+    """
+    cursor.execute(sql_esperado)
+    esperado = {tuple(fila[:len(claves)]): fila[len(claves):] for fila in cursor.fetchall()}
+
+    cursor.execute(f"SELECT {', '.join(claves)}, total, cantidad, operaciones FROM main.{tabla}")
+    registrado = {tuple(fila[:len(claves)]): fila[len(claves):] for fila in cursor.fetchall()}
+
+    diferencias = []
+    for clave in sorted(esperado.keys() | registrado.keys()):
+        fila_esperada = esperado.get(clave)
+        fila_registrada = registrado.get(clave)
+        if fila_esperada == fila_registrada:
+            continue
+        diferencias.append({
+            "tabla": tabla,
+            **dict(zip(claves, clave)),
+            "esperado": tuple(fila_esperada) if fila_esperada else None,
+            "registrado": tuple(fila_registrada) if fila_registrada else None,
+        })
+    return diferencias
 
 def registrar_modificacion_db(producto_id, valor_compra, valor_venta):
     """
@@ -214,128 +766,329 @@ def registrar_modificacion_db(producto_id, valor_compra, valor_venta):
 
     Parámetros:
     - producto_id (int): ID del producto que se desea modificar.
-    - valor_compra (float): Nuevo precio de compra para el producto.
-    - valor_venta (float): Nuevo precio de venta para el producto.
+    - valor_compra (int): Nuevo precio de compra para el producto, en centavos.
+    - valor_venta (int): Nuevo precio de venta para el producto, en centavos.
+
+    Al confirmar, publica el evento `PRODUCTOS_ACTUALIZADOS`.
 
     Retorno:
-    - (str): 
-      - "Producto no encontrado" si el ID del producto no existe en la base de datos.
-      - "Modificación registrada." si la operación se realiza con éxito.
+    - (str): "Modificación registrada." si la operación se realiza con éxito.
+
+    Excepciones:
+    - ProductoNoEncontrado: Si no existe un producto activo con ese ID.
     """
     conexion = obtener_conexion()
     cursor = conexion.cursor()
 
-    # Obtener información del producto
-    cursor.execute("SELECT precio_compra, precio_venta FROM productos WHERE id = ?", (producto_id,))
-    producto = cursor.fetchone()
+    try:
+        # Actualizar modificaciones del producto
+        cursor.execute(
+            "UPDATE productos SET precio_compra = ?, precio_venta = ? WHERE id = ? AND activo = 1",
+            (valor_compra, valor_venta, producto_id),
+        )
+        if cursor.rowcount == 0:
+            raise ProductoNoEncontrado(producto_id)
+        with catalogo.escritura():
+            conexion.commit()
+            catalogo.registrar_precios(producto_id, valor_compra, valor_venta)
+    finally:
+        conexion.close()
 
-    if not producto:
-        conexion.close()    
-        return "Producto no encontrado"
+    publicar(PRODUCTOS_ACTUALIZADOS, ids=[producto_id])
+    return "Modificación registrada."
 
-    # Actualizar modificaciones del producto
-    cursor.execute("UPDATE productos SET precio_compra = ? WHERE id = ?", (valor_compra, producto_id))
-    cursor.execute("UPDATE productos SET precio_venta = ? WHERE id = ?", (valor_venta, producto_id))
+def filtrar_transacciones(desde=None, hasta=None, tipo=None, producto_id=None):
+    """
+    Construye la cláusula WHERE para consultar transacciones por rango de fechas, tipo y producto.
 
-    conexion.commit()
-    conexion.close()
-    return "Modificación registrada."
+    Parámetros:
+    - desde (str, opcional): Fecha inicial inclusiva ("AAAA-MM-DD").
+    - hasta (str, opcional): Fecha final inclusiva ("AAAA-MM-DD").
+    - tipo (str, opcional): "compra" o "venta".
+    - producto_id (int, opcional): ID del producto.
 
-def generar_reporte_excel(nombre):
+    Return:
+    - tuple: (cláusula WHERE o cadena vacía, lista de parámetros).
+    """
+    condiciones = []
+    parametros = []
+    if tipo:
+        condiciones.append("tipo = ?")
+        parametros.append(tipo)
+    if desde:
+        condiciones.append("fecha >= ?")
+        parametros.append(desde)
+    if hasta:
+        condiciones.append("fecha < date(?, '+1 day')")
+        parametros.append(hasta)
+    if producto_id is not None:
+        condiciones.append("producto_id = ?")
+        parametros.append(producto_id)
+    where = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+    return where, parametros
+
+# Columnas por las que se puede ordenar la grilla de transacciones
+COLUMNAS_ORDEN_TRANSACCIONES = ("id", "tipo", "producto_id", "cantidad", "fecha", "total")
+
+def consultar_pagina_transacciones(limite=200, despues_de=None, orden="id", descendente=True,
+                                   desde=None, hasta=None, tipo=None, producto_id=None):
+    """
+    Obtiene una página de transacciones con paginación por clave (keyset).
+
+    En lugar de `OFFSET`, cada página continúa desde la clave de la última fila de la
+    anterior (`WHERE (orden, id) > (?, ?)`), por lo que el costo de cada página no
+    depende de cuántas filas haya antes.
+
+    Parámetros:
+    - limite (int, opcional): Cantidad de filas por página.
+    - despues_de (tuple, opcional): Clave (valor de la columna de orden, id) de la última
+      fila de la página anterior, obtenida con `clave_pagina`. None para la primera página.
+    - orden (str, opcional): Columna de `COLUMNAS_ORDEN_TRANSACCIONES` por la que se ordena.
+    - descendente (bool, opcional): Orden descendente (por defecto, las más recientes primero).
+    - desde, hasta, tipo, producto_id (opcional): Filtros, ver `filtrar_transacciones`.
+
+    Return:
+    - list: Filas (id, tipo, producto_id, cantidad, fecha, total), con el total en centavos.
+    """
+    if orden not in COLUMNAS_ORDEN_TRANSACCIONES:
+        raise ValueError(f"No se puede ordenar por {orden!r}")
+
+    where, parametros = filtrar_transacciones(desde, hasta, tipo, producto_id)
+    direccion = "DESC" if descendente else "ASC"
+    comparacion = "<" if descendente else ">"
+
+    if despues_de is not None:
+        if orden == "id":
+            condicion = f"id {comparacion} ?"
+            parametros.append(despues_de[1])
+        else:
+            condicion = f"({orden}, id) {comparacion} (?, ?)"
+            parametros.extend(despues_de)
+        where = f"{where} AND {condicion}" if where else f" WHERE {condicion}"
+
+    orden_sql = "id" if orden == "id" else f"{orden} {direccion}, id"
+    conexion = obtener_conexion()
+    try:
+        cursor = conexion.cursor()
+        cursor.execute(
+            f"SELECT id, tipo, producto_id, cantidad, fecha, total FROM transacciones{where} "
+            f"ORDER BY {orden_sql} {direccion} LIMIT ?",
+            parametros + [limite],
+        )
+        return cursor.fetchall()
+    finally:
+        conexion.close()
+
+def clave_pagina(fila, orden="id"):
+    """
+    Devuelve la clave (valor de la columna de orden, id) de una fila, para pedir la página siguiente.
+    """
+    return fila[COLUMNAS_ORDEN_TRANSACCIONES.index(orden)], fila[0]
+
+def generar_reporte_excel(nombre, desde=None, hasta=None, tipo=None, tamano_bloque=5000, progreso=None,
+                          incluir_archivo=False):
     """
     Exporta las transacciones registradas en la base de datos a un archivo Excel.
+
+    Las filas se leen del cursor en bloques de `tamano_bloque` y se escriben a medida que
+    llegan en un libro de solo escritura (openpyxl `write_only`), por lo que el uso de memoria
+    se mantiene constante sin importar la cantidad de transacciones.
+
+    Parámetros:
+    - nombre (str): Ruta y nombre del archivo Excel a generar.
+    - desde, hasta (str, opcional): Rango de fechas inclusivo ("AAAA-MM-DD").
+    - tipo (str, opcional): Exportar solo "compra" o "venta".
+    - tamano_bloque (int, opcional): Filas leídas por cada `fetchmany`.
+    - progreso (callable, opcional): Recibe la cantidad de filas escritas después de cada bloque.
+      Si lanza una excepción (por ejemplo, al cancelar la tarea), la exportación se interrumpe.
+    - incluir_archivo (bool, opcional): Incluir también las transacciones de los períodos
+      cerrados (ver `cerrar_periodo`) comprendidos en el rango de fechas.
+
+    Excepciones:
+    - Propaga cualquier error de lectura o escritura para que quien la llama lo informe.
     """
-    # Consulta de datos desde la base de datos
+    from openpyxl import Workbook
+
+    where, parametros = filtrar_transacciones(desde, hasta, tipo)
+
     conexion = obtener_conexion()
     cursor = conexion.cursor()
-    cursor.execute("SELECT * FROM transacciones")  # Cambia según tu tabla
-    datos = cursor.fetchall()
-    conexion.close()
+    esquemas = []
+    try:
+        # Dentro del try: si el archivo no se puede adjuntar, la conexión vuelve igual al pool
+        fuente, esquemas = adjuntar_archivo(conexion, desde, hasta) if incluir_archivo else ("transacciones", [])
+        # El total se exporta en pesos
+        cursor.execute(
+            f"SELECT id, tipo, producto_id, cantidad, fecha, total * 1.0 / {CENTAVOS} FROM {fuente}{where} ORDER BY id",
+            parametros,
+        )
 
-    # Crear DataFrame para exportar
-    columnas = ["ID", "Tipo", "Producto ID", "Cantidad", "Fecha", "Total"]
-    df = pd.DataFrame(datos, columns=columnas)
+        libro = Workbook(write_only=True)
+        hoja = libro.create_sheet("Transacciones")
+        hoja.append(["ID", "Tipo", "Producto ID", "Cantidad", "Fecha", "Total"])
 
-    # Exportar a Excel
-    try:
-        df.to_excel(nombre, index=False, engine="openpyxl")
-    except Exception as e:
-        messagebox.showerror("Error", f"No se pudo generar el reporte en Excel: {e}")
+        escritas = 0
+        while True:
+            filas = cursor.fetchmany(tamano_bloque)
+            if not filas:
+                break
+            for fila in filas:
+                hoja.append(fila)
+            escritas += len(filas)
+            if progreso:
+                progreso(escritas)
+
+        # Exportar a Excel
+        libro.save(nombre)
+    finally:
+        cursor.close()
+        separar_archivo(conexion, esquemas)
+        conexion.close()
+
+# Columnas del reporte PDF: (encabezado, ancho en caracteres, alineación)
+COLUMNAS_PDF = [
+    ("ID", 8, ">"),
+    ("Tipo", 7, "<"),
+    ("Producto ID", 11, ">"),
+    ("Cantidad", 8, ">"),
+    ("Fecha", 19, "<"),
+    ("Total", 12, ">"),
+]
 
-def generar_reporte_pdf(nombre):
+def generar_reporte_pdf(nombre, desde=None, hasta=None, tipo=None, progreso=None, incluir_archivo=False):
     """
     Genera un reporte en formato PDF con los datos de transacciones almacenados en la base de datos.
 
+    - Las filas se leen del cursor página por página (`fetchmany`), sin cargar toda la tabla.
+    - El formato de las columnas se calcula una sola vez y cada fila se escribe con una única
+      celda en fuente monoespaciada, en lugar de una celda por columna.
+    - Cada página termina con los subtotales de ventas y compras de esa página, y la última
+      página contiene un resumen calculado con agregaciones SQL.
+
     Parámetros:
     - nombre (str): Ruta y nombre del archivo donde se guardará el reporte PDF.
+    - desde, hasta (str, opcional): Rango de fechas inclusivo ("AAAA-MM-DD").
+    - tipo (str, opcional): Incluir solo "compra" o "venta".
+    - progreso (callable, opcional): Recibe la cantidad de filas escritas después de cada página.
+      Si lanza una excepción (por ejemplo, al cancelar la tarea), el reporte se interrumpe.
+    - incluir_archivo (bool, opcional): Incluir también las transacciones de los períodos
+      cerrados (ver `cerrar_periodo`) comprendidos en el rango de fechas.
 
     Return:
     - No retorna valores. Crea un archivo PDF en la ubicación especificada.
+
+    Excepciones:
+    - Propaga cualquier error de lectura o escritura para que quien la llama lo informe.
     """
-    # Consulta de datos desde la base de datos
+    from fpdf import FPDF
+
+    margen = 10
+    alto_fila = 4.5
+    alto_encabezado = 7
+
+    # Formato de fila calculado una sola vez a partir de los anchos de columna
+    formato = " ".join(f"{{:{alineacion}{ancho}.{ancho}}}" for _, ancho, alineacion in COLUMNAS_PDF)
+    encabezado = formato.format(*(titulo for titulo, _, _ in COLUMNAS_PDF))
+
+    where, parametros = filtrar_transacciones(desde, hasta, tipo)
+
     conexion = obtener_conexion()
     cursor = conexion.cursor()
-    cursor.execute("SELECT * FROM transacciones")  # Cambia según tu tabla
-    datos = cursor.fetchall()
-    conexion.close()
-
-    # Crear el PDF
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-
-    # Título
-    pdf.set_font("Arial", style="B", size=16)
-    pdf.cell(200, 10, txt="Reporte de Transacciones", ln=True, align="C")
-    pdf.ln(10)
-
-    # Encabezados
-    pdf.set_font("Arial", style="B", size=12)
-    encabezados = ["ID", "Tipo", "Producto ID", "Cantidad", "Fecha", "Total"]
-    for encabezado in encabezados:
-        pdf.cell(30, 10, encabezado, border=1, align="C")
-    pdf.ln()
-
-    # Datos
-    pdf.set_font("Arial", size=10)
-    for fila in datos:
-        for columna in fila:
-            pdf.cell(30, 10, str(columna), border=1, align="C")
-        pdf.ln()
-
-    # Guardar el archivo
+    esquemas = []
     try:
-        pdf.output(nombre)
-    except Exception as e:
-        messagebox.showerror("Error", f"No se pudo generar el reporte en PDF: {e}")
+        # Dentro del try: si el archivo no se puede adjuntar, la conexión vuelve igual al pool
+        fuente, esquemas = adjuntar_archivo(conexion, desde, hasta) if incluir_archivo else ("transacciones", [])
 
-def verificar_stock_bajo(umbral=5):
-    """
-    Verifica qué productos tienen un nivel de stock igual o por debajo del umbral especificado
-    y muestra una alerta si existen productos en esta condición.
+        # Crear el PDF con paginación manual
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=False)
+        pdf.set_margins(margen, margen)
+        limite = pdf.h - margen - alto_encabezado
+        pdf.add_page()
 
-    Parámetros:
-    - umbral (int, opcional): Cantidad mínima de stock para que un producto se considere
-      como "bajo stock". Por defecto es 5.
+        # Título
+        pdf.set_font("Arial", style="B", size=16)
+        pdf.cell(0, 10, txt="Reporte de Transacciones", ln=True, align="C")
+        pdf.ln(5)
+
+        cursor.execute(
+            f"SELECT id, tipo, producto_id, cantidad, fecha, total FROM {fuente}{where} ORDER BY id",
+            parametros,
+        )
+
+        # Filas que entran en la primera página (después del título) y en las siguientes
+        filas_por_pagina = int((limite - margen - alto_encabezado) / alto_fila)
+        filas = cursor.fetchmany(int((limite - pdf.get_y() - alto_encabezado) / alto_fila))
+        escritas = 0
+        while True:
+            # Encabezados de la página
+            pdf.set_font("Courier", style="B", size=9)
+            pdf.cell(0, alto_encabezado, encabezado, border="B", ln=True)
 
-    Retunr:
-        None
+            # Datos de la página
+            pdf.set_font("Courier", size=9)
+            ventas = compras = 0
+            for id_transaccion, tipo_fila, producto_id, cantidad, fecha, total in filas:
+                pdf.cell(0, alto_fila, formato.format(
+                    str(id_transaccion), tipo_fila, str(producto_id), str(cantidad), str(fecha), formatear(total)
+                ), ln=True)
+                if tipo_fila == "venta":
+                    ventas += total
+                else:
+                    compras += total
 
-    Consideraciones futuras:
-    - Podrías añadir un registro en la base de datos para alertas generadas.
-    - Implementar configuraciones dinámicas para el umbral según tipo de producto.
+            # Subtotales de la página
+            pdf.set_font("Courier", style="B", size=9)
+            pdf.cell(0, alto_encabezado,
+                     f"Subtotal página {pdf.page_no()}: ventas ${formatear(ventas)} - compras ${formatear(compras)}",
+                     border="T", ln=True, align="R")
+
+            escritas += len(filas)
+            if progreso:
+                progreso(escritas)
+
+            filas = cursor.fetchmany(filas_por_pagina)
+            if not filas:
+                break
+            pdf.add_page()
+
+        # Página de resumen calculada con agregaciones en SQL
+        cursor.execute(f"""
+            SELECT tipo, COUNT(*), SUM(cantidad), SUM(total)
+            FROM {fuente}{where}
+            GROUP BY tipo
+        """, parametros)
+        resumen = {tipo_fila: valores for tipo_fila, *valores in cursor.fetchall()}
+        ventas = resumen.get("venta", (0, 0, 0))
+        compras = resumen.get("compra", (0, 0, 0))
+
+        pdf.add_page()
+        pdf.set_font("Arial", style="B", size=16)
+        pdf.cell(0, 10, txt="Resumen", ln=True, align="C")
+        pdf.ln(5)
+        pdf.set_font("Arial", size=12)
+        for etiqueta, (operaciones, unidades, total) in (("Ventas", ventas), ("Compras", compras)):
+            pdf.cell(0, 8, txt=f"{etiqueta}: {operaciones} transacciones, {unidades or 0} unidades, "
+                               f"${formatear(total or 0)}", ln=True)
+        pdf.set_font("Arial", style="B", size=12)
+        pdf.cell(0, 8, txt=f"Ganancia neta: ${formatear((ventas[2] or 0) - (compras[2] or 0))}", ln=True)
+
+        # Guardar el archivo
+        pdf.output(nombre)
+    finally:
+        cursor.close()
+        separar_archivo(conexion, esquemas)
+        conexion.close()
+
+def verificar_stock_bajo():
     """
-    conexion = obtener_conexion()
-    cursor = conexion.cursor()
-    cursor.execute("SELECT id, nombre, stock FROM productos WHERE stock <= ?", (umbral,))
-    productos_bajo_stock = cursor.fetchall()
-    conexion.close()
+    Revisa el stock de todos los productos activos contra sus umbrales (ver `alertas`).
 
-    if productos_bajo_stock:
-        mensaje = """¡ALERTA!
-        Productos con bajo stock: \n\n"""
-        for producto in productos_bajo_stock:
-            mensaje += f"ID: {producto[0]}, Nombre: {producto[1]}, Stock: {producto[2]}\n"
+    Las ventas y compras ya se revisan una por una al registrarse, así que esta revisión
+    completa solo hace falta al iniciar la aplicación o tras cambios hechos por otro proceso.
+    Abre las alertas que falten (publicando `STOCK_BAJO`) y cierra las que ya no corresponden.
 
-        messagebox.showwarning("Stock Bajo", mensaje)
\ No newline at end of file
+    Retorno:
+    - list: Filas (id, nombre, stock, umbral) de los productos con stock bajo.
+    """
+    return monitor.revisar_todos()
\ No newline at end of file
@@ -0,0 +1,54 @@
+# Los precios y montos se guardan en centavos (enteros): las sumas y productos son exactos,
+# sin la deriva de `REAL` y sin el costo de `Decimal`. Se convierten a pesos solo al mostrarlos.
+CENTAVOS = 100
+
+
+def a_centavos(valor):
+    """
+    Convierte un monto en pesos a centavos, redondeando al centavo más cercano (las mitades,
+    lejos de cero).
+
+    Los textos (entradas de la interfaz, celdas de un CSV) se leen dígito a dígito, sin pasar
+    por `float`: "10.005" son 1001 centavos. Los `float` se leen por su representación más
+    corta (`repr(1.005)` es "1.005"), no por su valor binario (1.00499999...).
+
+    Parámetros:
+        valor (str, int o float): Monto en pesos, por ejemplo "10.50", 10 o 10.5.
+
+    Retorna:
+        int: Monto en centavos.
+
+    Excepciones:
+        ValueError: Si el texto no es un número o el valor no es finito.
+    """
+    if isinstance(valor, int):
+        return valor * CENTAVOS
+    texto = repr(valor) if isinstance(valor, float) else str(valor).strip()
+    signo = -1 if texto.startswith("-") else 1
+    entero, _, decimales = texto.lstrip("+-").partition(".")
+    if len(texto) - len(texto.lstrip("+-")) > 1 or not (entero + decimales).isdecimal():
+        # Notación científica, infinito o texto inválido: se lee como float
+        try:
+            return round(float(texto) * CENTAVOS)
+        except OverflowError:
+            raise ValueError(f"Monto no válido: {valor!r}")
+    decimales = decimales.ljust(3, "0")
+    centavos = int(entero or "0") * CENTAVOS + int(decimales[:2]) + (decimales[2] >= "5")
+    return signo * centavos
+
+
+def a_pesos(centavos):
+    """
+    Retorna:
+        float: El monto en pesos, para JSON, Excel o cálculos de presentación.
+    """
+    return centavos / CENTAVOS
+
+
+def formatear(centavos):
+    """
+    Retorna:
+        str: El monto en pesos con dos decimales, calculado sin `float` ("-12.05").
+    """
+    pesos, resto = divmod(abs(centavos), CENTAVOS)
+    return f"{'-' if centavos < 0 else ''}{pesos}.{resto:02d}"
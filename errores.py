@@ -0,0 +1,57 @@
+class ErrorVentas(Exception):
+    """
+    Error de negocio de la capa de datos.
+
+    El mensaje está pensado para mostrarse tal cual al usuario (en un diálogo de la
+    interfaz o en la salida de la línea de comandos).
+    """
+
+
+class DatosInvalidos(ErrorVentas, ValueError):
+    """
+    Los datos recibidos no son válidos (tipo de transacción, cantidad, precios, etc.).
+    """
+
+
+class ProductoNoEncontrado(ErrorVentas):
+    """
+    No existe un producto activo con el ID o el nombre indicado.
+    """
+
+    def __init__(self, producto_id=None, nombre=None):
+        self.producto_id = producto_id
+        self.nombre = nombre
+        if nombre is not None:
+            mensaje = f"No se encontró ningún producto con nombre '{nombre}'."
+        else:
+            mensaje = f"No se encontró un producto con ID {producto_id}."
+        super().__init__(mensaje)
+
+
+class ProductoAmbiguo(ErrorVentas):
+    """
+    Hay varios productos activos con el mismo nombre; la operación debe hacerse por ID.
+    """
+
+    def __init__(self, nombre, ids):
+        self.nombre = nombre
+        self.ids = list(ids)
+        super().__init__(
+            f"Hay {len(self.ids)} productos con nombre '{nombre}' (IDs: {', '.join(map(str, self.ids))}). "
+            f"Indique el ID del producto."
+        )
+
+
+class StockInsuficiente(ErrorVentas):
+    """
+    La venta dejaría el stock del producto en negativo.
+    """
+
+    def __init__(self, producto_id, disponible, solicitado):
+        self.producto_id = producto_id
+        self.disponible = disponible
+        self.solicitado = solicitado
+        super().__init__(
+            f"Stock insuficiente para realizar la venta (producto {producto_id}: "
+            f"disponible {disponible}, solicitado {solicitado})."
+        )
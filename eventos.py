@@ -0,0 +1,73 @@
+import threading
+
+# Tipos de evento publicados por la capa de datos (cada evento es un dict con la clave `tipo`)
+TRANSACCIONES_REGISTRADAS = "transacciones_registradas"  # productos: IDs cuyo stock cambió, cantidad
+PRODUCTOS_ACTUALIZADOS = "productos_actualizados"  # ids: IDs agregados o modificados (None = varios)
+PRODUCTO_ELIMINADO = "producto_eliminado"  # producto_id
+STOCK_BAJO = "stock_bajo"  # productos: alertas nuevas (id, nombre, stock, umbral)
+
+
+class BusEventos:
+    """
+    Bus de notificaciones entre la capa de datos y quien la use (interfaz, línea de comandos).
+
+    La capa de datos publica lo que ocurrió (por ejemplo, una venta o un stock bajo) sin saber
+    quién escucha ni cómo se muestra. Los suscriptores se llaman en el mismo hilo que publica;
+    la interfaz los envuelve con `EjecutorTareas.en_interfaz` para atenderlos en el hilo de Tk.
+    """
+
+    def __init__(self):
+        self._suscriptores = {}
+        self._candado = threading.Lock()
+
+    def suscribir(self, tipo, funcion):
+        """
+        Registra `funcion(evento)` para los eventos de `tipo`.
+
+        Retorna:
+            callable: Función sin argumentos que cancela la suscripción.
+        """
+        with self._candado:
+            self._suscriptores.setdefault(tipo, []).append(funcion)
+        return lambda: self.cancelar(tipo, funcion)
+
+    def cancelar(self, tipo, funcion):
+        """
+        Quita una suscripción. No tiene efecto si ya no estaba registrada.
+        """
+        with self._candado:
+            funciones = self._suscriptores.get(tipo, [])
+            if funcion in funciones:
+                funciones.remove(funcion)
+
+    def publicar(self, tipo, **datos):
+        """
+        Notifica un evento a todos sus suscriptores. Un error en un suscriptor no afecta a los demás
+        ni a la operación que publicó el evento.
+        """
+        with self._candado:
+            funciones = list(self._suscriptores.get(tipo, ()))
+        evento = dict(datos, tipo=tipo)
+        for funcion in funciones:
+            try:
+                funcion(evento)
+            except Exception as e:
+                print(f"Error al procesar el evento {tipo}: {e}")
+
+
+# Bus compartido por todos los módulos de la aplicación
+bus = BusEventos()
+
+
+def suscribir(tipo, funcion):
+    """
+    Suscribe `funcion(evento)` a los eventos de `tipo` en el bus compartido (ver `BusEventos.suscribir`).
+    """
+    return bus.suscribir(tipo, funcion)
+
+
+def publicar(tipo, **datos):
+    """
+    Publica un evento en el bus compartido (ver `BusEventos.publicar`).
+    """
+    bus.publicar(tipo, **datos)
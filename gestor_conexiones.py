@@ -0,0 +1,271 @@
+import sqlite3
+import threading
+import weakref
+
+# Ruta por defecto de la base de datos
+RUTA_BD = "gestion_bebidas.db"
+
+# Perfiles de rendimiento: PRAGMAs que se aplican una sola vez al abrir cada conexión.
+# - "durable": cada commit se sincroniza por completo con el disco (sin pérdida ante cortes de luz).
+# - "fast": en WAL, `synchronous=NORMAL` solo sincroniza en los checkpoints; un corte de luz puede
+#   perder las últimas transacciones confirmadas, pero nunca corrompe la base de datos.
+PERFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,  # Negativo = KiB (8 MB)
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,  # Milisegundos
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # 64 MB
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+PERFIL_POR_DEFECTO = "durable"
+
+# PRAGMAs que se aplican a cada conexión nueva (nombre -> valor)
+PRAGMAS_POR_DEFECTO = PERFILES[PERFIL_POR_DEFECTO]
+
+
+class ConexionPrestada:
+    """
+    Envoltorio de una conexión SQLite entregada por el pool.
+
+    Se comporta como un `sqlite3.Connection` (delega cursor, execute, commit, etc.),
+    pero al llamar a `close()` la conexión no se cierra: se devuelve al pool para
+    ser reutilizada. Usado como gestor de contexto (`with`), confirma o revierte
+    la transacción igual que sqlite3 y luego devuelve la conexión al pool.
+    """
+
+    def __init__(self, gestor, conexion):
+        self._gestor = gestor
+        self._conexion = conexion
+
+    def __getattr__(self, nombre):
+        if self._conexion is None:
+            raise sqlite3.ProgrammingError("La conexión ya fue devuelta al pool.")
+        return getattr(self._conexion, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_error, error, traza):
+        if self._conexion is not None:
+            if tipo_error is None:
+                self._conexion.commit()
+            else:
+                self._conexion.rollback()
+        self.close()
+        return False
+
+    def close(self):
+        """
+        Devuelve la conexión al pool. Llamadas repetidas no tienen efecto.
+        """
+        if self._conexion is not None:
+            conexion, self._conexion = self._conexion, None
+            self._gestor._devolver(conexion)
+
+
+class _PilaLibres:
+    """
+    Conexiones libres de un hilo. Vive solo en el `threading.local` del pool: cuando el hilo
+    termina se libera, y su finalizador cierra las conexiones que quedaron en la pila.
+    """
+
+    __slots__ = ("conexiones", "__weakref__")
+
+    def __init__(self):
+        self.conexiones = []
+
+
+class GestorConexiones:
+    """
+    Pool de conexiones SQLite reutilizables, una pila de conexiones libres por hilo.
+
+    - Cada hilo reutiliza sus propias conexiones, por lo que nunca comparte una
+      conexión con otro hilo mientras está en uso.
+    - Los PRAGMAs configurados se aplican una sola vez, al abrir la conexión.
+    - `cerrar_todas` solo cierra las conexiones libres: las prestadas quedan marcadas para
+      retirarse y se cierran al devolverlas, sin cortar el trabajo que otro hilo tenga en curso.
+    - Las conexiones libres de un hilo que termina se cierran solas (hilos de corta vida
+      como los del servidor o los de las tareas no acumulan conexiones abiertas).
+    - Los contadores `abiertas` y `reutilizadas` permiten medir la eficacia del pool.
+
+    Parámetros:
+        ruta (str): Ruta del archivo de base de datos.
+        pragmas (dict): PRAGMAs a aplicar a cada conexión nueva (nombre -> valor).
+        tamano_pool (int): Máximo de conexiones libres que conserva cada hilo.
+    """
+
+    def __init__(self, ruta=RUTA_BD, pragmas=None, tamano_pool=2):
+        self.ruta = ruta
+        self.pragmas = dict(PRAGMAS_POR_DEFECTO if pragmas is None else pragmas)
+        self.tamano_pool = tamano_pool
+        self._local = threading.local()
+        # Reentrante: al reemplazar `_local` en `cerrar_todas` corren los finalizadores de las pilas
+        self._candado = threading.RLock()
+        self._todas = []
+        self._prestadas = set()
+        self._retiradas = set()
+        self._generacion = 0
+        self.abiertas = 0
+        self.reutilizadas = 0
+
+    def _libres(self):
+        pila = getattr(self._local, "pila", None)
+        if pila is None:
+            pila = self._local.pila = _PilaLibres()
+            weakref.finalize(pila, self._cerrar_libres, pila.conexiones)
+        return pila.conexiones
+
+    def _cerrar_libres(self, conexiones):
+        # Finalizador de la pila de un hilo terminado
+        while conexiones:
+            self._cerrar(conexiones.pop())
+
+    def obtener(self):
+        """
+        Entrega una conexión del pool del hilo actual, abriendo una nueva si no hay libres.
+
+        Retorna:
+            ConexionPrestada: Conexión lista para usar; `close()` la devuelve al pool.
+        """
+        # Bajo el candado, para que `cerrar_todas` no cierre una conexión recién sacada de la pila
+        with self._candado:
+            libres = self._libres()
+            conexion = libres.pop() if libres else None
+            if conexion is not None:
+                self._prestadas.add(conexion)
+                self.reutilizadas += 1
+        if conexion is None:
+            conexion = self._abrir()
+        return ConexionPrestada(self, conexion)
+
+    def _abrir(self):
+        generacion = self._generacion
+        conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        for nombre, valor in self.pragmas.items():
+            conexion.execute(f"PRAGMA {nombre} = {valor}")
+        with self._candado:
+            self._todas.append(conexion)
+            self._prestadas.add(conexion)
+            if generacion != self._generacion:
+                # Se abrió mientras cambiaba la configuración: puede tener la anterior
+                self._retiradas.add(conexion)
+            self.abiertas += 1
+        return conexion
+
+    def _devolver(self, conexion):
+        # Descartar cualquier transacción que haya quedado abierta sin confirmar
+        if conexion.in_transaction:
+            conexion.rollback()
+
+        with self._candado:
+            self._prestadas.discard(conexion)
+            libres = self._libres()
+            if conexion not in self._retiradas and len(libres) < self.tamano_pool:
+                libres.append(conexion)
+                return
+        self._cerrar(conexion)
+
+    def _cerrar(self, conexion):
+        with self._candado:
+            self._retiradas.discard(conexion)
+            if conexion in self._todas:
+                self._todas.remove(conexion)
+        conexion.close()
+
+    def cerrar_todas(self):
+        """
+        Cierra las conexiones libres del pool (por ejemplo, al salir de la aplicación o al
+        cambiar de configuración).
+
+        Las conexiones prestadas en ese momento a otro hilo no se cierran: quedan retiradas y
+        se cierran cuando su dueño las devuelve, así su transacción en curso termina con normalidad.
+        """
+        with self._candado:
+            libres = [conexion for conexion in self._todas if conexion not in self._prestadas]
+            self._retiradas.update(self._prestadas)
+            self._generacion += 1
+            self._todas = [conexion for conexion in self._todas if conexion in self._prestadas]
+            # Los hilos descartarán sus pilas de conexiones libres ya cerradas
+            self._local = threading.local()
+        for conexion in libres:
+            conexion.close()
+
+    def estadisticas(self):
+        """
+        Retorna:
+            dict: Conexiones abiertas, reutilizadas y actualmente vivas en el pool.
+        """
+        with self._candado:
+            return {
+                "abiertas": self.abiertas,
+                "reutilizadas": self.reutilizadas,
+                "vivas": len(self._todas),
+            }
+
+
+# Pool compartido por todos los módulos de la aplicación
+gestor = GestorConexiones()
+
+
+def obtener_conexion():
+    """
+    Devuelve una conexión del pool compartido.
+
+    Retorna:
+        ConexionPrestada: Conexión reutilizable; llamar a `close()` la devuelve al pool.
+    """
+    return gestor.obtener()
+
+
+def configurar(ruta=None, pragmas=None, tamano_pool=None):
+    """
+    Reconfigura el pool compartido (ruta de la base de datos, PRAGMAs o tamaño).
+    Cierra las conexiones libres y retira las prestadas (se cierran al devolverlas), para que
+    la nueva configuración se aplique a todas sin cortar transacciones en curso de otros hilos.
+
+    Parámetros:
+        ruta (str, opcional): Nueva ruta del archivo de base de datos.
+        pragmas (dict, opcional): PRAGMAs a aplicar al abrir cada conexión.
+        tamano_pool (int, opcional): Máximo de conexiones libres por hilo.
+    """
+    if ruta is not None:
+        gestor.ruta = ruta
+    if pragmas is not None:
+        gestor.pragmas = dict(pragmas)
+    if tamano_pool is not None:
+        gestor.tamano_pool = tamano_pool
+    gestor.cerrar_todas()
+
+
+def aplicar_perfil(nombre):
+    """
+    Selecciona un perfil de rendimiento ("durable" o "fast") para todas las conexiones del pool.
+
+    Parámetros:
+        nombre (str): Nombre del perfil definido en `PERFILES`.
+
+    Excepciones:
+        ValueError: Si el perfil no existe.
+    """
+    if nombre not in PERFILES:
+        raise ValueError(f"Perfil desconocido: {nombre!r}. Opciones: {', '.join(PERFILES)}")
+    configurar(pragmas=PERFILES[nombre])
+
+
+def estadisticas_conexiones():
+    """
+    Retorna:
+        dict: Contadores del pool compartido (`abiertas`, `reutilizadas`, `vivas`).
+    """
+    return gestor.estadisticas()
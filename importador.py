@@ -0,0 +1,202 @@
+import csv
+import os
+import sqlite3
+from itertools import islice
+from catalogo import catalogo
+from dinero import a_centavos
+from eventos import PRODUCTOS_ACTUALIZADOS, publicar
+from gestor_conexiones import obtener_conexion
+
+# Columnas esperadas en el archivo (la primera fila debe ser el encabezado)
+COLUMNAS = ("nombre", "tipo", "precio_compra", "precio_venta", "stock")
+
+# Cantidad máxima de errores de validación que se conservan en el resultado
+MAX_ERRORES = 100
+
+def leer_csv(ruta):
+    """
+    Lee un archivo CSV fila por fila, sin cargarlo completo en memoria.
+
+    Parámetros:
+    - ruta (str): Ruta del archivo CSV. La primera fila debe contener los encabezados.
+
+    Return:
+    - generator: Diccionarios (encabezado en minúsculas -> valor) por cada fila.
+    """
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        lector = csv.reader(archivo)
+        encabezados = [str(columna).strip().lower() for columna in next(lector, [])]
+        for fila in lector:
+            yield dict(zip(encabezados, fila))
+
+def leer_xlsx(ruta):
+    """
+    Lee la primera hoja de un archivo Excel en modo de solo lectura (streaming).
+
+    Parámetros:
+    - ruta (str): Ruta del archivo XLSX. La primera fila debe contener los encabezados.
+
+    Return:
+    - generator: Diccionarios (encabezado en minúsculas -> valor) por cada fila.
+    """
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezados = [str(columna or "").strip().lower() for columna in next(filas, ())]
+        for fila in filas:
+            yield dict(zip(encabezados, fila))
+    finally:
+        libro.close()
+
+def validar_fila(fila):
+    """
+    Valida y convierte una fila del catálogo.
+
+    Parámetros:
+    - fila (dict): Fila leída del archivo, con las claves de `COLUMNAS`.
+
+    Return:
+    - tuple: (nombre, tipo, precio_compra, precio_venta, stock) con los tipos correctos
+      (los precios, leídos en pesos, se devuelven en centavos).
+
+    Excepciones:
+    - ValueError: Si falta algún dato o los valores numéricos no son válidos.
+    """
+    faltantes = [columna for columna in COLUMNAS if fila.get(columna) in (None, "")]
+    if faltantes:
+        raise ValueError(f"Faltan valores: {', '.join(faltantes)}")
+
+    nombre = str(fila["nombre"]).strip()
+    tipo = str(fila["tipo"]).strip()
+    try:
+        precio_compra = a_centavos(fila["precio_compra"])
+        precio_venta = a_centavos(fila["precio_venta"])
+        stock = float(fila["stock"])
+    except (TypeError, ValueError):
+        raise ValueError("Precios y stock deben ser numéricos")
+    # Excel guarda los enteros como 3.0; un stock como 3.7 no se trunca, se rechaza
+    if not stock.is_integer():
+        raise ValueError("El stock debe ser un número entero")
+    stock = int(stock)
+
+    if not nombre or not tipo:
+        raise ValueError("Nombre y tipo no pueden estar vacíos")
+    if precio_compra <= 0 or precio_venta <= 0 or stock < 0:
+        raise ValueError("Los precios deben ser positivos y el stock no puede ser negativo")
+
+    return nombre, tipo, precio_compra, precio_venta, stock
+
+def _guardar_lote(cursor, lote):
+    """
+    Inserta o actualiza (por nombre + tipo) un lote de productos ya validados.
+    Un producto dado de baja que vuelve a aparecer en el catálogo se reactiva con su mismo ID;
+    si con el mismo nombre y tipo hay uno activo, se actualiza ese y el dado de baja no se toca.
+
+    Return:
+    - tuple: (insertados, actualizados)
+    """
+    # Si el mismo producto aparece varias veces en el lote, prevalece la última fila
+    por_clave = {(fila[0], fila[1]): fila for fila in lote}
+
+    nombres = list({nombre for nombre, _ in por_clave})
+    marcadores = ", ".join("?" * len(nombres))
+    # Los activos van al final, así prevalecen sobre los dados de baja con la misma clave
+    cursor.execute(
+        f"SELECT id, nombre, tipo FROM productos WHERE nombre IN ({marcadores}) ORDER BY activo, id", nombres
+    )
+    existentes = {(nombre, tipo): id_producto for id_producto, nombre, tipo in cursor.fetchall()}
+
+    actualizaciones = []
+    inserciones = []
+    for clave, (nombre, tipo, precio_compra, precio_venta, stock) in por_clave.items():
+        if clave in existentes:
+            actualizaciones.append((precio_compra, precio_venta, stock, existentes[clave]))
+        else:
+            inserciones.append((nombre, tipo, precio_compra, precio_venta, stock))
+
+    cursor.executemany(
+        "UPDATE productos SET precio_compra = ?, precio_venta = ?, stock = ?, activo = 1 WHERE id = ?", actualizaciones
+    )
+    cursor.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, ?, ?, ?, ?)",
+        inserciones,
+    )
+    return len(inserciones), len(actualizaciones)
+
+def importar_productos(ruta, tamano_lote=1000, progreso=None):
+    """
+    Importa un catálogo de productos desde un archivo CSV o XLSX.
+
+    El archivo se procesa en lotes de `tamano_lote` filas: cada lote se valida, se
+    inserta o actualiza (por nombre + tipo) y se confirma en una sola transacción,
+    por lo que el uso de memoria no depende del tamaño del archivo.
+
+    Parámetros:
+    - ruta (str): Ruta del archivo (.csv o .xlsx) con las columnas de `COLUMNAS`.
+    - tamano_lote (int, opcional): Filas por transacción. Por defecto 1000.
+    - progreso (callable, opcional): Función llamada tras cada lote con el resumen parcial.
+
+    Si se guardó algún producto, publica el evento `PRODUCTOS_ACTUALIZADOS` al terminar.
+
+    Return:
+    - dict: Resumen con `procesadas`, `insertados`, `actualizados`, `rechazadas` y
+      `errores` (lista de hasta `MAX_ERRORES` pares (número de línea, mensaje)).
+
+    Excepciones:
+    - ValueError: Si la extensión del archivo no es .csv ni .xlsx.
+    - sqlite3.Error: Si falla la escritura de un lote (se revierte; los lotes anteriores
+      quedan confirmados).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        filas = leer_csv(ruta)
+    elif extension == ".xlsx":
+        filas = leer_xlsx(ruta)
+    else:
+        raise ValueError(f"Formato no soportado: {extension or ruta}. Use .csv o .xlsx")
+
+    resumen = {"procesadas": 0, "insertados": 0, "actualizados": 0, "rechazadas": 0, "errores": []}
+    numeradas = enumerate(filas, start=2)  # La línea 1 es el encabezado
+
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        while True:
+            bloque = list(islice(numeradas, tamano_lote))
+            if not bloque:
+                break
+
+            lote = []
+            for linea, fila in bloque:
+                try:
+                    lote.append(validar_fila(fila))
+                except ValueError as e:
+                    resumen["rechazadas"] += 1
+                    if len(resumen["errores"]) < MAX_ERRORES:
+                        resumen["errores"].append((linea, str(e)))
+
+            if lote:
+                insertados, actualizados = _guardar_lote(cursor, lote)
+                conexion.commit()
+                resumen["insertados"] += insertados
+                resumen["actualizados"] += actualizados
+
+            resumen["procesadas"] += len(bloque)
+            if progreso:
+                progreso(resumen)
+
+    except sqlite3.Error:
+        conexion.rollback()
+        raise
+
+    finally:
+        conexion.close()
+        # También si falló un lote: los anteriores ya están confirmados
+        if resumen["insertados"] or resumen["actualizados"]:
+            catalogo.invalidar()
+            publicar(PRODUCTOS_ACTUALIZADOS, ids=None)
+
+    return resumen
@@ -7,8 +7,19 @@ from tkinter import ttk, messagebox, filedialog
 from productos import *
 from transacciones import calcular_totales
 from db_manager import *
+from tareas import TareaCancelada, ejecutor
+from errores import ErrorVentas
+from alertas import monitor
+from dinero import a_centavos, a_pesos, formatear
+import eventos
+import usuarios
+import time
 
 tema_actual = "flatly" # Variable global, por defecto, tema claro para la ventanas
+ultimo_id_producto = 0 # Último ID de producto mostrado en la tabla de productos
+grilla_transacciones = None # Grilla paginada de la ventana de tablas
+tiempos_refresco = {} # Costo acumulado de los refrescos de tablas: nombre -> (veces, ms totales, ms último, filas último)
+AGRUPAR_ALERTAS_MS = 1500 # Espera antes de mostrar el resumen de alertas, para juntar las de varias ventas
 
 def cambiar_tema(ventana):
     """
@@ -138,6 +149,7 @@ def crear_widgets_principales(ventana, rol):
         ("Agregar Producto", ventana_agregar_producto),
         ("Modificar Producto", ventana_modificar_producto),
         ("Registrar Transacción", lambda: ventana_registrar_transaccion(rol_actual)),
+        ("Registrar Ticket", ventana_registrar_ticket),
         ("Eliminar Producto", ventana_eliminar_producto),
         ("Agregar Usuario", registrar_usuario),
         ("Ver Usuarios", ver_usuarios),
@@ -186,7 +198,11 @@ def interfaz_principal(rol_actual):
     ventana = ttkb.Window(themename=tema_actual)
     ventana.withdraw()  # Ocultar la ventana hasta que se complete el inicio de sesión
     ventana.title("Gestión de Ventas")
-    ventana.geometry("400x650")
+    ventana.geometry("400x710")
+
+    # Recibir en esta ventana los resultados de las tareas en segundo plano
+    # (desde el inicio de sesión, que también verifica las credenciales en el hilo de fondo)
+    ejecutor.iniciar(ventana)
 
     # Iniciar sesión si el rol actual no ha sido definido
     if not rol_actual:
@@ -198,14 +214,78 @@ def interfaz_principal(rol_actual):
                 "Ingrese un usuario correcto para utilizar la App."
             )
             ventana.destroy()  # Cerrar la aplicación
+            ejecutor.detener()
             return
 
     # Mostrar la ventana principal y configurar los widgets
     ventana.deiconify()  # Hacer visible la ventana
     crear_widgets_principales(ventana, rol_actual)
 
+    monitor.suscribir()
+    suscribir_eventos(ventana)
+
     # Ejecutar el bucle principal de la interfaz
     ventana.mainloop()
+    ejecutor.detener()
+
+def suscribir_eventos(ventana):
+    """
+    Suscribe la interfaz a las notificaciones de la capa de datos.
+
+    Los eventos se atienden en el hilo de Tk (vía `ejecutor.en_interfaz`), sin importar
+    desde qué hilo se publicaron: las tablas abiertas se actualizan solas tras cada venta,
+    alta, modificación o baja.
+
+    Las alertas de stock bajo no se muestran una por venta: la primera programa un resumen
+    (tras `AGRUPAR_ALERTAS_MS`) con todas las alertas aún no notificadas (ver `alertas`).
+    Al iniciar se hace una revisión completa del stock, que muestra las pendientes.
+    """
+    resumen_programado = False
+
+    def tablas_abiertas():
+        return globals().get("ventana_tablas") is not None and ventana_tablas.winfo_exists()
+
+    def mostrar_resumen(pendientes):
+        if not pendientes:
+            return
+        mensaje = """¡ALERTA!
+        Productos con bajo stock: \n\n"""
+        for alerta in pendientes:
+            mensaje += (f"ID: {alerta['producto_id']}, Nombre: {alerta['nombre']}, "
+                        f"Stock: {alerta['stock']} (umbral {alerta['umbral']})\n")
+        messagebox.showwarning("Stock Bajo", mensaje)
+
+    def mostrar_pendientes():
+        nonlocal resumen_programado
+        resumen_programado = False
+        ejecutor.enviar(monitor.tomar_pendientes, al_terminar=mostrar_resumen)
+
+    def al_stock_bajo(evento):
+        nonlocal resumen_programado
+        if not resumen_programado:
+            resumen_programado = True
+            ventana.after(AGRUPAR_ALERTAS_MS, mostrar_pendientes)
+
+    def al_registrar_transacciones(evento):
+        if tablas_abiertas():
+            actualizar_tabla_productos(ids=evento["productos"])
+            actualizar_tabla_transacciones()
+
+    def al_actualizar_productos(evento):
+        if tablas_abiertas():
+            actualizar_tabla_productos(ids=evento["ids"])
+
+    def al_eliminar_producto(evento):
+        if tablas_abiertas():
+            actualizar_tabla_productos()
+
+    eventos.suscribir(eventos.STOCK_BAJO, ejecutor.en_interfaz(al_stock_bajo))
+    eventos.suscribir(eventos.TRANSACCIONES_REGISTRADAS, ejecutor.en_interfaz(al_registrar_transacciones))
+    eventos.suscribir(eventos.PRODUCTOS_ACTUALIZADOS, ejecutor.en_interfaz(al_actualizar_productos))
+    eventos.suscribir(eventos.PRODUCTO_ELIMINADO, ejecutor.en_interfaz(al_eliminar_producto))
+
+    # Revisión completa al iniciar (las ventas posteriores se revisan una por una)
+    ejecutor.enviar(verificar_stock_bajo, al_terminar=lambda _: mostrar_pendientes())
 
 def iniciar_sesion():
     """
@@ -248,24 +328,30 @@ def iniciar_sesion():
         usuario = entrada_usuario.get()
         contrasena = entrada_contrasena.get()
 
-        # Verificar credenciales en la base de datos
-        conexion = obtener_conexion()
-        cursor = conexion.cursor()
-        cursor.execute("SELECT rol FROM usuarios WHERE nombre=? AND contrasena=?", (usuario, contrasena))
-        resultado_query = cursor.fetchone()
-        conexion.close()
+        def al_terminar(rol):
+            if rol:
+                resultado["exitoso"] = True
+                global rol_actual
+                rol_actual = rol
+                messagebox.showinfo("Éxito", f"Bienvenido {usuario} - Rol: {rol_actual}")
+                ventana_login.destroy()  # Cerrar la ventana de inicio de sesión
+            else:
+                messagebox.showerror("Error", "Usuario o contraseña incorrectos")
+                boton_ingresar.config(state="normal")
 
-        if resultado_query:
-            resultado["exitoso"] = True
-            global rol_actual
-            rol_actual = resultado_query[0]
-            messagebox.showinfo("Éxito", f"Bienvenido {usuario} - Rol: {rol_actual}")
-            ventana_login.destroy()  # Cerrar la ventana de inicio de sesión
-        else:
-            messagebox.showerror("Error", "Usuario o contraseña incorrectos")
+        def al_fallar(e):
+            messagebox.showerror("Error", f"No se pudieron verificar las credenciales: {e}")
+            boton_ingresar.config(state="normal")
+
+        # Verificar credenciales contra el hash guardado (o el ingreso reciente en caché),
+        # en segundo plano: derivar el hash es deliberadamente lento
+        boton_ingresar.config(state="disabled")
+        ejecutor.enviar(usuarios.verificar_credenciales, usuario, contrasena,
+                        al_terminar=al_terminar, al_fallar=al_fallar)
 
     # Botón para iniciar sesión
-    ttkb.Button(ventana_login, text="Iniciar Sesión", command=verificar_credenciales).pack(pady=10)
+    boton_ingresar = ttkb.Button(ventana_login, text="Iniciar Sesión", command=verificar_credenciales)
+    boton_ingresar.pack(pady=10)
 
     # Esperar a que la ventana se cierre antes de continuar
     ventana_login.wait_window()
@@ -313,31 +399,29 @@ def registrar_usuario():
         contrasena = entrada_contrasena.get()
         rol = entrada_rol.get()
 
-        # Validar el rol
-        if rol not in ["admin", "usuario"]:
-            messagebox.showerror("Error", "El rol debe ser 'admin' o 'usuario'")
-            return
-
-        # Conectar a la base de datos y registrar al usuario
-        conexion = obtener_conexion()
-        cursor = conexion.cursor()
-        try:
-            cursor.execute("INSERT INTO usuarios (nombre, contrasena, rol) VALUES (?, ?, ?)",
-                           (nombre, contrasena, rol))
-            conexion.commit()
+        def al_terminar(_):
             messagebox.showinfo("Éxito", "Usuario registrado correctamente")
             ventana_registro.destroy()  # Cerrar la ventana tras el registro exitoso
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo registrar el usuario: {e}")
-        finally:
-            conexion.close()
+
+        def al_fallar(e):
+            if isinstance(e, ErrorVentas):
+                messagebox.showerror("Error", str(e))
+            else:
+                messagebox.showerror("Error", f"No se pudo registrar el usuario: {e}")
+            boton_registrar.config(state="normal")
+
+        # Registrar al usuario en segundo plano (valida el rol y guarda solo el hash de la contraseña)
+        boton_registrar.config(state="disabled")
+        ejecutor.enviar(usuarios.crear_usuario, nombre, contrasena, rol,
+                        al_terminar=al_terminar, al_fallar=al_fallar)
 
     # Botón para confirmar el registro
-    tk.Button(ventana_registro, text="Registrar", command=agregar_usuario).pack(pady=10)
+    boton_registrar = tk.Button(ventana_registro, text="Registrar", command=agregar_usuario)
+    boton_registrar.pack(pady=10)
 
 def ver_usuarios():
     """
-    Muestra una ventana con la lista de usuarios y contraseñas registradas en la base de datos,
+    Muestra una ventana con la lista de usuarios y sus roles registrados en la base de datos,
     y permite eliminar usuarios. Solo es accesible si el usuario actual tiene permisos de administrador.
 
     Esta función utiliza un Treeview para presentar los datos y proporciona un botón para eliminar
@@ -348,61 +432,56 @@ def ver_usuarios():
         """
         Elimina al usuario seleccionado de la base de datos y actualiza la lista de usuarios en la ventana.
         """
-        try:
-            # Obtener la selección actual
-            seleccion = tree.selection()
-            if not seleccion:
-                messagebox.showwarning("Advertencia", "Debe seleccionar un usuario para eliminar.")
-                return
-
-            # Confirmar eliminación
-            if not messagebox.askyesno("Confirmar", "¿Está seguro de que desea eliminar el usuario seleccionado?"):
-                return
-
-            # Obtener el nombre del usuario seleccionado
-            usuario_seleccionado = tree.item(seleccion, "values")[0]
+        # Obtener la selección actual
+        seleccion = tree.selection()
+        if not seleccion:
+            messagebox.showwarning("Advertencia", "Debe seleccionar un usuario para eliminar.")
+            return
 
-            # Eliminar el usuario de la base de datos
-            conexion = obtener_conexion()
-            cursor = conexion.cursor()
-            cursor.execute("DELETE FROM usuarios WHERE nombre=?", (usuario_seleccionado,))
-            conexion.commit()
-            conexion.close()
+        # Confirmar eliminación
+        if not messagebox.askyesno("Confirmar", "¿Está seguro de que desea eliminar el usuario seleccionado?"):
+            return
 
-            # Eliminar el usuario del Treeview
-            tree.delete(seleccion)
+        # Obtener el nombre del usuario seleccionado
+        usuario_seleccionado = tree.item(seleccion, "values")[0]
 
+        def al_terminar(_):
+            # Eliminar el usuario del Treeview, si la ventana sigue abierta
+            if tree.winfo_exists() and tree.exists(seleccion[0]):
+                tree.delete(seleccion)
             messagebox.showinfo("Éxito", f"Usuario '{usuario_seleccionado}' eliminado correctamente.")
-        except Exception as e:
+
+        def al_fallar(e):
             messagebox.showerror("Error", f"No se pudo eliminar el usuario: {e}")
 
+        # Eliminar el usuario de la base de datos (y su ingreso en caché), en segundo plano
+        ejecutor.enviar(usuarios.eliminar_usuario, usuario_seleccionado,
+                        al_terminar=al_terminar, al_fallar=al_fallar)
+
     # Crear la ventana para mostrar los usuarios registrados
     ventana_usuarios = ttkb.Toplevel()
     ventana_usuarios.title("Usuarios Registrados")
     ventana_usuarios.geometry("500x400")
 
     # Crear un Treeview para mostrar los usuarios
-    tree = ttkb.Treeview(ventana_usuarios, columns=("Usuario", "Contraseña"), show="headings")
+    tree = ttkb.Treeview(ventana_usuarios, columns=("Usuario", "Rol"), show="headings")
     tree.heading("Usuario", text="Usuario")
-    tree.heading("Contraseña", text="Contraseña")
+    tree.heading("Rol", text="Rol")
     tree.pack(fill=tk.BOTH, expand=True, pady=10)
 
     # Botón para eliminar el usuario seleccionado
     ttkb.Button(ventana_usuarios, text="Eliminar Usuario", command=eliminar_usuario).pack(pady=10)
 
-    # Conectar a la base de datos y cargar los datos de los usuarios
-    try:
-        conexion = obtener_conexion()
-        cursor = conexion.cursor()
-        cursor.execute("SELECT nombre, contrasena FROM usuarios")
-        usuarios = cursor.fetchall()
-        conexion.close()
+    def cargar_usuarios(lista):
+        if tree.winfo_exists():
+            for usuario, rol in lista:
+                tree.insert("", tk.END, values=(usuario, rol))
 
-        # Insertar los datos en el Treeview
-        for usuario, contrasena in usuarios:
-            tree.insert("", tk.END, values=(usuario, contrasena))
-    except Exception as e:
-        messagebox.showerror("Error", f"No se pudieron cargar los usuarios: {e}")
+    # Cargar los usuarios en el Treeview en segundo plano (las contraseñas solo se guardan como hash)
+    ejecutor.enviar(
+        usuarios.listar_usuarios, al_terminar=cargar_usuarios,
+        al_fallar=lambda e: messagebox.showerror("Error", f"No se pudieron cargar los usuarios: {e}"),
+    )
 
 def ventana_agregar_producto():
     """
@@ -445,8 +524,8 @@ def ventana_agregar_producto():
         nombre = entry_nombre.get().strip()
         tipo = entry_tipo.get().strip()
         try:
-            precio_compra = float(entry_precio_compra.get())
-            precio_venta = float(entry_precio_venta.get())
+            precio_compra = a_centavos(entry_precio_compra.get())
+            precio_venta = a_centavos(entry_precio_venta.get())
             cantidad = int(entry_stock.get())
         except ValueError:
             messagebox.showerror("Error", "Por favor, ingrese valores válidos en todos los campos.")
@@ -456,30 +535,25 @@ def ventana_agregar_producto():
             messagebox.showerror("Error", "Asegúrese de completar todos los campos con valores positivos.")
             return
 
-        # Llamar a la función para guardar en la base de datos
-        try:
-            agregar_producto_db(nombre, tipo, precio_compra, precio_venta, cantidad)
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo agregar el producto: {e}")
-            return
-
-        # Limpiar los campos
-        entry_nombre.delete(0, tk.END)
-        entry_tipo.delete(0, tk.END)
-        entry_precio_compra.delete(0, tk.END)
-        entry_precio_venta.delete(0, tk.END)
-        entry_stock.delete(0, tk.END)
+        def al_terminar(_):
+            # Mostrar mensaje de éxito (la tabla abierta se actualiza con el evento del alta)
+            messagebox.showinfo("Éxito", f"Producto '{nombre}' agregado exitosamente.")
+            ventana_agregar.destroy()
 
-        # Actualizar la tabla de productos si está abierta
-        if ventana_tablas is not None and ventana_tablas.winfo_exists():
-            actualizar_tabla_productos()
+        def al_fallar(e):
+            messagebox.showerror("Error", f"No se pudo agregar el producto: {e}")
+            boton_agregar.config(state="normal")
 
-        # Mostrar mensaje de éxito
-        messagebox.showinfo("Éxito", f"Producto '{nombre}' agregado exitosamente.")
-        ventana_agregar.destroy()
+        # Guardar el producto en segundo plano, sin bloquear la interfaz
+        boton_agregar.config(state="disabled")
+        ejecutor.enviar(
+            agregar_producto_db, nombre, tipo, precio_compra, precio_venta, cantidad,
+            al_terminar=al_terminar, al_fallar=al_fallar,
+        )
 
     # Botón para confirmar la acción
-    ttkb.Button(ventana_agregar, text="Agregar Producto", command=agregar_producto).pack(pady=10)
+    boton_agregar = ttkb.Button(ventana_agregar, text="Agregar Producto", command=agregar_producto)
+    boton_agregar.pack(pady=10)
 
 def ventana_registrar_transaccion(rol):
     """
@@ -528,38 +602,122 @@ def ventana_registrar_transaccion(rol):
             messagebox.showerror("Error", "La cantidad debe ser mayor a 0.")
             return
 
-        # Registrar la transacción en la base de datos
+        def al_terminar(total):
+            """
+            Muestra el resultado de la transacción (se ejecuta en el hilo de la interfaz).
+            """
+            messagebox.showinfo("Éxito", f"Transacción de tipo '{tipo}' registrada exitosamente.")
+
+            # Cerrar la ventana
+            ventana_transaccion.destroy()
+
+        def al_fallar(e):
+            # Producto inexistente o stock insuficiente (`ErrorVentas`), o un error de la base
+            messagebox.showerror("Error", f"No se pudo registrar la transacción: {e}")
+            ventana_transaccion.destroy()
+
+        # Registrar la transacción en segundo plano, sin bloquear la interfaz
+        boton_registrar.config(state="disabled")
+        ejecutor.enviar(
+            registrar_transaccion_db, producto_id, tipo, cantidad,
+            al_terminar=al_terminar, al_fallar=al_fallar,
+        )
+
+    # Botón para confirmar la transacción
+    boton_registrar = ttkb.Button(ventana_transaccion, text="Registrar Transacción", command=registrar_transaccion)
+    boton_registrar.pack(pady=10)
+
+def ventana_registrar_ticket():
+    """
+    Abre una ventana para registrar una venta de varios productos (ticket).
+
+    Las líneas se acumulan en la ventana y al cobrar se registran todas juntas con
+    `registrar_ticket_db`: si alguna no tiene stock, no se registra ninguna.
+    """
+    ventana_ticket = ttkb.Toplevel()
+    ventana_ticket.title("Registrar Ticket")
+    ventana_ticket.geometry("500x450")
+
+    lineas = []  # Pares (producto_id, cantidad) en el orden en que se agregaron
+
+    # Campos de entrada para el ID del producto y la cantidad
+    marco_entrada = ttkb.Frame(ventana_ticket)
+    marco_entrada.pack(pady=10)
+    ttkb.Label(marco_entrada, text="ID del Producto:").grid(row=0, column=0, padx=5)
+    entry_id = ttkb.Entry(marco_entrada, width=10)
+    entry_id.grid(row=0, column=1, padx=5)
+    ttkb.Label(marco_entrada, text="Cantidad:").grid(row=0, column=2, padx=5)
+    entry_cantidad = ttkb.Entry(marco_entrada, width=10)
+    entry_cantidad.insert(0, "1")
+    entry_cantidad.grid(row=0, column=3, padx=5)
+
+    # Tabla con las líneas del ticket
+    tabla_lineas = ttkb.Treeview(ventana_ticket, columns=("Producto ID", "Cantidad"), show="headings", height=10)
+    for columna in ("Producto ID", "Cantidad"):
+        tabla_lineas.heading(columna, text=columna)
+        tabla_lineas.column(columna, anchor="center")
+    tabla_lineas.pack(fill="both", expand=True, padx=10, pady=5)
+
+    def agregar_linea():
+        """
+        Valida la línea ingresada y la agrega al ticket.
+        """
         try:
-            resultado = registrar_transaccion_db(producto_id, tipo, cantidad)  # Llamada a la función de base de datos
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al registrar la transacción: {e}")
+            producto_id = int(entry_id.get().strip())
+            cantidad = int(entry_cantidad.get().strip())
+        except ValueError:
+            messagebox.showerror("Error", "El ID del producto y la cantidad deben ser números válidos.")
             return
 
-        if resultado:
-            # Mostrar mensaje de éxito
-            messagebox.showinfo("Éxito", f"Transacción de tipo '{tipo}' registrada exitosamente.")
+        if cantidad <= 0:
+            messagebox.showerror("Error", "La cantidad debe ser mayor a 0.")
+            return
 
-            # Limpiar los campos
-            entry_id.delete(0, tk.END)
-            entry_cantidad.delete(0, tk.END)
-            tipo_var.set("venta")  # Reiniciar selección
+        lineas.append((producto_id, cantidad))
+        tabla_lineas.insert("", "end", values=(producto_id, cantidad))
+        entry_id.delete(0, tk.END)
+        entry_id.focus_set()
 
-            # Verificar stock bajo si es una venta
-            if tipo == "venta":
-                verificar_stock_bajo(umbral=5)
+    def quitar_linea():
+        """
+        Quita del ticket las líneas seleccionadas.
+        """
+        # De abajo hacia arriba, para que los índices de las restantes no cambien
+        for iid in sorted(tabla_lineas.selection(), key=tabla_lineas.index, reverse=True):
+            lineas.pop(tabla_lineas.index(iid))
+            tabla_lineas.delete(iid)
 
-            # Actualizar tablas abiertas
-            if ventana_tablas is not None and ventana_tablas.winfo_exists():
-                actualizar_tabla_productos()
-                actualizar_tabla_transacciones()
-        else:
-            messagebox.showerror("Error", "No se pudo registrar la transacción. Verifique los datos ingresados.")
+    def cobrar():
+        """
+        Registra el ticket completo en segundo plano, sin bloquear la interfaz.
+        """
+        if not lineas:
+            messagebox.showerror("Error", "Agregue al menos un producto al ticket.")
+            return
+
+        def al_terminar(ticket):
+            # La actualización de las tablas y la alerta de stock bajo llegan como eventos
+            messagebox.showinfo(
+                "Éxito", f"Ticket N° {ticket['venta_id']} registrado: {len(ticket['lineas'])} líneas, "
+                         f"total ${a_pesos(ticket['total']):,.2f}."
+            )
+            ventana_ticket.destroy()
 
-        # Cerrar la ventana
-        ventana_transaccion.destroy()
+        def al_fallar(e):
+            messagebox.showerror("Error", f"No se pudo registrar el ticket: {e}")
+            boton_cobrar.config(state="normal")
 
-    # Botón para confirmar la transacción
-    ttkb.Button(ventana_transaccion, text="Registrar Transacción", command=registrar_transaccion).pack(pady=10)
+        boton_cobrar.config(state="disabled")
+        ejecutor.enviar(registrar_ticket_db, list(lineas), al_terminar=al_terminar, al_fallar=al_fallar)
+
+    # Botones del ticket
+    marco_botones = ttkb.Frame(ventana_ticket)
+    marco_botones.pack(pady=10)
+    ttkb.Button(marco_botones, text="Agregar", command=agregar_linea).grid(row=0, column=0, padx=5)
+    ttkb.Button(marco_botones, text="Quitar", command=quitar_linea).grid(row=0, column=1, padx=5)
+    boton_cobrar = ttkb.Button(marco_botones, text="Cobrar", command=cobrar)
+    boton_cobrar.grid(row=0, column=2, padx=5)
+    entry_cantidad.bind("<Return>", lambda _: agregar_linea())
 
 def ventana_eliminar_producto():
     """
@@ -592,13 +750,17 @@ def ventana_eliminar_producto():
                 messagebox.showerror("Error", "El ID debe ser un número.")
                 return
             
-            resultado = eliminar_producto_por_id(int(producto_id))  # Llama a la función de la base de datos
-            if resultado:
-                messagebox.showinfo("Éxito", f"Producto con ID {producto_id} eliminado correctamente.")
-                parent.destroy()
-                ventana_id.destroy()
-            else:
-                messagebox.showerror("Error", f"No se encontró un producto con ID {producto_id}.")
+            def al_terminar(resultado):
+                if resultado:
+                    messagebox.showinfo("Éxito", f"Producto con ID {producto_id} eliminado correctamente.")
+                    parent.destroy()
+                    ventana_id.destroy()
+                else:
+                    messagebox.showerror("Error", f"No se pudo eliminar el producto con ID {producto_id}.")
+
+            # Producto inexistente (`ErrorVentas`) u otro error de la base
+            ejecutor.enviar(eliminar_producto_por_id, int(producto_id), al_terminar=al_terminar,
+                            al_fallar=lambda e: messagebox.showerror("Error", str(e)))
 
         ventana_id = ttkb.Toplevel()
         ventana_id.title("Eliminar por ID")
@@ -618,13 +780,17 @@ def ventana_eliminar_producto():
                 messagebox.showerror("Error", "Debe ingresar un nombre válido.")
                 return
 
-            resultado = eliminar_producto_por_nombre(nombre)  # Llama a la función de la base de datos
-            if resultado:
-                messagebox.showinfo("Éxito", f"Producto '{nombre}' eliminado correctamente.")
-                parent.destroy()
-                ventana_nombre.destroy()
-            else:
-                messagebox.showerror("Error", f"No se encontró un producto con nombre '{nombre}'.")
+            def al_terminar(resultado):
+                if resultado:
+                    messagebox.showinfo("Éxito", f"Producto '{nombre}' eliminado correctamente.")
+                    parent.destroy()
+                    ventana_nombre.destroy()
+                else:
+                    messagebox.showerror("Error", f"No se pudo eliminar el producto '{nombre}'.")
+
+            # Producto inexistente o nombre ambiguo (`ErrorVentas`), u otro error de la base
+            ejecutor.enviar(eliminar_producto_por_nombre, nombre, al_terminar=al_terminar,
+                            al_fallar=lambda e: messagebox.showerror("Error", str(e)))
 
         ventana_nombre = ttkb.Toplevel()
         ventana_nombre.title("Eliminar por Nombre")
@@ -636,72 +802,320 @@ def ventana_eliminar_producto():
 
         ttkb.Button(ventana_nombre, text="Eliminar", command=eliminar).pack(pady=10)
 
-def actualizar_tabla_productos():
-    """
-    Actualiza la tabla de productos si está activa, obteniendo los datos de la base de datos.
+def medir_refresco(nombre, inicio, filas):
     """
-    global tabla_productos
+    Registra el costo de un refresco de tabla en `tiempos_refresco`.
 
-    # Verifica si la tabla existe y está activa
-    if 'tabla_productos' in globals() and tabla_productos.winfo_exists():
-        try:
-            # Limpiar la tabla de productos
-            tabla_productos.delete(*tabla_productos.get_children())
+    Args:
+        nombre (str): Nombre de la tabla refrescada.
+        inicio (float): Valor de `time.perf_counter()` al comenzar el refresco.
+        filas (int): Cantidad de filas insertadas o actualizadas en el Treeview.
+    """
+    duracion_ms = (time.perf_counter() - inicio) * 1000
+    veces, total_ms, _, _ = tiempos_refresco.get(nombre, (0, 0.0, 0.0, 0))
+    tiempos_refresco[nombre] = (veces + 1, total_ms + duracion_ms, duracion_ms, filas)
 
-            # Obtener datos desde la base de datos
-            conexion = obtener_conexion()
-            cursor = conexion.cursor()
-            cursor.execute("SELECT * FROM productos")
-            productos = cursor.fetchall()
+def cargar_fila(tabla, fila, iid=None):
+    """
+    Inserta una fila en el Treeview usando su ID como iid, o la actualiza si ya existe.
 
-            # Insertar los productos en la tabla
-            for producto in productos:
-                tabla_productos.insert("", "end", values=producto)
-        except Exception as e:
-            print(f"Error al actualizar la tabla de productos: {e}")
-        finally:
-            # Asegúrate de cerrar la conexión
-            if 'conexion' in locals():
-                conexion.close()
+    Args:
+        iid (int, opcional): ID a usar como iid. Por defecto, la primera columna de la fila.
+    """
+    iid = str(fila[0] if iid is None else iid)
+    if tabla.exists(iid):
+        tabla.item(iid, values=fila)
     else:
+        tabla.insert("", "end", iid=iid, values=fila)
+
+def consultar_filas_productos(ids=None, desde_id=0):
+    """
+    Consulta las filas de la tabla de productos (se ejecuta en el hilo de fondo).
+
+    Args:
+        ids (list, opcional): Ver `actualizar_tabla_productos`. Si es None, todos los productos
+            activos con su número de orden (N°, ID, nombre, tipo, compra, venta, stock).
+        desde_id (int): Último ID mostrado; también se incluyen los productos con ID mayor.
+
+    Returns:
+        list: Filas de la consulta; sin el número de orden si se indicaron `ids`.
+    """
+    conexion = obtener_conexion()
+    try:
+        if ids is None:
+            return conexion.execute("""
+                SELECT numero, id, nombre, tipo, precio_compra, precio_venta, stock
+                FROM productos_activos ORDER BY id
+            """).fetchall()
+        marcadores = ", ".join("?" * len(ids))
+        return conexion.execute(
+            f"""
+            SELECT id, nombre, tipo, precio_compra, precio_venta, stock FROM productos
+            WHERE activo = 1 AND (id > ? OR id IN ({marcadores})) ORDER BY id
+            """,
+            [desde_id, *ids],
+        ).fetchall()
+    finally:
+        conexion.close()
+
+def actualizar_tabla_productos(ids=None):
+    """
+    Actualiza la tabla de productos si está activa. La consulta se hace en segundo plano
+    y las filas se cargan en el Treeview al recibir el resultado.
+
+    Args:
+        ids (list, opcional): IDs de los productos modificados. Si se indica, solo se actualizan
+            esas filas y se agregan los productos nuevos (con ID mayor al último mostrado).
+            Si es None, la tabla se recarga por completo.
+
+    Solo se muestran los productos activos. La columna "N°" es un número de orden
+    correlativo calculado al consultar; el ID real del producto es estable.
+    """
+    # Verifica si la tabla existe y está activa
+    if not ('tabla_productos' in globals() and tabla_productos is not None and tabla_productos.winfo_exists()):
         print("La tabla de productos no está activa o no existe.")
+        return
+
+    inicio = time.perf_counter()
+
+    def al_terminar(filas):
+        global ultimo_id_producto
+
+        # La ventana de tablas pudo cerrarse mientras se consultaba
+        if tabla_productos is None or not tabla_productos.winfo_exists():
+            return
+
+        if ids is None:
+            # Recarga completa: limpiar la tabla de productos
+            tabla_productos.delete(*tabla_productos.get_children())
+            productos = filas
+        else:
+            # Solo los productos modificados y los nuevos, conservando su número de orden
+            productos = []
+            siguiente = len(tabla_productos.get_children()) + 1
+            for producto in filas:
+                iid = str(producto[0])
+                if tabla_productos.exists(iid):
+                    numero = tabla_productos.set(iid, "N°")
+                else:
+                    numero, siguiente = siguiente, siguiente + 1
+                productos.append((numero, *producto))
+
+        # Insertar o actualizar los productos en la tabla (precios en pesos)
+        for producto in productos:
+            numero, id_producto, nombre, tipo, precio_compra, precio_venta, stock = producto
+            cargar_fila(tabla_productos, (numero, id_producto, nombre, tipo, formatear(precio_compra),
+                                          formatear(precio_venta), stock), iid=id_producto)
+            ultimo_id_producto = max(ultimo_id_producto, id_producto)
+        medir_refresco("productos", inicio, len(productos))
+
+    ejecutor.enviar(
+        consultar_filas_productos, ids, ultimo_id_producto, al_terminar=al_terminar,
+        al_fallar=lambda e: print(f"Error al actualizar la tabla de productos: {e}"),
+    )
 
 def actualizar_tabla_transacciones():
     """
-    Actualiza la tabla de transacciones si está activa, obteniendo los datos de la base de datos.
+    Actualiza la grilla de transacciones si está activa. Solo se consulta la página visible:
+    en la primera página ordenada por ID se agregan únicamente las transacciones nuevas.
     """
     global tabla_transacciones
 
     # Verifica si la tabla existe y está activa
-    if 'tabla_transacciones' in globals() and tabla_transacciones.winfo_exists():
+    if grilla_transacciones is not None and tabla_transacciones is not None and tabla_transacciones.winfo_exists():
+        inicio = time.perf_counter()
         try:
-            # Limpiar la tabla de transacciones
-            tabla_transacciones.delete(*tabla_transacciones.get_children())
-
-            # Obtener datos desde la base de datos
-            conexion = obtener_conexion()
-            cursor = conexion.cursor()
-            cursor.execute("SELECT * FROM transacciones")
-            transacciones = cursor.fetchall()
-
-            # Insertar las transacciones en la tabla
-            for transaccion in transacciones:
-                tabla_transacciones.insert("", "end", values=transaccion)
+            filas = grilla_transacciones.refrescar()
+            medir_refresco("transacciones", inicio, filas)
         except Exception as e:
             print(f"Error al actualizar la tabla de transacciones: {e}")
-        finally:
-            # Asegúrate de cerrar la conexión
-            if 'conexion' in locals():
-                conexion.close()
     else:
         print("La tabla de transacciones no está activa o no existe.")
 
+class GrillaTransacciones:
+    """
+    Grilla virtualizada de transacciones: el Treeview solo contiene la página visible.
+
+    Las páginas se piden a la base de datos con paginación por clave
+    (`consultar_pagina_transacciones`), al usar los botones o al desplazarse más allá
+    del final o del principio de la página. El orden (clic en un encabezado) y los
+    filtros por fecha, tipo y producto se resuelven en SQL, por lo que abrir la grilla
+    cuesta lo mismo sin importar el tamaño de la tabla.
+    """
+
+    # Encabezado visible -> columna de la base de datos
+    COLUMNAS = {"ID": "id", "Tipo": "tipo", "Producto ID": "producto_id",
+                "Cantidad": "cantidad", "Fecha": "fecha", "Total": "total"}
+
+    def __init__(self, parent, anchos, limite=200):
+        self.limite = limite
+        self.orden = "id"
+        self.descendente = True
+        self.filtros = {}
+        self.claves = [None]  # Clave de inicio de cada página visitada
+        self.filas = []
+        self.ultimo_id = 0
+
+        # Filtros
+        marco_filtros = ttkb.Frame(parent)
+        marco_filtros.pack(fill="x", padx=10)
+        self.entradas = {}
+        for etiqueta, clave, ancho in (("Desde (AAAA-MM-DD)", "desde", 12), ("Hasta", "hasta", 12),
+                                       ("Producto ID", "producto_id", 8)):
+            ttkb.Label(marco_filtros, text=etiqueta).pack(side="left", padx=(5, 2))
+            self.entradas[clave] = ttkb.Entry(marco_filtros, width=ancho)
+            self.entradas[clave].pack(side="left")
+        ttkb.Label(marco_filtros, text="Tipo").pack(side="left", padx=(5, 2))
+        self.tipo = ttkb.Combobox(marco_filtros, values=["", "compra", "venta"], width=8, state="readonly")
+        self.tipo.pack(side="left")
+        ttkb.Button(marco_filtros, text="Filtrar", command=self.aplicar_filtros).pack(side="left", padx=5)
+
+        # Tabla con barra de desplazamiento
+        marco_tabla = ttkb.Frame(parent)
+        marco_tabla.pack(fill="both", expand=True, padx=10, pady=5)
+        self.tabla = ttkb.Treeview(marco_tabla, columns=list(self.COLUMNAS), show="headings")
+        barra = ttkb.Scrollbar(marco_tabla, orient="vertical", command=self.tabla.yview)
+        self.tabla.configure(yscrollcommand=barra.set)
+        for columna in self.COLUMNAS:
+            self.tabla.heading(columna, text=columna, anchor="center",
+                               command=lambda c=columna: self.ordenar(self.COLUMNAS[c]))
+            self.tabla.column(columna, anchor="center", width=anchos.get(columna, 80))
+        barra.pack(side="right", fill="y")
+        self.tabla.pack(side="left", fill="both", expand=True)
+
+        # Pasar de página al desplazarse más allá de los extremos
+        self.tabla.bind("<MouseWheel>", lambda e: self._desplazar(-1 if e.delta > 0 else 1))
+        self.tabla.bind("<Button-4>", lambda e: self._desplazar(-1))
+        self.tabla.bind("<Button-5>", lambda e: self._desplazar(1))
+
+        # Navegación
+        marco_paginas = ttkb.Frame(parent)
+        marco_paginas.pack(pady=(0, 10))
+        ttkb.Button(marco_paginas, text="< Anterior", command=self.anterior).pack(side="left", padx=5)
+        self.etiqueta_pagina = ttkb.Label(marco_paginas, text="")
+        self.etiqueta_pagina.pack(side="left", padx=5)
+        ttkb.Button(marco_paginas, text="Siguiente >", command=self.siguiente).pack(side="left", padx=5)
+
+    @staticmethod
+    def _valores(fila):
+        # Las filas se conservan en centavos (para las claves de página); se muestran en pesos
+        return (*fila[:5], formatear(fila[5]))
+
+    def _consultar(self, despues_de):
+        return consultar_pagina_transacciones(
+            limite=self.limite, despues_de=despues_de, orden=self.orden,
+            descendente=self.descendente, **self.filtros,
+        )
+
+    def cargar_pagina(self):
+        """
+        Carga en el Treeview la página actual (la última clave de `self.claves`).
+
+        Returns:
+            int: Cantidad de filas cargadas.
+        """
+        self.filas = self._consultar(self.claves[-1])
+        self.tabla.delete(*self.tabla.get_children())
+        for fila in self.filas:
+            self.tabla.insert("", "end", iid=str(fila[0]), values=self._valores(fila))
+        if self.filas:
+            self.ultimo_id = max(self.ultimo_id, max(fila[0] for fila in self.filas))
+        self.etiqueta_pagina.config(text=f"Página {len(self.claves)}")
+        return len(self.filas)
+
+    def ir_a_primera(self):
+        """
+        Vuelve a la primera página y la recarga.
+        """
+        self.claves = [None]
+        self.ultimo_id = 0
+        return self.cargar_pagina()
+
+    def siguiente(self):
+        if len(self.filas) < self.limite:
+            return False  # Es la última página
+        self.claves.append(clave_pagina(self.filas[-1], self.orden))
+        if not self.cargar_pagina():
+            # No había más filas: quedarse en la página anterior
+            self.claves.pop()
+            self.cargar_pagina()
+            return False
+        return True
+
+    def anterior(self):
+        if len(self.claves) == 1:
+            return False
+        self.claves.pop()
+        self.cargar_pagina()
+        return True
+
+    def _desplazar(self, direccion):
+        inicio, fin = self.tabla.yview()
+        if direccion > 0 and fin >= 1.0 and self.siguiente():
+            self.tabla.yview_moveto(0)
+            return "break"
+        if direccion < 0 and inicio <= 0.0 and self.anterior():
+            self.tabla.yview_moveto(1)
+            return "break"
+        return None
+
+    def ordenar(self, columna):
+        """
+        Ordena por la columna indicada (un segundo clic invierte el orden) desde la primera página.
+        """
+        if self.orden == columna:
+            self.descendente = not self.descendente
+        else:
+            self.orden, self.descendente = columna, columna in ("id", "fecha")
+        self.ir_a_primera()
+
+    def aplicar_filtros(self):
+        """
+        Lee los filtros ingresados y recarga desde la primera página.
+        """
+        filtros = {clave: entrada.get().strip() for clave, entrada in self.entradas.items()}
+        filtros["tipo"] = self.tipo.get()
+        if filtros["producto_id"]:
+            if not filtros["producto_id"].isdigit():
+                messagebox.showerror("Error", "El ID del producto debe ser un número.")
+                return
+            filtros["producto_id"] = int(filtros["producto_id"])
+        self.filtros = {clave: valor for clave, valor in filtros.items() if valor not in ("", None)}
+        self.ir_a_primera()
+
+    def refrescar(self):
+        """
+        Refleja los cambios de la base de datos en la página visible.
+
+        En la primera página ordenada por ID descendente solo se consultan e insertan arriba
+        las transacciones nuevas (ID mayor al último mostrado); en otros casos se recarga
+        la página actual, cuyo costo está acotado por `limite`.
+
+        Returns:
+            int: Cantidad de filas consultadas.
+        """
+        if len(self.claves) == 1 and self.orden == "id" and self.descendente:
+            nuevas = consultar_pagina_transacciones(
+                limite=self.limite, despues_de=(self.ultimo_id, self.ultimo_id),
+                orden="id", descendente=False, **self.filtros,
+            )
+            if len(nuevas) < self.limite:
+                for fila in nuevas:
+                    self.tabla.insert("", 0, iid=str(fila[0]), values=self._valores(fila))
+                self.filas = (nuevas[::-1] + self.filas)[:self.limite]
+                for iid in self.tabla.get_children()[self.limite:]:
+                    self.tabla.delete(iid)
+                if nuevas:
+                    self.ultimo_id = nuevas[-1][0]
+                return len(nuevas)
+        return self.cargar_pagina()
+
 def abrir_ventana_tablas():
     """
     Abre una ventana con las tablas de productos y transacciones.
     Si la ventana ya está abierta, la trae al frente.
     """
-    global ventana_tablas, tabla_productos, tabla_transacciones
+    global ventana_tablas, tabla_productos, tabla_transacciones, grilla_transacciones, ultimo_id_producto
 
     # Verificar si la ventana ya está abierta
     if ventana_tablas is not None and ventana_tablas.winfo_exists():
@@ -718,9 +1132,10 @@ def abrir_ventana_tablas():
         """
         Limpia referencias globales al cerrar la ventana.
         """
-        global tabla_productos, tabla_transacciones, ventana_tablas
+        global tabla_productos, tabla_transacciones, grilla_transacciones, ventana_tablas
         tabla_productos = None
         tabla_transacciones = None
+        grilla_transacciones = None
         ventana_tablas.destroy()
         ventana_tablas = None
 
@@ -747,23 +1162,22 @@ def abrir_ventana_tablas():
     # Crear tabla de productos
     tabla_productos = crear_tabla(
         ventana_tablas,
-        columnas=["ID", "Nombre", "Tipo", "Compra", "Venta", "Stock"],
-        anchos={"ID": 50, "Nombre": 100, "Tipo": 80, "Compra": 80, "Venta": 80, "Stock": 40},
+        columnas=["N°", "ID", "Nombre", "Tipo", "Compra", "Venta", "Stock"],
+        anchos={"N°": 40, "ID": 50, "Nombre": 100, "Tipo": 80, "Compra": 80, "Venta": 80, "Stock": 40},
         titulo="Productos",
     )
 
-    # Crear tabla de transacciones
-    tabla_transacciones = crear_tabla(
+    # Crear grilla paginada de transacciones (solo se carga la página visible)
+    grilla_transacciones = GrillaTransacciones(
         ventana_tablas,
-        columnas=["ID", "Tipo", "Producto ID", "Cantidad", "Fecha", "Total"],
         anchos={"ID": 50, "Tipo": 60, "Producto ID": 50, "Cantidad": 80, "Fecha": 100, "Total": 80},
-        titulo="Transacciones",
     )
+    tabla_transacciones = grilla_transacciones.tabla
 
-    # Cargar datos
+    # Cargar datos (carga completa de productos, primera página de transacciones)
+    ultimo_id_producto = 0
     actualizar_tabla_productos()
-    actualizar_tabla_transacciones()
-    verificar_stock_bajo(umbral=5)
+    grilla_transacciones.ir_a_primera()
 
 
 def crear_tabla(parent, columnas, anchos, titulo):
@@ -790,52 +1204,79 @@ def confirmar_reinicio():
     """
     Confirma con el usuario si desea reiniciar las transacciones, mostrando un resumen de totales
     antes de realizar la acción. Permite guardar un reporte PDF antes del reinicio.
+    Las transacciones no se borran: se mueven al archivo histórico (ver `cerrar_periodo`).
     """
-    # Calcular totales
-    total_ventas, total_compras, total_ganancia, porcentaje_ganancia = calcular_totales()
-
-    # Mensaje de confirmación
-    mensaje = (
-        f"Antes de reiniciar las transacciones, aquí tienes los totales:\n"
-        f"- Total de Ventas: ${total_ventas:.2f}\n"
-        f"- Total de Compras: ${total_compras:.2f}\n"
-        f"- Total de Ganancia: ${total_ganancia:.2f}\n"
-        f"- Porcentaje de Ganancia: {porcentaje_ganancia:.2f}%\n\n"
-        f"¿Estás seguro de que quieres reiniciar todas las transacciones? Esta acción no se puede deshacer."
-    )
-
-    # Confirmar acción con el usuario
-    respuesta = messagebox.askyesno("Confirmación", mensaje)
-    if respuesta:
-        # Solicitar archivo para guardar el reporte
-        archivo = filedialog.asksaveasfilename(
-            defaultextension=".pdf",
-            filetypes=[("Archivos PDF", "*.pdf")],
-            title="Guardar reporte antes de reiniciar"
+    def confirmar(totales):
+        total_ventas, total_compras, total_ganancia, porcentaje_ganancia = totales
+
+        # Mensaje de confirmación
+        mensaje = (
+            f"Antes de reiniciar las transacciones, aquí tienes los totales:\n"
+            f"- Total de Ventas: ${formatear(total_ventas)}\n"
+            f"- Total de Compras: ${formatear(total_compras)}\n"
+            f"- Total de Ganancia: ${formatear(total_ganancia)}\n"
+            f"- Porcentaje de Ganancia: {porcentaje_ganancia:.2f}%\n\n"
+            f"¿Estás seguro de que quieres reiniciar todas las transacciones? Se moverán al archivo histórico "
+            f"y seguirán disponibles en los reportes."
         )
+
+        # Confirmar acción con el usuario
+        respuesta = messagebox.askyesno("Confirmación", mensaje)
+        if respuesta:
+            # Solicitar archivo para guardar el reporte
+            archivo = filedialog.asksaveasfilename(
+                defaultextension=".pdf",
+                filetypes=[("Archivos PDF", "*.pdf")],
+                title="Guardar reporte antes de reiniciar"
+            )
         
-        if archivo:  # Verificar que se haya seleccionado un archivo
-            try:
-                # Generar el reporte PDF
-                generar_reporte_pdf(archivo)
-                # Reiniciar transacciones
-                reiniciar_transacciones()
-                # Notificar éxito
-                messagebox.showinfo("Éxito", "Las transacciones han sido reiniciadas y el reporte se ha guardado correctamente.")
-            except Exception as e:
-                # Manejar errores durante el guardado o reinicio
-                messagebox.showerror("Error", f"Ocurrió un error al guardar el reporte o reiniciar las transacciones.\n\n{str(e)}")
-        else:
-            # Si no se seleccionó archivo, cancelar operación
-            messagebox.showinfo("Cancelado", "La operación fue cancelada. Las transacciones no se han reiniciado.")
+            if archivo:  # Verificar que se haya seleccionado un archivo
+                def generar_y_reiniciar(progreso):
+                    # Generar el reporte PDF
+                    generar_reporte_pdf(archivo, progreso=progreso)
+                    # Reiniciar transacciones
+                    reiniciar_transacciones()
+
+                ventana, etiqueta, boton_cancelar = ventana_progreso("Guardando reporte")
+
+                def al_terminar(_):
+                    ventana.destroy()
+
+                    # Volver a la primera página de transacciones si la grilla está abierta
+                    if grilla_transacciones is not None and tabla_transacciones.winfo_exists():
+                        grilla_transacciones.ir_a_primera()
+
+                    # Notificar éxito
+                    messagebox.showinfo("Éxito", "Las transacciones han sido reiniciadas y el reporte se ha guardado correctamente.")
+
+                def al_fallar(e):
+                    ventana.destroy()
+                    if isinstance(e, TareaCancelada):
+                        messagebox.showinfo("Cancelado", "La operación fue cancelada. Las transacciones no se han reiniciado.")
+                    else:
+                        # Manejar errores durante el guardado o reinicio
+                        messagebox.showerror("Error", f"Ocurrió un error al guardar el reporte o reiniciar las transacciones.\n\n{str(e)}")
+
+                tarea = ejecutor.enviar(
+                    generar_y_reiniciar, al_terminar=al_terminar, al_fallar=al_fallar,
+                    al_progresar=lambda filas: etiqueta.config(text=f"{filas} transacciones procesadas..."),
+                )
+                boton_cancelar.config(command=tarea.cancelar)
+            else:
+                # Si no se seleccionó archivo, cancelar operación
+                messagebox.showinfo("Cancelado", "La operación fue cancelada. Las transacciones no se han reiniciado.")
+
+    # Calcular los totales en segundo plano y pedir la confirmación al recibirlos
+    ejecutor.enviar(calcular_totales, al_terminar=confirmar)
 
 def calcular_totales():
     """
     Calcula los totales de ventas, compras, ganancias y el porcentaje de ganancia
-    a partir de las transacciones almacenadas en la base de datos.
+    a partir de los totales acumulados en `resumen_totales`, sin recorrer el historial
+    de transacciones.
 
     Returns:
-        tuple: (total_ventas, total_compras, total_ganancias, porcentaje_ganancia)
+        tuple: (total_ventas, total_compras, total_ganancias, porcentaje_ganancia), los montos en centavos.
     """
     try:
         # Conexión a la base de datos
@@ -843,11 +1284,11 @@ def calcular_totales():
         cursor = conexion.cursor()
 
         # Total de ventas
-        cursor.execute("SELECT SUM(total) FROM transacciones WHERE tipo = 'venta';")
+        cursor.execute("SELECT SUM(total) FROM resumen_totales WHERE tipo = 'venta';")
         total_ventas = cursor.fetchone()[0] or 0
 
         # Total de compras
-        cursor.execute("SELECT SUM(total) FROM transacciones WHERE tipo = 'compra';")
+        cursor.execute("SELECT SUM(total) FROM resumen_totales WHERE tipo = 'compra';")
         total_compras = cursor.fetchone()[0] or 0
 
         # Ganancias totales
@@ -896,8 +1337,8 @@ def ventana_modificar_producto():
 
         try:
             producto_id = int(entry_id.get())
-            valor_compra = float(entry_compra.get())
-            valor_venta = float(entry_venta.get())
+            valor_compra = a_centavos(entry_compra.get())
+            valor_venta = a_centavos(entry_venta.get())
         except ValueError:
             messagebox.showerror("Error", "El ID y los valores deben ser numéricos y válidos.")
             return
@@ -906,34 +1347,32 @@ def ventana_modificar_producto():
             messagebox.showerror("Error", "Los valores de compra y/o venta deben ser mayores a 0.")
             return
 
-        # Llamar a la función que realiza el registro en la base de datos
-        resultado = registrar_modificacion_db(producto_id, valor_compra, valor_venta)
-        if resultado:
+        def al_terminar(_):
             messagebox.showinfo("Éxito", "Modificación registrada exitosamente.")
-            # Limpiar los campos de entrada
-            entry_id.delete(0, tk.END)
-            entry_compra.delete(0, tk.END)
-            entry_venta.delete(0, tk.END)
-
-            # Actualizar las tablas si están abiertas
-            if ventana_tablas is not None and ventana_tablas.winfo_exists():
-                actualizar_tabla_productos()
-                actualizar_tabla_transacciones()
-        else:
+            ventana_modificar.destroy()
+
+        def al_fallar(e):
             messagebox.showerror(
                 "Error",
-                "No se pudo registrar las modificaciones. Verifique que el ID del producto sea válido."
+                f"No se pudo registrar las modificaciones. {e}"
             )
-
-        # Cerrar la ventana de modificación
-        ventana_modificar.destroy()
+            ventana_modificar.destroy()
+
+        # Registrar la modificación en segundo plano
+        # (la fila de la tabla abierta se actualiza con el evento de la modificación)
+        boton_modificar.config(state="disabled")
+        ejecutor.enviar(
+            registrar_modificacion_db, producto_id, valor_compra, valor_venta,
+            al_terminar=al_terminar, al_fallar=al_fallar,
+        )
 
     # Botón de confirmación
-    ttkb.Button(
+    boton_modificar = ttkb.Button(
         ventana_modificar,
         text="Registrar Modificación",
         command=registrar_modificacion
-    ).pack(pady=10)
+    )
+    boton_modificar.pack(pady=10)
 
 def exportar_reporte():
     """
@@ -964,23 +1403,64 @@ def exportar_reporte():
     if not archivo:
         return  # Si el usuario cancela, no hacer nada
 
-    # Generar el reporte según el formato elegido
-    try:
-        if respuesta == "yes":
-            generar_reporte_excel(archivo)
-        else:
-            generar_reporte_pdf(archivo)
+    # Ofrecer incluir los períodos cerrados, si existen
+    incluir_archivo = bool(anios_archivados()) and messagebox.askyesno(
+        "Generar Reporte", "¿Incluir también las transacciones de los períodos archivados?"
+    )
+
+    # Generar el reporte según el formato elegido, en segundo plano
+    generar = generar_reporte_excel if respuesta == "yes" else generar_reporte_pdf
+    ventana, etiqueta, boton_cancelar = ventana_progreso("Generando Reporte")
 
+    def al_terminar(_):
+        ventana.destroy()
         messagebox.showinfo(
             "Reporte Generado",
             f"El reporte de transacciones se ha generado correctamente en {archivo}.",
         )
-    except Exception as e:
+
+    def al_fallar(e):
+        ventana.destroy()
+        if isinstance(e, TareaCancelada):
+            messagebox.showinfo("Cancelado", "La generación del reporte fue cancelada.")
+            return
         messagebox.showerror(
             "Error al Generar Reporte",
             f"Ocurrió un error al generar el reporte:\n{e}",
         )
 
+    tarea = ejecutor.enviar(
+        generar, archivo, incluir_archivo=incluir_archivo, al_terminar=al_terminar, al_fallar=al_fallar,
+        al_progresar=lambda filas: etiqueta.config(text=f"{filas} transacciones escritas..."),
+    )
+    boton_cancelar.config(command=tarea.cancelar)
+
+def ventana_progreso(titulo):
+    """
+    Crea una ventana con una barra de progreso para las tareas largas en segundo plano.
+
+    Args:
+        titulo (str): Título de la ventana.
+
+    Returns:
+        tuple: (ventana, etiqueta de estado, botón "Cancelar"). Quien la crea asigna el
+        comando del botón y destruye la ventana al terminar la tarea.
+    """
+    ventana = ttkb.Toplevel()
+    ventana.title(titulo)
+    ventana.geometry("320x150")
+
+    etiqueta = ttkb.Label(ventana, text="Procesando...")
+    etiqueta.pack(pady=10)
+
+    barra = ttkb.Progressbar(ventana, mode="indeterminate")
+    barra.pack(fill="x", padx=20, pady=5)
+    barra.start(10)
+
+    boton_cancelar = ttkb.Button(ventana, text="Cancelar")
+    boton_cancelar.pack(pady=10)
+    return ventana, etiqueta, boton_cancelar
+
 if __name__ == "__main__":
     rol_actual = None # Variable global para guardar el rol actual
     ventana_tablas = None # Variable global de la tabla al iniciar 
@@ -0,0 +1,192 @@
+import os
+import sqlite3
+import time
+
+# Filas por lote en los rellenos de datos de las migraciones (ver `procesar_por_lotes`)
+TAMANO_LOTE = 5000
+
+# Registro de las migraciones aplicadas, con su duración, para planificar ventanas de mantenimiento
+SQL_TABLA_MIGRACIONES = """
+    CREATE TABLE IF NOT EXISTS migraciones (
+        numero INTEGER PRIMARY KEY,
+        descripcion TEXT NOT NULL,
+        aplicada TEXT DEFAULT CURRENT_TIMESTAMP,
+        segundos REAL NOT NULL,
+        filas INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+
+class ErrorMigracion(sqlite3.DatabaseError):
+    """
+    Una migración falló (la base queda en la versión anterior) o la base es de una versión
+    más nueva que la aplicación.
+    """
+
+
+class Migracion:
+    """
+    Cambio numerado del esquema: `aplicar(paso)` recibe un `PasoMigracion` con el cursor de la
+    transacción y retorna la cantidad de filas que rellenó (o None).
+
+    Las migraciones deben tolerar bases migradas antes de este registro (cuando cada cambio se
+    aplicaba al abrir la base sin número de versión): usan `IF NOT EXISTS` o comprueban el
+    esquema antes de modificarlo.
+    """
+
+    __slots__ = ("numero", "descripcion", "aplicar")
+
+    def __init__(self, numero, descripcion, aplicar):
+        self.numero = numero
+        self.descripcion = descripcion
+        self.aplicar = aplicar
+
+    def __repr__(self):
+        return f"Migracion({self.numero}, {self.descripcion!r})"
+
+
+class PasoMigracion:
+    """
+    Contexto de una migración en curso: el cursor de su transacción y el relleno por lotes.
+    """
+
+    def __init__(self, cursor, migracion, tamano_lote, progreso):
+        self.cursor = cursor
+        self.migracion = migracion
+        self.tamano_lote = tamano_lote
+        self._progreso = progreso
+
+    def existe_columna(self, tabla, columna, esquema="main"):
+        self.cursor.execute(f"PRAGMA {esquema}.table_info({tabla})")
+        return columna in [fila[1] for fila in self.cursor.fetchall()]
+
+    def existe_tabla(self, tabla):
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,))
+        return self.cursor.fetchone() is not None
+
+    def procesar_por_lotes(self, tabla, sql):
+        """
+        Ejecuta `sql` por rangos de `rowid` de `tabla`, de a `tamano_lote` filas.
+
+        `sql` recibe los parámetros `:desde` y `:hasta` (inclusive) y debe limitar su trabajo a
+        ese rango, por ejemplo `UPDATE t SET b = a * 2 WHERE rowid BETWEEN :desde AND :hasta`.
+        Con tablas grandes, cada sentencia toca pocas páginas (el caché de SQLite no se desborda
+        y el avance se puede informar), aunque todo sigue dentro de la transacción de la migración.
+
+        Retorna:
+            int: Filas modificadas en total.
+        """
+        self.cursor.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {tabla}")
+        primero, ultimo = self.cursor.fetchone()
+        if primero is None:
+            return 0
+        filas = 0
+        for desde in range(primero, ultimo + 1, self.tamano_lote):
+            hasta = min(desde + self.tamano_lote - 1, ultimo)
+            self.cursor.execute(sql, {"desde": desde, "hasta": hasta})
+            filas += max(self.cursor.rowcount, 0)
+            if self._progreso:
+                self._progreso(self.migracion, hasta - primero + 1, ultimo - primero + 1)
+        return filas
+
+
+def version_actual(conexion):
+    """
+    Retorna:
+        int: Versión del esquema (`PRAGMA user_version`; 0 en bases sin migraciones registradas).
+    """
+    return conexion.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pendientes(conexion, migraciones):
+    """
+    Retorna:
+        list: Migraciones con número mayor a la versión actual, en orden.
+
+    Excepciones:
+        ErrorMigracion: Si la base tiene una versión mayor que la última migración conocida.
+    """
+    version = version_actual(conexion)
+    ultima = max((migracion.numero for migracion in migraciones), default=0)
+    if version > ultima:
+        raise ErrorMigracion(
+            f"La base de datos está en la versión {version} y esta aplicación solo conoce hasta la {ultima}."
+        )
+    return sorted((migracion for migracion in migraciones if migracion.numero > version),
+                  key=lambda migracion: migracion.numero)
+
+
+def aplicar_migraciones(conexion, migraciones, tamano_lote=TAMANO_LOTE, progreso=None, informar=print):
+    """
+    Lleva la base a la última versión, aplicando las migraciones pendientes en orden.
+
+    - Cada migración corre en su propia transacción (`BEGIN IMMEDIATE`) junto con el cambio de
+      `PRAGMA user_version` y su registro en `migraciones`: si falla, se revierte completa y la
+      base queda en la versión anterior, lista para reintentar.
+    - Informa la duración y las filas rellenadas de cada una (`informar`), y las guarda en la
+      tabla `migraciones` para estimar ventanas de mantenimiento en bases grandes.
+
+    Parámetros:
+        conexion: Conexión a la base (del pool o `sqlite3.Connection`).
+        migraciones (list): Objetos `Migracion`.
+        tamano_lote (int, opcional): Filas por lote de los rellenos de datos.
+        progreso (callable, opcional): Recibe (migracion, filas procesadas, filas totales) por lote.
+        informar (callable, opcional): Recibe un mensaje por migración aplicada (None = silencio).
+
+    Retorna:
+        list: Un dict por migración aplicada con `numero`, `descripcion`, `segundos` y `filas`.
+
+    Excepciones:
+        ErrorMigracion: Si una migración falla o la base es de una versión más nueva.
+    """
+    aplicadas = []
+    for migracion in pendientes(conexion, migraciones):
+        cursor = conexion.cursor()
+        inicio = time.perf_counter()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(SQL_TABLA_MIGRACIONES)
+            filas = migracion.aplicar(PasoMigracion(cursor, migracion, tamano_lote, progreso)) or 0
+            segundos = time.perf_counter() - inicio
+            cursor.execute(
+                "INSERT OR REPLACE INTO migraciones (numero, descripcion, segundos, filas) VALUES (?, ?, ?, ?)",
+                (migracion.numero, migracion.descripcion, round(segundos, 4), filas),
+            )
+            cursor.execute(f"PRAGMA user_version = {int(migracion.numero)}")
+            conexion.commit()
+        except sqlite3.Error as e:
+            conexion.rollback()
+            raise ErrorMigracion(f"Falló la migración {migracion.numero} ({migracion.descripcion}): {e}") from e
+
+        resultado = {"numero": migracion.numero, "descripcion": migracion.descripcion,
+                     "segundos": round(time.perf_counter() - inicio, 4), "filas": filas}
+        aplicadas.append(resultado)
+        if informar:
+            informar(f"Migración {migracion.numero} ({migracion.descripcion}): "
+                     f"{resultado['segundos']:.3f} s, {filas} filas")
+    return aplicadas
+
+
+def simular_migraciones(ruta, migraciones, tamano_lote=TAMANO_LOTE, progreso=None, informar=print):
+    """
+    Aplica las migraciones pendientes sobre una copia temporal de la base (con la API de backup
+    de SQLite, sin bloquear a quien la esté usando) y descarta la copia.
+
+    Sirve para medir cuánto tardará la migración real de una base grande antes de programarla.
+
+    Retorna:
+        list: Igual que `aplicar_migraciones`, con las duraciones medidas sobre la copia.
+    """
+    import tempfile  # Solo aquí: no se carga al iniciar la aplicación
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        copia = sqlite3.connect(os.path.join(carpeta, "simulacion.db"))
+        try:
+            original = sqlite3.connect(f"file:{ruta}?mode=ro", uri=True)
+            try:
+                original.backup(copia)
+            finally:
+                original.close()
+            return aplicar_migraciones(copia, migraciones, tamano_lote, progreso, informar)
+        finally:
+            copia.close()
@@ -1,6 +1,9 @@
 import sqlite3
-from db_manager import reorganizar_ids
-from tkinter import messagebox
+from catalogo import catalogo
+from dinero import formatear
+from db_manager import obtener_conexion
+from errores import ProductoAmbiguo, ProductoNoEncontrado
+from eventos import PRODUCTO_ELIMINADO, PRODUCTOS_ACTUALIZADOS, publicar
 
 def agregar_producto(nombre, tipo, precio_compra, precio_venta, stock):
     """
@@ -9,14 +12,14 @@ def agregar_producto(nombre, tipo, precio_compra, precio_venta, stock):
     Parámetros:
     - nombre (str): Nombre del producto a agregar. Ejemplo: "Coca Cola".
     - tipo (str): Categoría o tipo del producto. Ejemplo: "Bebida gaseosa".
-    - precio_compra (float): Costo del producto para el negocio. Ejemplo: 10.50.
-    - precio_venta (float): Precio al que el producto será vendido. Ejemplo: 15.00.
+    - precio_compra (int): Costo del producto para el negocio, en centavos. Ejemplo: 1050 ($10.50).
+    - precio_venta (int): Precio al que el producto será vendido, en centavos. Ejemplo: 1500 ($15.00).
     - stock (int): Cantidad inicial del producto en inventario. Ejemplo: 50.
 
     Return:
         None
     """
-    conexion = sqlite3.connect("gestion_bebidas.db")
+    conexion = obtener_conexion()
     cursor = conexion.cursor()
 
     consulta = """
@@ -26,93 +29,68 @@ def agregar_producto(nombre, tipo, precio_compra, precio_venta, stock):
 
     datos = (nombre, tipo, precio_compra, precio_venta, stock)
     cursor.execute(consulta, datos)
-    conexion.commit()
+    with catalogo.escritura():
+        conexion.commit()
+        catalogo.registrar_alta(cursor.lastrowid, *datos)
 
     print(f"Producto '{nombre}' agregado exitosamente.")
-    listar_productos()
     conexion.close()
+    publicar(PRODUCTOS_ACTUALIZADOS, ids=[cursor.lastrowid])
 
 
 def eliminar_producto_por_nombre(nombre):
     """
     Elimina un producto de la base de datos basado en su nombre.
-    Si hay múltiples productos con el mismo nombre, permite seleccionar un ID.
-    """
-    conexion = sqlite3.connect("gestion_bebidas.db")
-    cursor = conexion.cursor()
 
+    Excepciones:
+        ProductoNoEncontrado: Si no hay ningún producto activo con ese nombre.
+        ProductoAmbiguo: Si hay varios; su atributo `ids` permite elegir uno y
+        eliminarlo con `eliminar_producto_por_id`.
+    """
     try:
-        # Verificar si existen productos con ese nombre
-        cursor.execute("SELECT * FROM productos WHERE nombre = ?", (nombre,))
-        productos = cursor.fetchall()
-
-        if not productos:
-            messagebox.showerror("Error", "No se encontró ningún producto con ese nombre.")
-            return False
-
-        # Si hay múltiples productos con el mismo nombre, mostrar opciones
-        if len(productos) > 1:
-            print("Se encontraron múltiples productos con ese nombre:")
-            print(f"{'ID':<5} {'Nombre':<20} {'Compra':<10} {'Venta':<10} {'Stock':<10}")
-            print("-" * 60)
-            for producto in productos:
-                id_producto, nombre_producto, precio_compra, precio_venta, stock = producto
-                print(f"{id_producto:<5} {nombre_producto:<20} {precio_compra:<10.2f} {precio_venta:<10.2f} {stock:<10}")
-
-            try:
-                producto_id = int(input("Ingrese el ID del producto a eliminar: "))
-            except ValueError:
-                messagebox.showerror("Error", "ID no válido. Operación cancelada.")
-                return False
-
-            # Verificar que el ID ingresado esté en la lista
-            if not any(p[0] == producto_id for p in productos):
-                messagebox.showerror("Error", "El ID ingresado no coincide con ningún producto.")
-                return False
-
-            # Llamar a la función existente para eliminar por ID
-            eliminar_producto_por_id(producto_id)
-
-        else:
-            # Eliminar directamente si solo hay un producto con ese nombre
-            producto_id = productos[0][0]
-            eliminar_producto_por_id(producto_id)
-
-        return True
+        # Verificar si existen productos con ese nombre (en el catálogo en memoria)
+        ids = [producto.id for producto in catalogo.buscar_por_nombre(nombre)]
 
     except sqlite3.Error as e:
         print(f"Error al eliminar el producto: {e}")
         return False
 
-    finally:
-        conexion.close()
+    if not ids:
+        raise ProductoNoEncontrado(nombre=nombre)
+    if len(ids) > 1:
+        raise ProductoAmbiguo(nombre, ids)
+
+    return eliminar_producto_por_id(ids[0])
 
 
 def eliminar_producto_por_id(producto_id):
     """
-    Elimina un producto de la base de datos basado en su ID.
-    También reorganiza los IDs después de la eliminación.
+    Da de baja un producto basado en su ID.
+
+    La baja es lógica (`activo = 0`): el producto deja de mostrarse y de aceptar
+    transacciones, pero conserva su ID, por lo que las transacciones históricas
+    siguen apuntando a él y no hace falta renumerar la tabla. Para compactar los
+    IDs de forma explícita, usar `db_manager.reorganizar_ids()`.
+
+    Al confirmar, publica el evento `PRODUCTO_ELIMINADO`.
+
+    Excepciones:
+        ProductoNoEncontrado: Si no existe un producto activo con ese ID.
     """
-    conexion = sqlite3.connect("gestion_bebidas.db")
+    conexion = obtener_conexion()
     cursor = conexion.cursor()
 
     try:
-        # Verificar si el producto existe
-        cursor.execute("SELECT * FROM productos WHERE id = ?", (producto_id,))
-        producto = cursor.fetchone()
-        if not producto:
-            messagebox.showerror("Error", "No se encontró un producto con ese ID.")
-            return False
-
-        # Eliminar el producto
-        cursor.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
-        conexion.commit()
+        # Dar de baja el producto (solo si existe y sigue activo)
+        cursor.execute("UPDATE productos SET activo = 0 WHERE id = ? AND activo = 1", (producto_id,))
+        if cursor.rowcount == 0:
+            raise ProductoNoEncontrado(producto_id)
+
+        with catalogo.escritura():
+            conexion.commit()
+            catalogo.registrar_baja(producto_id)
         print(f"Producto con ID {producto_id} eliminado exitosamente.")
 
-        # Llamar a la función para reorganizar IDs
-        reorganizar_ids()
-        return True
-
     except sqlite3.Error as e:
         print(f"Error al eliminar el producto: {e}")
         return False
@@ -120,6 +98,9 @@ def eliminar_producto_por_id(producto_id):
     finally:
         conexion.close()
 
+    publicar(PRODUCTO_ELIMINADO, producto_id=producto_id)
+    return True
+
 def listar_productos():
     """
     Lista todos los productos de la base de datos y los muestra en formato de tabla.
@@ -127,9 +108,11 @@ def listar_productos():
     Cada producto incluye su ID, nombre, precio de compra, precio de venta y stock disponible.
     """
     try:
-        with sqlite3.connect("gestion_bebidas.db") as conexion:
+        with obtener_conexion() as conexion:
             cursor = conexion.cursor()
-            cursor.execute("SELECT * FROM productos")
+            cursor.execute(
+                "SELECT id, nombre, precio_compra, precio_venta, stock FROM productos WHERE activo = 1 ORDER BY id"
+            )
             productos = cursor.fetchall()
 
             if not productos:
@@ -144,7 +127,7 @@ def listar_productos():
             # Imprimir cada producto
             for producto in productos:
                 id_producto, nombre, precio_compra, precio_venta, stock = producto
-                print(f"{id_producto:<5} {nombre:<20} {precio_compra:<10.2f} {precio_venta:<10.2f} {stock:<10}")
+                print(f"{id_producto:<5} {nombre:<20} {formatear(precio_compra):<10} {formatear(precio_venta):<10} {stock:<10}")
 
     except sqlite3.Error as e:
         print(f"Error al listar los productos: {e}")
\ No newline at end of file
@@ -0,0 +1,457 @@
+"""
+API HTTP local para puntos de venta (tablets) sobre la misma base de datos.
+
+Uso (desde la raíz del proyecto):
+    python -m control_de_ventas [--bd RUTA] servir [--host 0.0.0.0] [--puerto 8765]
+
+Rutas (JSON):
+    GET  /productos              Productos activos (filtro opcional ?nombre=...).
+    GET  /productos/<id>         Un producto activo.
+    POST /ventas                 {"producto_id": 1, "cantidad": 2, "tipo": "venta"} (tipo opcional).
+    POST /tickets                {"lineas": [{"producto_id": 1, "cantidad": 2}, ...]} (todo o nada).
+    GET  /totales                Ingresos, egresos, ganancia neta y porcentaje.
+    GET  /estado                 Estadísticas del servidor (cola de escritura, lotes, conexiones).
+
+Concurrencia:
+- Las escrituras pasan por una única cola que atiende un solo hilo escritor, así SQLite
+  nunca ve dos escritores a la vez ("database is locked"). Las ventas que llegan mientras
+  se confirma un lote se agrupan en el siguiente (un commit para todas), con la misma
+  validación que `registrar_transacciones_lote` (stock, producto activo, tipo). Cada ticket
+  se confirma en su propia transacción (`registrar_ticket_db`), en el mismo hilo escritor.
+- Las lecturas se atienden en varios hilos lectores; en WAL no esperan al escritor.
+
+Los precios y montos se responden en pesos (la base los guarda en centavos, ver `dinero`).
+
+Solo usa la biblioteca estándar (asyncio); no está pensada para exponerse fuera de la red local.
+"""
+import asyncio
+import json
+import sqlite3
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import gestor_conexiones
+from catalogo import catalogo
+from dinero import a_pesos
+from errores import DatosInvalidos, ErrorVentas, ProductoNoEncontrado, StockInsuficiente
+
+# Ventas máximas por commit del escritor
+LOTE_MAXIMO = 200
+
+# Hilos que atienden consultas de lectura
+LECTORES = 4
+
+# Tamaño máximo del cuerpo de una petición (bytes)
+CUERPO_MAXIMO = 64 * 1024
+
+ESTADOS_HTTP = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+# Código HTTP de cada error de negocio
+CODIGOS_ERROR = (
+    (ProductoNoEncontrado, 404),
+    (StockInsuficiente, 409),
+    (DatosInvalidos, 400),
+)
+
+
+class ErrorHTTP(Exception):
+    """
+    Petición inválida que se responde con `codigo` y el mensaje como error.
+    """
+
+    def __init__(self, codigo, mensaje):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+def consultar_productos(nombre=None):
+    """
+    Retorna:
+        list: Productos activos (dicts con `catalogo.COLUMNAS`), opcionalmente filtrados por nombre.
+    """
+    productos = catalogo.listar() if nombre is None else catalogo.buscar_por_nombre(nombre)
+    return [producto_en_pesos(producto) for producto in productos]
+
+
+def consultar_producto(producto_id):
+    """
+    Retorna:
+        dict: El producto activo con ese ID.
+
+    Excepciones:
+        ProductoNoEncontrado: Si no existe o fue dado de baja.
+    """
+    producto = catalogo.obtener(producto_id)
+    if producto is None:
+        raise ProductoNoEncontrado(producto_id)
+    return producto_en_pesos(producto)
+
+
+def producto_en_pesos(producto):
+    """
+    Retorna:
+        dict: El producto (`catalogo.COLUMNAS`) con los precios en pesos.
+    """
+    datos = producto.como_dict()
+    datos["precio_compra"] = a_pesos(producto.precio_compra)
+    datos["precio_venta"] = a_pesos(producto.precio_venta)
+    return datos
+
+
+def ticket_en_pesos(ticket):
+    """
+    Retorna:
+        dict: El ticket de `registrar_ticket_db` con su total y los de sus líneas en pesos.
+    """
+    lineas = [{**linea, "total": a_pesos(linea["total"])} for linea in ticket["lineas"]]
+    return {**ticket, "total": a_pesos(ticket["total"]), "lineas": lineas}
+
+
+def consultar_totales():
+    from transacciones import obtener_totales
+
+    ingresos, egresos, ganancia_neta, porcentaje = obtener_totales()
+    return {
+        "ingresos": a_pesos(ingresos),
+        "egresos": a_pesos(egresos),
+        "ganancia_neta": a_pesos(ganancia_neta),
+        "porcentaje_ganancia": round(porcentaje, 2),
+    }
+
+
+def validar_venta(datos):
+    """
+    Valida el cuerpo de `POST /ventas`.
+
+    Retorna:
+        tuple: (producto_id, tipo, cantidad), en el formato de `registrar_transacciones_lote`.
+
+    Excepciones:
+        DatosInvalidos: Si falta un campo o tiene un valor no válido.
+    """
+    if not isinstance(datos, dict):
+        raise DatosInvalidos("El cuerpo debe ser un objeto JSON.")
+    producto_id = datos.get("producto_id")
+    cantidad = datos.get("cantidad")
+    tipo = datos.get("tipo", "venta")
+    if not isinstance(producto_id, int) or isinstance(producto_id, bool):
+        raise DatosInvalidos("'producto_id' debe ser un número entero.")
+    if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+        raise DatosInvalidos("'cantidad' debe ser un número entero mayor a 0.")
+    if tipo not in ("venta", "compra"):
+        raise DatosInvalidos("'tipo' debe ser 'venta' o 'compra'.")
+    return producto_id, tipo, cantidad
+
+
+def validar_ticket(datos):
+    """
+    Valida el cuerpo de `POST /tickets`.
+
+    Retorna:
+        list: Pares (producto_id, cantidad), en el formato de `registrar_ticket_db`.
+
+    Excepciones:
+        DatosInvalidos: Si falta la lista de líneas o alguna línea no es válida.
+    """
+    if not isinstance(datos, dict) or not isinstance(datos.get("lineas"), list) or not datos["lineas"]:
+        raise DatosInvalidos("El cuerpo debe tener una lista 'lineas' no vacía.")
+    lineas = []
+    for linea in datos["lineas"]:
+        producto_id, _, cantidad = validar_venta(linea)
+        lineas.append((producto_id, cantidad))
+    return lineas
+
+
+class ServidorPOS:
+    """
+    Servidor HTTP/1.1 mínimo (con keep-alive) sobre asyncio.
+
+    Parámetros:
+        host (str): Dirección en la que escuchar.
+        puerto (int): Puerto TCP (0 = uno libre; ver `puerto` tras `iniciar`).
+        lectores (int): Hilos para las consultas de lectura.
+        lote_maximo (int): Ventas máximas por commit del escritor.
+    """
+
+    def __init__(self, host="127.0.0.1", puerto=8765, lectores=LECTORES, lote_maximo=LOTE_MAXIMO):
+        self.host = host
+        self.puerto = puerto
+        self.lote_maximo = lote_maximo
+        self._lectores = ThreadPoolExecutor(max_workers=lectores, thread_name_prefix="pos_lector")
+        self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pos_escritor")
+        self._cola = None
+        self._tarea_escritor = None
+        self._servidor = None
+        self.peticiones = 0
+        self.lotes = 0
+        self.ventas = 0
+        self.lote_mayor = 0
+
+    async def iniciar(self):
+        """
+        Abre el puerto y arranca la tarea escritora.
+        """
+        self._cola = asyncio.Queue()
+        self._tarea_escritor = asyncio.create_task(self._escribir())
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+
+    async def servir(self):
+        """
+        Atiende peticiones hasta que se cancele la tarea (por ejemplo, con Ctrl+C).
+        """
+        await self.iniciar()
+        print(f"Servidor POS escuchando en http://{self.host}:{self.puerto}")
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.detener()
+
+    async def detener(self):
+        """
+        Deja de aceptar conexiones, termina las ventas encoladas y libera los hilos.
+        """
+        self._servidor.close()
+        await self._cola.join()
+        self._tarea_escritor.cancel()
+        self._lectores.shutdown(wait=True)
+        self._escritor.shutdown(wait=True)
+
+    def estadisticas(self):
+        return {
+            "peticiones": self.peticiones,
+            "ventas": self.ventas,
+            "lotes": self.lotes,
+            "ventas_por_lote": round(self.ventas / self.lotes, 1) if self.lotes else 0.0,
+            "lote_mayor": self.lote_mayor,
+            "cola_escritura": self._cola.qsize() if self._cola else 0,
+            "conexiones": gestor_conexiones.estadisticas_conexiones(),
+            "catalogo": catalogo.estadisticas(),
+        }
+
+    async def registrar_venta(self, producto_id, tipo, cantidad):
+        """
+        Encola una transacción para el escritor y espera su resultado.
+
+        Retorna:
+            dict: Resultado de `registrar_transacciones_lote` para la fila.
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put(("fila", (producto_id, tipo, cantidad), futuro))
+        return await futuro
+
+    async def registrar_ticket(self, lineas):
+        """
+        Encola un ticket para el escritor y espera su resultado.
+
+        Retorna:
+            dict: Ticket registrado (ver `registrar_ticket_db`).
+
+        Excepciones:
+            ErrorVentas: Si el ticket se rechaza (no se registra ninguna línea).
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put(("ticket", lineas, futuro))
+        return await futuro
+
+    def _procesar(self, pendientes):
+        """
+        Registra los trabajos pendientes en orden (en el hilo escritor). Las filas sueltas
+        consecutivas se confirman juntas; cada ticket, en su propia transacción.
+
+        Retorna:
+            list: Un resultado por trabajo; los tickets rechazados devuelven la excepción.
+        """
+        from db_manager import registrar_ticket_db, registrar_transacciones_lote
+
+        resultados = []
+        filas = []
+        for clase, datos, _ in pendientes:
+            if clase == "fila":
+                filas.append(datos)
+                continue
+            if filas:
+                resultados.extend(registrar_transacciones_lote(filas, self.lote_maximo))
+                filas = []
+            try:
+                resultados.append(registrar_ticket_db(datos))
+            except (ErrorVentas, sqlite3.Error) as e:
+                resultados.append(e)
+        if filas:
+            resultados.extend(registrar_transacciones_lote(filas, self.lote_maximo))
+        return resultados
+
+    async def _escribir(self):
+        bucle = asyncio.get_running_loop()
+        while True:
+            # Esperar el primer trabajo y agrupar los que ya están en cola
+            pendientes = [await self._cola.get()]
+            while len(pendientes) < self.lote_maximo and not self._cola.empty():
+                pendientes.append(self._cola.get_nowait())
+
+            try:
+                resultados = await bucle.run_in_executor(self._escritor, self._procesar, pendientes)
+            except Exception as e:
+                resultados = [ErrorVentas(str(e))] * len(pendientes)
+
+            self.lotes += 1
+            self.ventas += len(pendientes)
+            self.lote_mayor = max(self.lote_mayor, len(pendientes))
+            for (clase, _, futuro), resultado in zip(pendientes, resultados):
+                if not futuro.done():
+                    if isinstance(resultado, Exception) and clase == "ticket":
+                        futuro.set_exception(resultado)
+                    elif isinstance(resultado, Exception):
+                        futuro.set_result({"exito": False, "total": None, "error": resultado})
+                    else:
+                        futuro.set_result(resultado)
+                self._cola.task_done()
+
+    async def _leer(self, funcion, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._lectores, funcion, *args)
+
+    async def _despachar(self, metodo, ruta, cuerpo):
+        """
+        Retorna:
+            tuple: (código HTTP, datos a serializar en JSON)
+        """
+        partes = urlsplit(ruta)
+        segmentos = [segmento for segmento in partes.path.split("/") if segmento]
+        parametros = parse_qs(partes.query)
+
+        if segmentos == ["productos"] and metodo == "GET":
+            nombre = parametros.get("nombre", [None])[0]
+            return 200, await self._leer(consultar_productos, nombre)
+
+        if len(segmentos) == 2 and segmentos[0] == "productos" and metodo == "GET":
+            if not segmentos[1].isdigit():
+                raise ErrorHTTP(400, "El ID del producto debe ser un número.")
+            return 200, await self._leer(consultar_producto, int(segmentos[1]))
+
+        if segmentos == ["ventas"] and metodo == "POST":
+            try:
+                datos = json.loads(cuerpo or b"null")
+            except ValueError:
+                raise ErrorHTTP(400, "El cuerpo no es JSON válido.")
+            producto_id, tipo, cantidad = validar_venta(datos)
+            resultado = await self.registrar_venta(producto_id, tipo, cantidad)
+            if not resultado["exito"]:
+                raise resultado["error"]
+            return 201, {"producto_id": producto_id, "tipo": tipo, "cantidad": cantidad,
+                         "total": a_pesos(resultado["total"])}
+
+        if segmentos == ["tickets"] and metodo == "POST":
+            try:
+                datos = json.loads(cuerpo or b"null")
+            except ValueError:
+                raise ErrorHTTP(400, "El cuerpo no es JSON válido.")
+            return 201, ticket_en_pesos(await self.registrar_ticket(validar_ticket(datos)))
+
+        if segmentos == ["totales"] and metodo == "GET":
+            return 200, await self._leer(consultar_totales)
+
+        if segmentos == ["estado"] and metodo == "GET":
+            return 200, self.estadisticas()
+
+        if segmentos and segmentos[0] in ("productos", "ventas", "tickets", "totales", "estado"):
+            raise ErrorHTTP(405, f"Método {metodo} no permitido en {partes.path}.")
+        raise ErrorHTTP(404, f"Ruta no encontrada: {partes.path}")
+
+    async def _atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(escritor, 400, {"error": "Línea de petición inválida."}, False)
+                    break
+
+                cabeceras = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+
+                mantener = cabeceras.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                longitud = cabeceras.get("content-length") or "0"
+                if not longitud.isdecimal():
+                    # No se sabe dónde termina el cuerpo: responder y cerrar la conexión
+                    await self._responder(escritor, 400, {"error": "Content-Length inválido."}, False)
+                    break
+                longitud = int(longitud)
+                if longitud > CUERPO_MAXIMO:
+                    await self._responder(escritor, 413, {"error": "Cuerpo demasiado grande."}, False)
+                    break
+                cuerpo = await lector.readexactly(longitud) if longitud else b""
+
+                self.peticiones += 1
+                try:
+                    codigo, datos = await self._despachar(metodo, ruta, cuerpo)
+                except ErrorHTTP as e:
+                    codigo, datos = e.codigo, {"error": str(e)}
+                except ErrorVentas as e:
+                    codigo = next((c for clase, c in CODIGOS_ERROR if isinstance(e, clase)), 500)
+                    datos = {"error": str(e)}
+                except sqlite3.Error as e:
+                    codigo, datos = 500, {"error": f"Error de base de datos: {e}"}
+                except Exception:
+                    # Un error inesperado no debe cortar la conexión sin respuesta
+                    print(f"Error inesperado atendiendo {metodo} {ruta}:", file=sys.stderr)
+                    traceback.print_exc()
+                    codigo, datos = 500, {"error": "Error interno del servidor."}
+
+                await self._responder(escritor, codigo, datos, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # Línea de petición o cabecera más larga que el límite del lector
+            try:
+                await self._responder(escritor, 400, {"error": "Cabeceras demasiado largas."}, False)
+            except ConnectionError:
+                pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, codigo, datos, mantener):
+        cuerpo = json.dumps(datos, ensure_ascii=False, default=str).encode("utf-8")
+        escritor.write(
+            f"HTTP/1.1 {codigo} {ESTADOS_HTTP[codigo]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode("latin-1") + cuerpo
+        )
+        await escritor.drain()
+
+
+def servir(host="127.0.0.1", puerto=8765, lectores=LECTORES):
+    """
+    Ejecuta el servidor hasta que se interrumpa con Ctrl+C.
+
+    Retorna:
+        dict: Estadísticas finales del servidor.
+    """
+    from alertas import monitor
+
+    monitor.suscribir()
+    servidor = ServidorPOS(host, puerto, lectores=lectores)
+    inicio = time.perf_counter()
+    try:
+        asyncio.run(servidor.servir())
+    except KeyboardInterrupt:
+        pass
+    estadisticas = servidor.estadisticas()
+    estadisticas["segundos"] = round(time.perf_counter() - inicio, 1)
+    return estadisticas
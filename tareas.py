@@ -0,0 +1,170 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TareaCancelada(Exception):
+    """
+    Se lanza dentro de una tarea cuando el usuario pidió cancelarla.
+    """
+
+
+class Tarea:
+    """
+    Trabajo enviado al ejecutor en segundo plano.
+
+    Si la tarea se envió con `al_progresar`, la función recibe `progreso=tarea.reportar`
+    y puede llamarlo para informar su avance. `reportar` lanza
+    `TareaCancelada` si se pidió cancelar la tarea, lo que corta el trabajo largo
+    (por ejemplo, una exportación) en el siguiente bloque procesado.
+    """
+
+    def __init__(self, ejecutor, al_terminar=None, al_fallar=None, al_progresar=None):
+        self._ejecutor = ejecutor
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.al_progresar = al_progresar
+        self._cancelada = threading.Event()
+
+    def cancelar(self):
+        """
+        Pide cancelar la tarea. El trabajo se detiene en el siguiente `reportar`.
+        """
+        self._cancelada.set()
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def reportar(self, valor):
+        """
+        Informa el avance de la tarea (se entrega a `al_progresar` en el hilo de la interfaz).
+
+        Excepciones:
+            TareaCancelada: Si la tarea fue cancelada.
+        """
+        if self.cancelada:
+            raise TareaCancelada()
+        if self.al_progresar:
+            self._ejecutor._resultados.put((self.al_progresar, valor))
+
+
+class EjecutorTareas:
+    """
+    Ejecuta el trabajo de base de datos y archivos en un único hilo de fondo y entrega
+    los resultados al hilo de Tk mediante sondeo con `after()`.
+
+    - Un solo hilo trabajador serializa las escrituras en SQLite.
+    - Los callbacks (`al_terminar`, `al_fallar`, `al_progresar`) siempre se ejecutan en el hilo
+      de la interfaz, por lo que pueden actualizar widgets y mostrar mensajes.
+    - Cada sondeo mide cuánto se retrasó respecto de lo programado, lo que da una cota
+      observable del tiempo que el bucle de eventos estuvo bloqueado.
+
+    Parámetros:
+        intervalo_ms (int): Intervalo de sondeo de resultados en milisegundos.
+    """
+
+    def __init__(self, intervalo_ms=50):
+        self.intervalo_ms = intervalo_ms
+        self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tareas_bd")
+        self._resultados = queue.Queue()
+        self._ventana = None
+        self._esperado = None
+        self.sondeos = 0
+        self.bloqueo_maximo_ms = 0.0
+        self._bloqueo_total_ms = 0.0
+
+    def iniciar(self, ventana):
+        """
+        Comienza el sondeo de resultados sobre la ventana principal de Tk.
+        """
+        self._ventana = ventana
+        self._esperado = time.perf_counter()
+        self._sondear()
+
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None, al_progresar=None, **kwargs):
+        """
+        Envía `funcion(*args, **kwargs)` al hilo de fondo.
+
+        Parámetros:
+            funcion (callable): Trabajo a realizar.
+            al_terminar (callable, opcional): Recibe el valor retornado por la función.
+            al_fallar (callable, opcional): Recibe la excepción lanzada (incluida `TareaCancelada`).
+            al_progresar (callable, opcional): Recibe cada avance informado. Si se indica, la función
+                recibe además el argumento `progreso=tarea.reportar`.
+
+        Retorna:
+            Tarea: Objeto para cancelar la tarea.
+        """
+        tarea = Tarea(self, al_terminar, al_fallar, al_progresar)
+
+        def ejecutar():
+            try:
+                if al_progresar:
+                    kwargs["progreso"] = tarea.reportar
+                resultado = funcion(*args, **kwargs)
+            except Exception as e:
+                if tarea.al_fallar:
+                    self._resultados.put((tarea.al_fallar, e))
+                else:
+                    print(f"Error en tarea en segundo plano: {e}")
+            else:
+                if tarea.al_terminar:
+                    self._resultados.put((tarea.al_terminar, resultado))
+
+        self._hilo.submit(ejecutar)
+        return tarea
+
+    def en_interfaz(self, funcion):
+        """
+        Envuelve `funcion(valor)` para que se ejecute en el hilo de la interfaz.
+
+        Sirve para suscribir la interfaz a `eventos`: la capa de datos publica desde el hilo
+        que hizo la operación (a menudo el hilo de fondo) y el evento se entrega en el
+        próximo sondeo.
+        """
+        return lambda valor: self._resultados.put((funcion, valor))
+
+    def _sondear(self):
+        # Medir el retraso del sondeo: tiempo en que el bucle de eventos no pudo atenderlo
+        ahora = time.perf_counter()
+        retraso_ms = max((ahora - self._esperado) * 1000, 0.0)
+        self.sondeos += 1
+        self._bloqueo_total_ms += retraso_ms
+        self.bloqueo_maximo_ms = max(self.bloqueo_maximo_ms, retraso_ms)
+
+        # Entregar los resultados pendientes en el hilo de la interfaz
+        while True:
+            try:
+                callback, valor = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(valor)
+            except Exception as e:
+                print(f"Error al procesar el resultado de una tarea: {e}")
+
+        self._esperado = time.perf_counter() + self.intervalo_ms / 1000
+        self._ventana.after(self.intervalo_ms, self._sondear)
+
+    def estadisticas(self):
+        """
+        Retorna:
+            dict: Sondeos realizados y retraso máximo y promedio (ms) del bucle de eventos.
+        """
+        return {
+            "sondeos": self.sondeos,
+            "bloqueo_maximo_ms": round(self.bloqueo_maximo_ms, 1),
+            "bloqueo_promedio_ms": round(self._bloqueo_total_ms / self.sondeos, 1) if self.sondeos else 0.0,
+        }
+
+    def detener(self):
+        """
+        Espera a que terminen las tareas en curso y libera el hilo de fondo.
+        """
+        self._hilo.shutdown(wait=True, cancel_futures=True)
+
+
+# Ejecutor compartido por la interfaz
+ejecutor = EjecutorTareas()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gestor_conexiones
+from crear_bd import crear_base_datos
+
+
+@pytest.fixture
+def base(tmp_path):
+    """
+    Base de datos temporal con el esquema completo; el pool compartido apunta a ella durante la prueba.
+    """
+    ruta_anterior = gestor_conexiones.gestor.ruta
+    gestor_conexiones.configurar(ruta=str(tmp_path / "prueba.db"))
+    crear_base_datos(perfil="fast")
+    yield
+    gestor_conexiones.configurar(ruta=ruta_anterior)
@@ -0,0 +1,58 @@
+"""
+Ventas concurrentes del mismo producto: el stock nunca queda negativo (ver `db_manager.registrar_transaccion_db`).
+
+Versión reducida de `benchmarks/bench_concurrencia.py`.
+"""
+import threading
+
+import gestor_conexiones
+from db_manager import registrar_transaccion_db
+from errores import StockInsuficiente
+
+HILOS = 4
+VENTAS_POR_HILO = 25
+STOCK = 30
+
+
+def test_ventas_concurrentes_no_dejan_stock_negativo(base):
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.execute(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES ('Agua', 'bebida', 100, 200, ?)",
+        (STOCK,),
+    )
+    conexion.commit()
+    conexion.close()
+
+    aceptadas = []
+    errores = []
+    inicio = threading.Barrier(HILOS)
+
+    def vender(cantidad):
+        inicio.wait()
+        for _ in range(VENTAS_POR_HILO):
+            try:
+                registrar_transaccion_db(1, "venta", cantidad)
+                aceptadas.append(cantidad)
+            except StockInsuficiente:
+                pass
+            except Exception as e:
+                errores.append(e)
+
+    hilos = [threading.Thread(target=vender, args=(1 + i % 2,)) for i in range(HILOS)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    conexion = gestor_conexiones.obtener_conexion()
+    (stock,) = conexion.execute("SELECT stock FROM productos WHERE id = 1").fetchone()
+    vendido, registradas = conexion.execute(
+        "SELECT COALESCE(SUM(cantidad), 0), COUNT(*) FROM transacciones WHERE tipo = 'venta'"
+    ).fetchone()
+    conexion.close()
+
+    assert errores == []
+    assert stock >= 0
+    assert registradas == len(aceptadas)
+    assert vendido == sum(aceptadas)
+    assert stock == STOCK - vendido
@@ -0,0 +1,69 @@
+"""
+Conversión de montos (`dinero`) contra `Decimal` con redondeo de las mitades lejos de cero.
+
+Versión reducida de la verificación de `benchmarks/bench_dinero.py`, con montos negativos.
+"""
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from dinero import CENTAVOS, a_centavos, formatear
+
+MUESTRA = 5000
+
+
+def esperado(texto):
+    return int(Decimal(texto).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * CENTAVOS)
+
+
+def montos_al_azar(cantidad, semilla=2):
+    """
+    Retorna:
+        list: Montos escritos con 0 a 4 decimales, positivos y negativos.
+    """
+    aleatorio = random.Random(semilla)
+    montos = []
+    for _ in range(cantidad):
+        decimales = aleatorio.randint(0, 4)
+        texto = str(aleatorio.randint(0, 10 ** (6 + decimales))).rjust(decimales + 1, "0")
+        if decimales:
+            texto = f"{texto[:-decimales]}.{texto[-decimales:]}"
+        montos.append(aleatorio.choice(("", "-")) + texto)
+    return montos
+
+
+def test_textos_coinciden_con_decimal():
+    diferencias = [(texto, esperado(texto), a_centavos(texto)) for texto in montos_al_azar(MUESTRA)
+                   if a_centavos(texto) != esperado(texto)]
+    assert diferencias == []
+
+
+def test_floats_coinciden_con_decimal():
+    # Un float se lee por su representación más corta, que es el texto original
+    diferencias = [(texto, esperado(texto), a_centavos(float(texto))) for texto in montos_al_azar(MUESTRA)
+                   if a_centavos(float(texto)) != esperado(texto)]
+    assert diferencias == []
+
+
+@pytest.mark.parametrize("valor, centavos", [
+    ("0.005", 1), ("-0.005", -1), ("0.0049", 0), ("-0.0049", 0),
+    ("10.005", 1001), (" 2.5 ", 250), ("+1.995", 200), (".5", 50),
+    (1.005, 101), (-1.005, -101), (2.675, 268), (7, 700), (-7, -700),
+])
+def test_mitades_lejos_de_cero(valor, centavos):
+    assert a_centavos(valor) == centavos
+
+
+@pytest.mark.parametrize("valor", ["", "abc", "1.2.3", "--1", "inf", float("nan")])
+def test_montos_invalidos(valor):
+    with pytest.raises(ValueError):
+        a_centavos(valor)
+
+
+def test_formatear_coincide_con_decimal():
+    aleatorio = random.Random(3)
+    muestra = [aleatorio.randint(-10 ** 9, 10 ** 9) for _ in range(MUESTRA)] + [0, 5, -5, 99, -99, 100, -100]
+    diferencias = [(centavos, formatear(centavos)) for centavos in muestra
+                   if formatear(centavos) != f"{Decimal(centavos).scaleb(-2):.2f}"]
+    assert diferencias == []
@@ -0,0 +1,43 @@
+"""
+Las consultas frecuentes (`crear_bd.CONSULTAS_FRECUENTES`) no deben recorrer tablas completas.
+
+Es la misma verificación que `benchmarks/verificar_planes.py`, para que una regresión en los
+índices o en las consultas haga fallar la integración continua.
+"""
+import pytest
+
+import gestor_conexiones
+from alertas import SQL_STOCK_BAJO, SQL_STOCK_BAJO_FIJO
+from crear_bd import CONSULTAS_FRECUENTES, verificar_planes_consulta
+
+
+@pytest.fixture
+def base_con_datos(base):
+    conexion = gestor_conexiones.obtener_conexion()
+    conexion.executemany(
+        "INSERT INTO productos (nombre, tipo, precio_compra, precio_venta, stock) VALUES (?, ?, 100, 200, ?)",
+        ((f"Producto {i}", f"tipo {i % 5}", i % 50) for i in range(2000)),
+    )
+    conexion.executemany(
+        "INSERT INTO transacciones (tipo, producto_id, cantidad, total) VALUES (?, ?, 1, 200)",
+        (("venta" if i % 3 else "compra", i % 2000 + 1) for i in range(20000)),
+    )
+    conexion.executemany("INSERT INTO umbrales_producto (producto_id, umbral) VALUES (?, ?)",
+                         ((i, i % 12) for i in range(1, 2000, 7)))
+    conexion.executemany("INSERT INTO umbrales_tipo (tipo, umbral) VALUES (?, ?)",
+                         ((f"tipo {i}", 3 + i) for i in range(5)))
+    conexion.commit()
+    conexion.execute("ANALYZE")
+    conexion.close()
+
+
+def test_consultas_frecuentes_usan_indices(base_con_datos):
+    assert verificar_planes_consulta() == []
+
+
+def test_consultas_frecuentes_incluyen_totales_y_stock_bajo():
+    consultas = [consulta for consulta, _ in CONSULTAS_FRECUENTES]
+    assert any("FROM resumen_totales WHERE tipo = ?" in consulta for consulta in consultas)
+    # El texto exacto que ejecuta `alertas.consultar_stock_bajo`, no una copia
+    assert SQL_STOCK_BAJO in consultas
+    assert SQL_STOCK_BAJO_FIJO in consultas
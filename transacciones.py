@@ -1,4 +1,8 @@
 import sqlite3
+from catalogo import catalogo
+from dinero import formatear
+from eventos import TRANSACCIONES_REGISTRADAS, publicar
+from gestor_conexiones import obtener_conexion
 
 def registrar_transaccion(tipo, producto_id, cantidad, total):
     """
@@ -8,7 +12,7 @@ def registrar_transaccion(tipo, producto_id, cantidad, total):
         tipo (str): Tipo de transacción ("venta" o "compra").
         producto_id (int): ID del producto.
         cantidad (int): Cantidad de productos.
-        total (float): Total de la transacción.
+        total (int): Total de la transacción, en centavos.
 
     Returns:
         bool: True si la transacción se registró con éxito, False en caso de error.
@@ -16,24 +20,35 @@ def registrar_transaccion(tipo, producto_id, cantidad, total):
     if tipo not in ["venta", "compra"]:
         print("Error: Tipo de transacción inválido. Use 'venta' o 'compra'.")
         return False
+    # Una cantidad negativa pasaría la condición `stock >= ?` y sumaría stock en una venta
+    if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+        print("Error: La cantidad debe ser un número entero mayor a 0.")
+        return False
 
     try:
-        with sqlite3.connect("gestion_bebidas.db") as conexion:
+        with obtener_conexion() as conexion:
             cursor = conexion.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
 
-            # Verificar stock para ventas
+            # Actualizar stock según el tipo de transacción; en ventas, solo si alcanza
+            # (la condición se evalúa con el bloqueo de escritura tomado, sin carreras)
             if tipo == "venta":
-                cursor.execute("SELECT stock FROM productos WHERE id = ?", (producto_id,))
-                stock_disponible = cursor.fetchone()
-
-                if stock_disponible is None:
+                cursor.execute(
+                    "UPDATE productos SET stock = stock - ? WHERE id = ? AND activo = 1 AND stock >= ?",
+                    (cantidad, producto_id, cantidad),
+                )
+            else:
+                cursor.execute(
+                    "UPDATE productos SET stock = stock + ? WHERE id = ? AND activo = 1", (cantidad, producto_id)
+                )
+
+            if cursor.rowcount == 0:
+                cursor.execute("SELECT 1 FROM productos WHERE id = ? AND activo = 1", (producto_id,))
+                if cursor.fetchone() is None:
                     print(f"Error: Producto con ID {producto_id} no encontrado.")
-                    return False
-
-                stock_disponible = stock_disponible[0]
-                if stock_disponible < cantidad:
+                else:
                     print("Error: Stock insuficiente para realizar la venta.")
-                    return False
+                return False
 
             # Registrar la transacción
             consulta = """
@@ -42,45 +57,60 @@ def registrar_transaccion(tipo, producto_id, cantidad, total):
             """
             cursor.execute(consulta, (tipo, producto_id, cantidad, total))
 
-            # Actualizar stock según el tipo de transacción
-            if tipo == "venta":
-                cursor.execute("UPDATE productos SET stock = stock - ? WHERE id = ?", (cantidad, producto_id))
-            elif tipo == "compra":
-                cursor.execute("UPDATE productos SET stock = stock + ? WHERE id = ?", (cantidad, producto_id))
-
-            conexion.commit()
+            with catalogo.escritura():
+                conexion.commit()
+                catalogo.registrar_stock(producto_id, -cantidad if tipo == "venta" else cantidad)
             print(f"Transacción de {tipo} registrada exitosamente.")
+            publicar(TRANSACCIONES_REGISTRADAS, productos=[producto_id], cantidad=1)
             return True
 
     except sqlite3.Error as e:
         print(f"Error al registrar la transacción: {e}")
         return False
 
-def calcular_totales():
+def obtener_totales():
     """
-    Calcula y muestra los totales de ingresos, egresos, ganancia neta y porcentaje de ganancia.
+    Obtiene los totales de ingresos, egresos, ganancia neta y porcentaje de ganancia, sin mostrarlos.
+
+    Lee los totales acumulados de `resumen_totales` (una fila por día y tipo), por lo que
+    el costo no depende de la cantidad de transacciones registradas.
+
+    Retorna:
+        tuple: (ingresos, egresos, ganancia_neta, porcentaje_ganancia), los montos en centavos
+        (sumas enteras exactas; ver `dinero.a_pesos` para mostrarlos).
+
+    Excepciones:
+        sqlite3.Error: Si no se puede leer la base de datos.
     """
-    try:
-        with sqlite3.connect("gestion_bebidas.db") as conexion:
-            cursor = conexion.cursor()
+    with obtener_conexion() as conexion:
+        cursor = conexion.cursor()
 
-            # Calcular ingresos (ventas)
-            cursor.execute("SELECT SUM(total) FROM transacciones WHERE tipo = 'venta'")
-            ingresos = cursor.fetchone()[0] or 0
+        # Calcular ingresos (ventas)
+        cursor.execute("SELECT SUM(total) FROM resumen_totales WHERE tipo = 'venta'")
+        ingresos = cursor.fetchone()[0] or 0
 
-            # Calcular egresos (compras)
-            cursor.execute("SELECT SUM(total) FROM transacciones WHERE tipo = 'compra'")
-            egresos = cursor.fetchone()[0] or 0
+        # Calcular egresos (compras)
+        cursor.execute("SELECT SUM(total) FROM resumen_totales WHERE tipo = 'compra'")
+        egresos = cursor.fetchone()[0] or 0
 
-            # Calcular ganancias netas y porcentaje
-            ganancia_neta = ingresos - egresos
-            porcentaje_ganancia = (ganancia_neta / egresos * 100) if egresos > 0 else 0
+    # Calcular ganancias netas y porcentaje
+    ganancia_neta = ingresos - egresos
+    porcentaje_ganancia = (ganancia_neta / egresos * 100) if egresos > 0 else 0
+    return ingresos, egresos, ganancia_neta, porcentaje_ganancia
+
+def calcular_totales():
+    """
+    Calcula y muestra los totales de ingresos, egresos, ganancia neta y porcentaje de ganancia.
+    Ver `obtener_totales`.
+    """
+    try:
+        ingresos, egresos, ganancia_neta, porcentaje_ganancia = obtener_totales()
 
         # Mostrar resultados
         print("\n------ Resumen Financiero ------")
-        print(f"Ingresos por ventas:       ${ingresos:.2f}")
-        print(f"Egresos por compras:       ${egresos:.2f}")
-        print(f"Ganancia neta:             ${ganancia_neta:.2f}")
+        print(f"Ingresos por ventas:       ${formatear(ingresos)}")
+        print(f"Egresos por compras:       ${formatear(egresos)}")
+        print(f"Ganancia neta:             ${formatear(ganancia_neta)}")
         print(f"Porcentaje de ganancia:    {porcentaje_ganancia:.2f}%")
         print("--------------------------------\n")
 
@@ -95,9 +125,9 @@ def listar_transacciones():
     Muestra todas las transacciones almacenadas en la base de datos de forma legible.
     """
     try:
-        with sqlite3.connect("gestion_bebidas.db") as conexion:
+        with obtener_conexion() as conexion:
             cursor = conexion.cursor()
-            cursor.execute("SELECT * FROM transacciones")
+            cursor.execute("SELECT id, tipo, fecha, cantidad, total FROM transacciones")
             transacciones = cursor.fetchall()
 
         if not transacciones:
@@ -110,7 +140,7 @@ def listar_transacciones():
 
         for transaccion in transacciones:
             transaccion_id, tipo, fecha, cantidad, total = transaccion
-            print(f"{transaccion_id:<5} {tipo:<10} {fecha:<15} {cantidad:<10} ${total:<10.2f}")
+            print(f"{transaccion_id:<5} {tipo:<10} {fecha:<15} {cantidad:<10} ${formatear(total):<10}")
 
     except sqlite3.Error as e:
         print(f"Error al acceder a la base de datos: {e}")
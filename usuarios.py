@@ -0,0 +1,291 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+import gestor_conexiones
+from errores import DatosInvalidos
+
+# Parámetros de costo del hash de contraseñas. Cada hash guarda los suyos, así que se pueden
+# cambiar (ver `configurar`) sin invalidar los existentes: se actualizan en el próximo ingreso.
+COSTO = {
+    "algoritmo": "scrypt" if hasattr(hashlib, "scrypt") else "pbkdf2_sha256",
+    "n": 2 ** 14,  # scrypt: costo de CPU y memoria (potencia de 2; 16 MiB con r = 8)
+    "r": 8,  # scrypt: tamaño de bloque
+    "p": 1,  # scrypt: paralelismo
+    "iteraciones": 600_000,  # PBKDF2-SHA256, si OpenSSL no tiene scrypt
+}
+
+# Segundos durante los que un ingreso ya verificado se acepta sin recalcular el hash
+# (terminales compartidas donde los usuarios vuelven a ingresar seguido)
+VALIDEZ_SESION = 300.0
+
+ROLES = ("admin", "usuario")
+
+_BYTES_SAL = 16
+_BYTES_HASH = 32
+
+# Clave aleatoria del proceso para el caché de sesiones: lo guardado en memoria no sirve
+# para probar contraseñas fuera del proceso
+_clave_sesiones = os.urandom(32)
+_sesiones = {}  # nombre -> (huella de la contraseña, hash guardado, rol, vencimiento)
+_candado = threading.Lock()
+_referencia = {}  # Hash de una contraseña vacía con el costo actual (ver `_hash_de_referencia`)
+estadisticas_sesiones = {"aciertos": 0, "verificaciones": 0, "migradas": 0}
+
+
+def configurar(algoritmo=None, n=None, r=None, p=None, iteraciones=None, validez_sesion=None):
+    """
+    Ajusta el costo del hash de las contraseñas nuevas y la vigencia del caché de sesiones.
+
+    Un costo mayor hace más lento cada ingreso (y cada intento de adivinar una contraseña
+    robada); `benchmarks/bench_login.py` mide la latencia de cada configuración.
+
+    Parámetros:
+        algoritmo (str, opcional): "scrypt" o "pbkdf2_sha256".
+        n, r, p (int, opcional): Parámetros de scrypt (`n` debe ser potencia de 2).
+        iteraciones (int, opcional): Iteraciones de PBKDF2.
+        validez_sesion (float, opcional): Segundos de vigencia del caché (0 lo desactiva).
+    """
+    global VALIDEZ_SESION
+    if algoritmo is not None:
+        if algoritmo not in ("scrypt", "pbkdf2_sha256"):
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+        COSTO["algoritmo"] = algoritmo
+    if n is not None:
+        if n < 2 or n & (n - 1):
+            raise ValueError("El parámetro n de scrypt debe ser una potencia de 2.")
+        COSTO["n"] = n
+    for clave, valor in (("r", r), ("p", p), ("iteraciones", iteraciones)):
+        if valor is not None:
+            COSTO[clave] = valor
+    if validez_sesion is not None:
+        VALIDEZ_SESION = validez_sesion
+    invalidar_sesiones()
+
+
+def hashear_contrasena(contrasena):
+    """
+    Retorna:
+        str: Hash con el formato `algoritmo$parámetros$sal$hash` (sal y hash en hexadecimal),
+        por ejemplo `scrypt$16384$8$1$...$...`.
+    """
+    sal = os.urandom(_BYTES_SAL)
+    if COSTO["algoritmo"] == "scrypt":
+        parametros = (COSTO["n"], COSTO["r"], COSTO["p"])
+    else:
+        parametros = (COSTO["iteraciones"],)
+    resultado = _derivar(COSTO["algoritmo"], parametros, contrasena, sal)
+    return "$".join([COSTO["algoritmo"], *map(str, parametros), sal.hex(), resultado.hex()])
+
+
+def verificar_contrasena(contrasena, guardada):
+    """
+    Compara una contraseña con la guardada en `usuarios.contrasena` (en tiempo constante).
+
+    Retorna:
+        bool: True si coincide. Las contraseñas guardadas en texto plano (bases anteriores)
+        también se aceptan; `necesita_rehash` indica que hay que reemplazarlas.
+    """
+    leido = _leer_hash(guardada)
+    if leido is None:
+        return hmac.compare_digest(contrasena.encode(), guardada.encode())
+    algoritmo, parametros, sal, esperado = leido
+    return hmac.compare_digest(_derivar(algoritmo, parametros, contrasena, sal), esperado)
+
+
+def necesita_rehash(guardada):
+    """
+    Retorna:
+        bool: True si la contraseña guardada está en texto plano o con un costo distinto del actual.
+    """
+    leido = _leer_hash(guardada)
+    if leido is None or leido[0] != COSTO["algoritmo"]:
+        return True
+    if leido[0] == "scrypt":
+        return leido[1] != (COSTO["n"], COSTO["r"], COSTO["p"])
+    return leido[1] != (COSTO["iteraciones"],)
+
+
+def _leer_hash(guardada):
+    """
+    Separa un hash de `hashear_contrasena` en sus partes.
+
+    Retorna:
+        tuple: (algoritmo, parámetros, sal, hash), o None si `guardada` no tiene exactamente ese
+        formato: una contraseña antigua en texto plano puede empezar con "scrypt$" y se trata
+        como texto plano.
+    """
+    partes = guardada.split("$")
+    cantidad = {"scrypt": 3, "pbkdf2_sha256": 1}.get(partes[0])
+    if cantidad is None or len(partes) != cantidad + 3:
+        return None
+    try:
+        parametros = tuple(int(valor) for valor in partes[1:-2])
+        sal, esperado = bytes.fromhex(partes[-2]), bytes.fromhex(partes[-1])
+    except ValueError:
+        return None
+    if min(parametros) <= 0 or len(esperado) != _BYTES_HASH or not sal:
+        return None
+    if partes[0] == "scrypt" and (parametros[0] < 2 or parametros[0] & (parametros[0] - 1)):
+        return None
+    return partes[0], parametros, sal, esperado
+
+
+def verificar_credenciales(nombre, contrasena):
+    """
+    Valida el ingreso de un usuario.
+
+    - Si el mismo usuario ingresó con la misma contraseña hace menos de `VALIDEZ_SESION`
+      segundos y su contraseña no cambió en la base, se acepta sin recalcular el hash.
+    - Si no, verifica el hash; si estaba en texto plano o con otro costo, lo reemplaza por
+      uno nuevo (migración en el primer ingreso correcto).
+    - Si el usuario no existe, igual se calcula un hash, para no revelar qué nombres existen
+      por el tiempo de respuesta.
+
+    Retorna:
+        str: El rol del usuario, o None si el nombre o la contraseña no son correctos.
+    """
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        fila = conexion.execute("SELECT contrasena, rol FROM usuarios WHERE nombre = ?", (nombre,)).fetchone()
+    finally:
+        conexion.close()
+
+    huella = hmac.new(_clave_sesiones, contrasena.encode(), hashlib.sha256).digest()
+    if fila is not None:
+        with _candado:
+            sesion = _sesiones.get(nombre)
+        if (sesion is not None and sesion[3] > time.monotonic() and sesion[1] == fila[0]
+                and hmac.compare_digest(sesion[0], huella)):
+            estadisticas_sesiones["aciertos"] += 1
+            return sesion[2]
+
+    estadisticas_sesiones["verificaciones"] += 1
+    if fila is None:
+        verificar_contrasena(contrasena, _hash_de_referencia())
+        return None
+    guardada, rol = fila
+    if not verificar_contrasena(contrasena, guardada):
+        return None
+
+    if necesita_rehash(guardada):
+        nueva = hashear_contrasena(contrasena)
+        conexion = gestor_conexiones.obtener_conexion()
+        try:
+            # Solo si nadie la cambió mientras tanto
+            conexion.execute(
+                "UPDATE usuarios SET contrasena = ? WHERE nombre = ? AND contrasena = ?", (nueva, nombre, guardada)
+            )
+            conexion.commit()
+        finally:
+            conexion.close()
+        guardada = nueva
+        estadisticas_sesiones["migradas"] += 1
+
+    if VALIDEZ_SESION > 0:
+        with _candado:
+            _sesiones[nombre] = (huella, guardada, rol, time.monotonic() + VALIDEZ_SESION)
+    return rol
+
+
+def invalidar_sesiones(nombre=None):
+    """
+    Descarta los ingresos verificados en caché (de un usuario o de todos).
+    """
+    with _candado:
+        if nombre is None:
+            _sesiones.clear()
+        else:
+            _sesiones.pop(nombre, None)
+
+
+def crear_usuario(nombre, contrasena, rol):
+    """
+    Registra un usuario con su contraseña hasheada.
+
+    Excepciones:
+        DatosInvalidos: Si falta el nombre o la contraseña, o el rol no es 'admin' ni 'usuario'.
+        sqlite3.Error: Si falla la escritura.
+    """
+    if not nombre or not contrasena:
+        raise DatosInvalidos("El nombre y la contraseña son obligatorios.")
+    if rol not in ROLES:
+        raise DatosInvalidos("El rol debe ser 'admin' o 'usuario'")
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        conexion.execute(
+            "INSERT INTO usuarios (nombre, contrasena, rol) VALUES (?, ?, ?)",
+            (nombre, hashear_contrasena(contrasena), rol),
+        )
+        conexion.commit()
+    finally:
+        conexion.close()
+
+
+def cambiar_contrasena(nombre, contrasena):
+    """
+    Reemplaza la contraseña de un usuario y descarta su ingreso en caché.
+
+    Retorna:
+        bool: True si el usuario existe.
+    """
+    if not contrasena:
+        raise DatosInvalidos("La contraseña es obligatoria.")
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        cursor = conexion.execute(
+            "UPDATE usuarios SET contrasena = ? WHERE nombre = ?", (hashear_contrasena(contrasena), nombre)
+        )
+        conexion.commit()
+    finally:
+        conexion.close()
+    invalidar_sesiones(nombre)
+    return cursor.rowcount > 0
+
+
+def eliminar_usuario(nombre):
+    """
+    Elimina un usuario y descarta su ingreso en caché.
+    """
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        conexion.execute("DELETE FROM usuarios WHERE nombre = ?", (nombre,))
+        conexion.commit()
+    finally:
+        conexion.close()
+    invalidar_sesiones(nombre)
+
+
+def listar_usuarios():
+    """
+    Retorna:
+        list: Filas (nombre, rol) de los usuarios registrados (sin sus contraseñas).
+    """
+    conexion = gestor_conexiones.obtener_conexion()
+    try:
+        return conexion.execute("SELECT nombre, rol FROM usuarios ORDER BY id").fetchall()
+    finally:
+        conexion.close()
+
+
+def _derivar(algoritmo, parametros, contrasena, sal):
+    if algoritmo == "scrypt":
+        n, r, p = parametros
+        # Memoria necesaria: 128 * n * r bytes, más margen
+        return hashlib.scrypt(contrasena.encode(), salt=sal, n=n, r=r, p=p,
+                              maxmem=256 * n * r * p + 1024 * 1024, dklen=_BYTES_HASH)
+    (iteraciones,) = parametros
+    return hashlib.pbkdf2_hmac("sha256", contrasena.encode(), sal, iteraciones, dklen=_BYTES_HASH)
+
+
+def _hash_de_referencia():
+    """
+    Hash con el costo actual, para los intentos con un usuario inexistente.
+    """
+    clave = tuple(COSTO.values())
+    if clave not in _referencia:
+        _referencia.clear()
+        _referencia[clave] = hashear_contrasena("")
+    return _referencia[clave]